@@ -1,20 +1,112 @@
 import openpyxl
+import numpy as np
 import os
+import re
+import time
+import heapq
+import unicodedata
+import pickle
+import tempfile
+from array import array
+from operator import itemgetter
 from datetime import datetime
+from multiprocessing import Pool
 import tkinter as tk
 from tkinter import filedialog, messagebox
 from tkinter.ttk import Progressbar
 import threading
 
+# 메모리 예산: 이 행 수가 모일 때마다 정렬된 run 을 임시 파일로 내보냄 (외부 정렬)
+SPILL_ROWS = 200000
+
+# run 임시 파일에 한 번에 pickle 로 기록하는 행 수
+SPILL_BLOCK_ROWS = 1000
+
+# 폴더 모드에서 키워드 컬럼으로 볼 헤더 (정확히 일치하는 컬럼을 먼저, 없으면 포함하는 컬럼을 앞에서부터 찾음)
+KEYWORD_HEADERS = ("키워드", "검색어", "keyword")
+
+# 폴더 모드에서 입력으로 보지 않을 결과 파일 이름 표시
+OUTPUT_MARKERS = ("_키워드선별결과", "_키워드통합결과")
+
+# 폴더 모드에서 카테고리 컬럼으로 볼 헤더 (이 문자열을 포함하는 첫 컬럼, 없으면 파일 전체를 한 카테고리로 취급)
+CATEGORY_HEADER = "카테고리"
+
+# 원점수(score_adjusted) 옆에 붙이는 파일/카테고리별 정규화 점수 컬럼 (단일 파일·폴더 모드 공통)
+NORMALIZED_COLUMNS = ["log_score", "pct_file", "robust_z_file", "pct_category", "robust_z_category"]
+
+# 폴더 모드 통합 결과에 기록하는 점수 컬럼
+BATCH_SCORE_COLUMNS = (["category", "search_volume", "competition", "base_score", "wing_ratio", "score_adjusted"]
+                       + NORMALIZED_COLUMNS)
+
+# 통합 순위 기준 (파일·카테고리마다 규모가 달라도 비교할 수 있는 정규화 점수), 동점은 score_adjusted
+LEADERBOARD_SCORE = "pct_category"
+
 def to_float(value):
     try:
         return float(value)
     except (ValueError, TypeError):
         return 0.0
 
+class ExternalSortError(Exception):
+    """run 임시 파일을 쓰거나 읽다가 실패한 경우 (점수 계산/저장 오류와 구분해 보고)"""
+
+def _spill_run(run, run_dir, run_number):
+    """정렬된 run 을 run_dir 의 임시 파일에 SPILL_BLOCK_ROWS 행 단위 pickle 블록으로 저장하고 경로를 반환합니다."""
+    path = os.path.join(run_dir, f"run_{run_number:05d}.pkl")
+    try:
+        with open(path, "wb") as f:
+            for start in range(0, len(run), SPILL_BLOCK_ROWS):
+                pickle.dump(run[start:start + SPILL_BLOCK_ROWS], f, protocol=pickle.HIGHEST_PROTOCOL)
+    except (OSError, pickle.PicklingError) as e:
+        raise ExternalSortError(f"run 파일 저장 실패 ({path}): {e}") from e
+    return path
+
+def _read_run(path):
+    """_spill_run 으로 저장한 run 파일의 항목을 정렬 순서대로 하나씩 읽습니다 (한 번에 한 블록만 메모리에 둠)."""
+    try:
+        with open(path, "rb") as f:
+            while True:
+                try:
+                    block = pickle.load(f)
+                except EOFError:
+                    return
+                yield from block
+    except (OSError, pickle.UnpicklingError) as e:
+        raise ExternalSortError(f"run 파일 읽기 실패 ({path}): {e}") from e
+
+def external_sort(entries, run_dir, spill_rows=SPILL_ROWS):
+    """
+    (정렬 키, 행) 항목들을 정렬 키 오름차순으로 돌려주는 이터레이터를 반환합니다.
+    spill_rows 개가 모일 때마다 정렬된 run 을 run_dir 에 저장하고, 입력이 끝나면 모든 run 과
+    마지막 메모리 run 을 heapq.merge 로 k-way 병합합니다. run 이 하나뿐이면 임시 파일 없이 정렬합니다.
+    메모리는 O(spill_rows + run 수 × SPILL_BLOCK_ROWS) 이며, 반환된 이터레이터를 다 읽을 때까지
+    run_dir 의 파일이 남아 있어야 합니다. 정렬 키는 항목마다 달라야 합니다.
+    """
+    run_paths = []
+    buffer = []
+    for entry in entries:
+        buffer.append(entry)
+        if len(buffer) >= spill_rows:
+            buffer.sort(key=itemgetter(0))
+            run_paths.append(_spill_run(buffer, run_dir, len(run_paths)))
+            buffer = []
+    buffer.sort(key=itemgetter(0))
+    if not run_paths:
+        return iter(buffer)
+    return heapq.merge(*[_read_run(path) for path in run_paths], iter(buffer), key=itemgetter(0))
+
 def process_file(file_path, progress_data):
+    """
+    모든 행에 base_score, wing_ratio, score_adjusted 와 정규화 점수(NORMALIZED_COLUMNS)를 붙여
+    score_adjusted 내림차순으로 저장합니다.
+    행은 읽기 전용 워크시트에서 스트리밍으로 읽고, external_sort 로 SPILL_ROWS 행마다 정렬된 run 을
+    임시 파일로 내보낸 뒤 k-way 병합 결과를 바로 write_only 워크북에 기록하므로, 메모리보다 큰 파일도
+    일정한 메모리로 정렬됩니다. 점수가 같으면 원래 행 순서를 유지합니다.
+    정규화 점수에 필요한 분포는 행 전체 대신 점수와 카테고리 코드 숫자 배열만 메모리에 모아 계산하고,
+    병합 결과를 기록할 때 원래 행 번호로 찾아 붙입니다.
+    """
     try:
-        wb = openpyxl.load_workbook(file_path)
+        wb = openpyxl.load_workbook(file_path, read_only=True)
         sheet = wb.active
     except Exception as e:
         progress_data["error"] = f"파일 로드 실패: {e}"
@@ -22,13 +114,15 @@ def process_file(file_path, progress_data):
         return
 
     # 헤더 읽기
-    headers = [cell.value for cell in sheet[1]]
+    rows = sheet.iter_rows(values_only=True)
+    headers = list(next(rows, ()))
     
     # 필수 컬럼 인덱스 확인
     try:
         idx_recent = headers.index("최근\n30일\n검색량")
         idx_competition = headers.index("네이버\n경쟁강도")
     except ValueError as e:
+        wb.close()
         progress_data["error"] = f"필수 컬럼이 없습니다: {e}"
         progress_data["completed"] = True
         return
@@ -38,63 +132,345 @@ def process_file(file_path, progress_data):
     except ValueError:
         idx_rocket = None
 
-    new_headers = headers + ["base_score", "wing_ratio", "score_adjusted"]
+    idx_category = find_category_index(headers)
+    new_headers = headers + ["base_score", "wing_ratio", "score_adjusted"] + NORMALIZED_COLUMNS
     
-    data_rows = []
-    total_rows = sheet.max_row - 1  # 헤더 제외
+    width = len(headers)
+    total_rows = (sheet.max_row or 1) - 1  # 헤더 제외
     progress_data["phase"] = "processing"
     progress_data["total"] = total_rows
     progress_data["processed"] = 0
 
-    # 각 행 처리 (데이터 처리 단계)
-    for row in sheet.iter_rows(min_row=2, values_only=True):
-        row = list(row)
-        recent_val = to_float(row[idx_recent])
-        comp_val = to_float(row[idx_competition])
-        base_score = recent_val / (comp_val + 1)
-        if idx_rocket is not None:
-            rocket_val = to_float(row[idx_rocket])
-            wing_ratio = 100 - rocket_val
-        else:
-            wing_ratio = 0.0
-        score_adjusted = base_score * (1 + wing_ratio / 100)
-        new_row = row + [base_score, wing_ratio, score_adjusted]
-        data_rows.append(new_row)
-        progress_data["processed"] += 1
-
-    # 보정 점수 기준 내림차순 정렬
-    data_rows.sort(key=lambda r: r[-1], reverse=True)
+    # 정규화 점수 계산용: 행 순서대로 보정 점수와 카테고리 코드만 보관
+    all_scores = array("d")
+    category_codes = array("q")
+    category_ids = {}
 
-    # 저장 단계 시작
-    progress_data["phase"] = "saving"
-    total_save = len(data_rows) + 1  # 헤더 포함
-    progress_data["total_save"] = total_save
-    progress_data["saved"] = 0
-
-    new_wb = openpyxl.Workbook()
-    new_sheet = new_wb.active
-
-    # 헤더 저장
-    new_sheet.append(new_headers)
-    progress_data["saved"] += 1
-
-    # 데이터 행 저장 (한 행씩 저장하면서 진행 상황 업데이트)
-    for r in data_rows:
-        new_sheet.append(r)
-        progress_data["saved"] += 1
+    # 각 행 처리 (데이터 처리 단계): (정렬 키, 행) 항목 생성
+    def scored_rows():
+        for seq, row in enumerate(rows):
+            # 읽기 전용 모드에서는 끝의 빈 셀이 생략될 수 있음
+            row = list(row) + [None] * (width - len(row))
+            recent_val = to_float(row[idx_recent])
+            comp_val = to_float(row[idx_competition])
+            base_score = recent_val / (comp_val + 1)
+            if idx_rocket is not None:
+                rocket_val = to_float(row[idx_rocket])
+                wing_ratio = 100 - rocket_val
+            else:
+                wing_ratio = 0.0
+            score_adjusted = base_score * (1 + wing_ratio / 100)
+            all_scores.append(score_adjusted)
+            category = row[idx_category] if idx_category is not None else None
+            category_codes.append(category_ids.setdefault(category, len(category_ids)))
+            progress_data["processed"] += 1
+            # 보정 점수 내림차순, 같은 점수는 원래 행 순서
+            yield (-score_adjusted, seq), row + [base_score, wing_ratio, score_adjusted]
 
     current_date = datetime.now().strftime("%Y-%m-%d")
     base_name = os.path.splitext(os.path.basename(file_path))[0]
     new_file_name = f"{base_name}_{current_date}_키워드선별결과.xlsx"
     save_path = os.path.join(os.path.dirname(file_path), new_file_name)
+
+    with tempfile.TemporaryDirectory(prefix="bulsaja_runs_") as run_dir:
+        # 점수 계산 단계: 모든 행을 점수화하며 정렬된 run 을 내보냄 (실패하면 저장 실패와 구분해 보고)
+        try:
+            sorted_rows = external_sort(scored_rows(), run_dir)
+            normalized = normalized_scores(np.frombuffer(all_scores, dtype=float),
+                                           np.frombuffer(category_codes, dtype=np.int64))
+        except ExternalSortError as e:
+            progress_data["error"] = f"정렬 실패: {e}"
+            progress_data["completed"] = True
+            return
+        except Exception as e:
+            progress_data["error"] = f"점수 계산 실패: {type(e).__name__}: {e}"
+            progress_data["completed"] = True
+            return
+        finally:
+            wb.close()
+
+        try:
+            # 저장 단계 시작
+            progress_data["phase"] = "saving"
+            progress_data["total_save"] = progress_data["processed"] + 1  # 헤더 포함
+            progress_data["saved"] = 0
+
+            new_wb = openpyxl.Workbook(write_only=True)
+            new_sheet = new_wb.create_sheet()
+
+            # 헤더 저장
+            new_sheet.append(new_headers)
+            progress_data["saved"] += 1
+
+            # 병합된 순서대로 데이터 행 저장 (한 행씩 저장하면서 진행 상황 업데이트)
+            for (_, seq), r in sorted_rows:
+                new_sheet.append(r + normalized[seq].tolist())
+                progress_data["saved"] += 1
+
+            new_wb.save(save_path)
+            progress_data["save_path"] = save_path
+        except ExternalSortError as e:
+            # 병합 중 run 파일 읽기 실패
+            progress_data["error"] = f"정렬 실패: {e}"
+        except Exception as e:
+            progress_data["error"] = f"저장 실패: {e}"
     
+    progress_data["completed"] = True
+
+def normalize_keyword(keyword):
+    """파일 간 같은 키워드를 찾기 위한 정규형: 유니코드 NFKC, 모든 공백 제거, 대소문자 무시."""
+    return re.sub(r"\s+", "", unicodedata.normalize("NFKC", "" if keyword is None else str(keyword))).casefold()
+
+def find_category_index(headers):
+    """CATEGORY_HEADER 를 포함하는 첫 컬럼의 인덱스 (없으면 None, 파일 전체를 한 카테고리로 취급)."""
+    return next((idx for idx, header in enumerate(headers)
+                 if isinstance(header, str) and CATEGORY_HEADER in header), None)
+
+def find_keyword_index(headers):
+    """
+    헤더에서 키워드 컬럼의 인덱스를 찾습니다. KEYWORD_HEADERS 와 정확히 일치하는 컬럼을 먼저 찾고
+    ("연관키워드"처럼 이름을 포함하는 앞쪽 컬럼에 잡히지 않도록), 없으면 포함하는 첫 컬럼, 그래도 없으면 None.
+    """
+    names = [header.replace("\n", "").strip().casefold() if isinstance(header, str) else None
+             for header in headers]
+    for name in KEYWORD_HEADERS:
+        if name.casefold() in names:
+            return names.index(name.casefold())
+    for name in KEYWORD_HEADERS:
+        for idx, header in enumerate(names):
+            if header is not None and name.casefold() in header:
+                return idx
+    return None
+
+def _group_sorted(values, group_ids):
+    """(그룹, 값) 오름차순 정렬 순서와 정렬된 값/그룹, 각 정렬 위치가 속한 그룹의 시작 위치와 크기를 반환합니다."""
+    order = np.lexsort((values, group_ids))
+    sorted_values = values[order]
+    sorted_groups = group_ids[order]
+    new_group = np.r_[True, sorted_groups[1:] != sorted_groups[:-1]]
+    group_start = np.maximum.accumulate(np.where(new_group, np.arange(len(values)), 0))
+    group_size = np.bincount(group_ids)[sorted_groups]
+    return order, sorted_values, group_start, group_size
+
+def _group_median(values, group_ids):
+    """그룹별 중앙값을 각 원소 위치에 맞춰 반환합니다 (정렬 한 번)."""
+    order, sorted_values, group_start, group_size = _group_sorted(values, group_ids)
+    median_sorted = (sorted_values[group_start + (group_size - 1) // 2]
+                     + sorted_values[group_start + group_size // 2]) / 2
+    median = np.empty(len(values))
+    median[order] = median_sorted
+    return median
+
+def group_normalize(values, group_ids):
+    """
+    그룹(group_ids, 0부터 시작하는 정수)마다 값을 정규화해 (백분위, robust z-score)를 반환합니다.
+      - 백분위       : 같은 그룹에서 그 값 이하인 값의 비율(%) (동점은 같은 백분위)
+      - robust z-score : (값 - 그룹 중앙값) / (1.4826 × 그룹 MAD), MAD 가 0이면 0
+    그룹별 반복 없이 (그룹, 값) 정렬로 모든 그룹을 한 번에 계산합니다.
+    """
+    if len(values) == 0:
+        return np.zeros(0), np.zeros(0)
+    order, sorted_values, group_start, group_size = _group_sorted(values, group_ids)
+    # 같은 그룹·같은 값 구간의 마지막 위치까지가 "그 값 이하"
+    sorted_groups = group_ids[order]
+    block_end = np.r_[(sorted_values[1:] != sorted_values[:-1]) | (sorted_groups[1:] != sorted_groups[:-1]), True]
+    last_equal = np.minimum.accumulate(np.where(block_end, np.arange(len(values)), len(values))[::-1])[::-1]
+    percentile = np.empty(len(values))
+    percentile[order] = (last_equal - group_start + 1) / group_size * 100
+
+    median = _group_median(values, group_ids)
+    deviation = np.abs(values - median)
+    scale = 1.4826 * _group_median(deviation, group_ids)
+    robust_z = np.where(scale > 0, (values - median) / np.where(scale > 0, scale, 1), 0.0)
+    return percentile, robust_z
+
+def score_export_file(file_path):
+    """
+    폴더 모드 작업 단위(프로세스에서 실행): 파일 한 개의 모든 키워드를 process_file 과 같은 식으로 점수화하고,
+    원점수(score_adjusted) 옆에 파일 간 비교용 정규화 점수를 붙입니다. 필수 컬럼이나 키워드 컬럼이 없으면
+    error 에 사유를 남기고 점수화하지 않습니다.
+      - log_score         : log10(1 + score_adjusted)
+      - pct_file / robust_z_file         : 파일 전체 기준 백분위 / robust z-score
+      - pct_category / robust_z_category : 같은 카테고리(CATEGORY_HEADER 컬럼) 기준 백분위 / robust z-score
+    전체 행 대신 (키워드, *BATCH_SCORE_COLUMNS) 튜플만 score_adjusted 내림차순(동점은 원래 순서)으로
+    돌려주며, 반환값은 {file, rows, seconds, error} 딕셔너리입니다 (실패하면 rows 는 빈 리스트, error 에 사유).
+    """
+    start = time.perf_counter()
+    result = {"file": file_path, "rows": [], "seconds": 0.0, "error": ""}
     try:
-        new_wb.save(save_path)
-        progress_data["save_path"] = save_path
+        wb = openpyxl.load_workbook(file_path, read_only=True)
+        try:
+            rows = wb.active.iter_rows(values_only=True)
+            headers = list(next(rows, ()))
+            try:
+                idx_recent = headers.index("최근\n30일\n검색량")
+                idx_competition = headers.index("네이버\n경쟁강도")
+            except ValueError as e:
+                result["error"] = f"필수 컬럼이 없습니다: {e}"
+                return result
+            idx_keyword = find_keyword_index(headers)
+            if idx_keyword is None:
+                result["error"] = f"키워드 컬럼이 없습니다: {', '.join(KEYWORD_HEADERS)}"
+                return result
+            idx_rocket = headers.index("쿠팡\n로켓\n+\n그로스\n비율") if "쿠팡\n로켓\n+\n그로스\n비율" in headers else None
+            idx_category = find_category_index(headers)
+            width = len(headers)
+            scored = []
+            for row in rows:
+                row = row + (None,) * (width - len(row))
+                recent_val = to_float(row[idx_recent])
+                comp_val = to_float(row[idx_competition])
+                base_score = recent_val / (comp_val + 1)
+                wing_ratio = 100 - to_float(row[idx_rocket]) if idx_rocket is not None else 0.0
+                score_adjusted = base_score * (1 + wing_ratio / 100)
+                category = row[idx_category] if idx_category is not None else None
+                scored.append((row[idx_keyword], category, recent_val, comp_val, base_score, wing_ratio,
+                               score_adjusted))
+        finally:
+            wb.close()
+        result["rows"] = add_normalized_scores(scored)
     except Exception as e:
-        progress_data["error"] = f"저장 실패: {e}"
-    
-    progress_data["completed"] = True
+        result["error"] = f"{type(e).__name__}: {e}"
+    finally:
+        result["seconds"] = time.perf_counter() - start
+    return result
+
+def normalized_scores(scores, category_codes):
+    """
+    보정 점수 배열과 카테고리 코드 배열(0부터 시작하는 정수)로 NORMALIZED_COLUMNS 순서의
+    (행 수 × 5) 정규화 점수 행렬을 계산합니다.
+    """
+    log_score = np.log10(1 + np.maximum(scores, 0))
+    pct_file, robust_z_file = group_normalize(scores, np.zeros(len(scores), dtype=np.int64))
+    pct_category, robust_z_category = group_normalize(scores, category_codes)
+    return np.column_stack([log_score, pct_file, robust_z_file, pct_category, robust_z_category])
+
+def add_normalized_scores(scored):
+    """
+    (키워드, 카테고리, 검색량, 경쟁강도, base_score, wing_ratio, score_adjusted) 튜플 리스트에
+    log_score 와 파일/카테고리별 백분위·robust z-score 를 배열 연산으로 계산해 붙이고,
+    score_adjusted 내림차순(동점은 원래 순서)으로 정렬한 리스트를 반환합니다.
+    """
+    if not scored:
+        return []
+    scores = np.fromiter((row[-1] for row in scored), float, len(scored))
+    category_ids = {}
+    category_codes = np.fromiter((category_ids.setdefault(row[1], len(category_ids)) for row in scored),
+                                 np.int64, len(scored))
+    normalized = normalized_scores(scores, category_codes).tolist()
+    rows = [row + tuple(extra) for row, extra in zip(scored, normalized)]
+    order = np.argsort(-scores, kind="stable")
+    return [rows[i] for i in order.tolist()]
+
+def merge_keyword_results(results):
+    """
+    파일별 점수 결과를 정규화된 키워드(normalize_keyword)로 합칩니다. 키워드마다 LEADERBOARD_SCORE
+    (동점이면 score_adjusted)가 가장 높은 행(그래도 같으면 파일 이름 순서상 앞 파일)을 남기고,
+    그 키워드가 나온 파일 목록을 함께 기록합니다. 같은 기준의 내림차순으로 순위를 매긴 딕셔너리 리스트를 반환합니다.
+    """
+    sort_key = itemgetter(LEADERBOARD_SCORE, "score_adjusted")
+    merged = {}
+    for result in results:
+        source_file = os.path.basename(result["file"])
+        for keyword, *values in result["rows"]:
+            key = normalize_keyword(keyword)
+            entry = merged.get(key)
+            if entry is None:
+                entry = merged[key] = {"keyword": keyword, "normalized": key, "best_file": source_file,
+                                       "source_files": [], **dict(zip(BATCH_SCORE_COLUMNS, values))}
+            else:
+                scores = dict(zip(BATCH_SCORE_COLUMNS, values))
+                if sort_key(scores) > sort_key(entry):
+                    entry.update(keyword=keyword, best_file=source_file, **scores)
+            if source_file not in entry["source_files"]:
+                entry["source_files"].append(source_file)
+    leaderboard = sorted(merged.values(), key=sort_key, reverse=True)
+    for rank, entry in enumerate(leaderboard, start=1):
+        entry["rank"] = rank
+        entry["file_count"] = len(entry["source_files"])
+        entry["source_files"] = ", ".join(entry["source_files"])
+    return leaderboard
+
+def _sheet_title(name, used_titles):
+    """name 을 엑셀 시트 이름 규칙에 맞게 바꾸고, used_titles 와 겹치지 않게 만든 뒤 기록해 반환합니다."""
+    title = re.sub(r"[\\/*?:\[\]]", "_", name)[:31] or "sheet"
+    candidate, suffix = title, 1
+    while candidate in used_titles:
+        suffix += 1
+        candidate = f"{title[:31 - len(str(suffix)) - 1]}~{suffix}"
+    used_titles.add(candidate)
+    return candidate
+
+def process_folder(folder_path, progress_data):
+    """
+    폴더 안의 모든 엑셀 파일(결과 파일과 임시 파일 제외)을 프로세스 풀에서 score_export_file 로 동시에 점수화하고,
+    정규화된 키워드로 중복을 합친 통합 순위와 파일별 시트, 요약(파일별 행 수/처리 시간/오류)을
+    "<폴더명>_<날짜>_키워드통합결과.xlsx" 에 write_only 방식으로 저장합니다.
+    """
+    try:
+        file_paths = sorted(
+            os.path.join(folder_path, name) for name in os.listdir(folder_path)
+            if name.lower().endswith(".xlsx") and not name.startswith("~$")
+            and not any(marker in name for marker in OUTPUT_MARKERS)
+        )
+        if not file_paths:
+            progress_data["error"] = "폴더에 처리할 엑셀 파일이 없습니다."
+            return
+
+        progress_data["phase"] = "batch"
+        progress_data["total"] = len(file_paths)
+        progress_data["processed"] = 0
+        results = []
+        with Pool(min(os.cpu_count() or 1, len(file_paths))) as pool:
+            for result in pool.imap_unordered(score_export_file, file_paths):
+                results.append(result)
+                progress_data["processed"] += 1
+        results.sort(key=itemgetter("file"))
+        leaderboard = merge_keyword_results(results)
+
+        progress_data["phase"] = "saving"
+        progress_data["total_save"] = len(leaderboard) + sum(len(result["rows"]) for result in results)
+        progress_data["saved"] = 0
+
+        new_wb = openpyxl.Workbook(write_only=True)
+        used_titles = {"요약", "통합순위"}
+        summary_sheet = new_wb.create_sheet(title="요약")
+        summary_sheet.append(["file", "rows", "seconds", "error"])
+        for result in results:
+            summary_sheet.append([os.path.basename(result["file"]), len(result["rows"]),
+                                  round(result["seconds"], 3), result["error"]])
+
+        leaderboard_columns = (["rank", "keyword", "normalized"] + BATCH_SCORE_COLUMNS
+                               + ["best_file", "file_count", "source_files"])
+        leaderboard_sheet = new_wb.create_sheet(title="통합순위")
+        leaderboard_sheet.append(leaderboard_columns)
+        for entry in leaderboard:
+            leaderboard_sheet.append([entry[col] for col in leaderboard_columns])
+            progress_data["saved"] += 1
+
+        for result in results:
+            if not result["rows"]:
+                continue
+            base_name = os.path.splitext(os.path.basename(result["file"]))[0]
+            file_sheet = new_wb.create_sheet(title=_sheet_title(base_name, used_titles))
+            file_sheet.append(["rank", "keyword"] + BATCH_SCORE_COLUMNS)
+            for rank, row in enumerate(result["rows"], start=1):
+                file_sheet.append([rank, *row])
+                progress_data["saved"] += 1
+
+        current_date = datetime.now().strftime("%Y-%m-%d")
+        folder_name = os.path.basename(os.path.normpath(folder_path))
+        save_path = os.path.join(folder_path, f"{folder_name}_{current_date}_키워드통합결과.xlsx")
+        try:
+            new_wb.save(save_path)
+            progress_data["save_path"] = save_path
+        except Exception as e:
+            progress_data["error"] = f"저장 실패: {e}"
+    except Exception as e:
+        progress_data["error"] = f"폴더 처리 실패: {type(e).__name__}: {e}"
+    finally:
+        # 어떤 단계에서 실패해도 진행 창이 닫히도록 항상 완료 표시
+        progress_data["completed"] = True
 
 def update_progress(progress_data, progress_bar, progress_label, root):
     phase = progress_data.get("phase", "processing")
@@ -104,6 +480,12 @@ def update_progress(progress_data, progress_bar, progress_label, root):
         progress_bar["maximum"] = total
         progress_bar["value"] = processed
         progress_label.config(text=f"Processing row {processed} of {total}")
+    elif phase == "batch":
+        total = progress_data.get("total", 0)
+        processed = progress_data.get("processed", 0)
+        progress_bar["maximum"] = total
+        progress_bar["value"] = processed
+        progress_label.config(text=f"Scoring file {processed} of {total}")
     elif phase == "saving":
         total_save = progress_data.get("total_save", 1)
         saved = progress_data.get("saved", 0)
@@ -122,30 +504,40 @@ def update_progress(progress_data, progress_bar, progress_label, root):
     else:
         root.after(100, update_progress, progress_data, progress_bar, progress_label, root)
 
-# Tkinter GUI 설정
-root = tk.Tk()
-root.title("Processing...")
-root.geometry("400x150")
-
-progress_label = tk.Label(root, text="Starting processing...")
-progress_label.pack(pady=20)
-progress_bar = Progressbar(root, orient="horizontal", length=300, mode="determinate")
-progress_bar.pack(pady=10)
-
-# 파일 선택 창
-file_path = filedialog.askopenfilename(title="Select Excel File", filetypes=[("Excel files", "*.xlsx")])
-if not file_path:
-    messagebox.showerror("Error", "No file selected.")
-    root.destroy()
-    exit()
-
-# 진행 상황 공유 딕셔너리 생성
-progress_data = {"processed": 0, "total": 0, "completed": False, "phase": "processing"}
-
-# 별도 스레드에서 파일 처리 실행
-thread = threading.Thread(target=process_file, args=(file_path, progress_data))
-thread.start()
-
-# 100ms마다 진행 상황 업데이트
-root.after(100, update_progress, progress_data, progress_bar, progress_label, root)
-root.mainloop()
+def main():
+    # Tkinter GUI 설정
+    root = tk.Tk()
+    root.title("Processing...")
+    root.geometry("400x150")
+
+    progress_label = tk.Label(root, text="Starting processing...")
+    progress_label.pack(pady=20)
+    progress_bar = Progressbar(root, orient="horizontal", length=300, mode="determinate")
+    progress_bar.pack(pady=10)
+
+    # 파일 선택 창 (취소하면 폴더 안의 모든 파일을 처리하는 폴더 모드 선택)
+    file_path = filedialog.askopenfilename(title="Select Excel File", filetypes=[("Excel files", "*.xlsx")])
+    folder_path = ""
+    if not file_path:
+        folder_path = filedialog.askdirectory(title="Select Folder (all Excel files)")
+    if not file_path and not folder_path:
+        messagebox.showerror("Error", "No file selected.")
+        root.destroy()
+        return
+
+    # 진행 상황 공유 딕셔너리 생성
+    progress_data = {"processed": 0, "total": 0, "completed": False, "phase": "processing"}
+
+    # 별도 스레드에서 파일(또는 폴더) 처리 실행
+    if file_path:
+        thread = threading.Thread(target=process_file, args=(file_path, progress_data))
+    else:
+        thread = threading.Thread(target=process_folder, args=(folder_path, progress_data))
+    thread.start()
+
+    # 100ms마다 진행 상황 업데이트
+    root.after(100, update_progress, progress_data, progress_bar, progress_label, root)
+    root.mainloop()
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 import openpyxl
+import numpy as np
 import os
 from datetime import datetime
 import tkinter as tk
@@ -6,34 +7,127 @@ from tkinter import filedialog, messagebox
 from tkinter.ttk import Progressbar
 import threading
 
+# 읽기 전용 워크시트에서 한 번에 점수화하는 행 수
+BATCH_ROWS = 50000
+
+# 점수식에 쓰이는 가중치 이름 (wing_weight 외에는 모두 점수에 같은 방식으로 더해짐)
+WEIGHT_KEYS = ("type_weight", "intent_weight", "competitor_weight", "platform_weight", "wing_weight")
+
 def to_float(value):
     try:
         return float(value)
     except (ValueError, TypeError):
         return 0.0
 
-def calculate_keyword_score(search_volume, competition, wing_ratio,
-                              type_weight, intent_weight, competitor_weight, platform_weight, wing_weight):
-    # 기본 점수: 검색량 / (경쟁 강도 + 1)
+def profile_matrix(profiles):
+    """
+    가중치 프로필들을 (2 × 프로필 수) 행렬로 변환합니다.
+    1행은 1 + 유형/의도/경쟁사/플랫폼 가중치 합, 2행은 wing 가중치이며,
+    [base_score, base_score * wing_ratio / 100] 특징 행렬과 곱하면 키워드 점수
+    base_score * (1 + type + intent + competitor + platform + wing_weight * wing_ratio / 100) 가 됩니다.
+    """
+    matrix = np.zeros((2, len(profiles)))
+    for col, weights in enumerate(profiles.values()):
+        matrix[0, col] = 1 + sum(weights.get(key, 0) for key in WEIGHT_KEYS if key != "wing_weight")
+        matrix[1, col] = weights.get("wing_weight", 0)
+    return matrix
+
+def score_matrix(search_volume, competition, wing_ratio, profiles):
+    """
+    모든 키워드를 모든 가중치 프로필로 한 번에 점수화해 (키워드 × 프로필) 점수 행렬을 반환합니다.
+    입력은 같은 길이의 NumPy 배열이며, 점수 계산은 (키워드 × 2) 특징 행렬과 프로필 행렬의 곱 한 번입니다.
+    """
     base_score = search_volume / (competition + 1)
-    # wing_ratio는 퍼센트로 들어오므로 100으로 나눠 0~1 사이 값으로 변환
-    final_score = base_score * (1 + type_weight + intent_weight + competitor_weight + platform_weight + wing_weight * (wing_ratio / 100))
-    return final_score
+    features = np.column_stack([base_score, base_score * (wing_ratio / 100)])
+    return features @ profile_matrix(profiles)
+
+def select_top(scores, row_numbers, top_N):
+    """
+    점수 내림차순(동점은 row_numbers 가 작은 행 우선)으로 상위 top_N 개의 위치를 반환합니다 (순서는 정렬되지 않음).
+    np.partition 으로 top_N 번째 점수를 O(n)에 찾고, 그 점수와 같은 행은 row_numbers 순서로 채워
+    어떤 입력 순서에서도 같은 행들이 선택됩니다.
+    """
+    if len(scores) <= top_N:
+        return np.arange(len(scores))
+    threshold = np.partition(scores, len(scores) - top_N)[len(scores) - top_N]
+    above = np.flatnonzero(scores > threshold)
+    ties = np.flatnonzero(scores == threshold)
+    ties = ties[np.argsort(row_numbers[ties], kind="stable")][:top_N - len(above)]
+    return np.concatenate([above, ties])
+
+def merge_top(top_scores, top_numbers, scores, numbers, top_N):
+    """상위 버퍼 (점수, 행 번호)와 새 배치를 합쳐 select_top 기준 상위 top_N 만 남긴 (점수, 행 번호, 선택 위치)를 반환합니다."""
+    candidate_scores = np.concatenate([top_scores, scores])
+    candidate_numbers = np.concatenate([top_numbers, numbers])
+    keep = select_top(candidate_scores, candidate_numbers, top_N)
+    return candidate_scores[keep], candidate_numbers[keep], keep
+
+def count_above(selected_scores, selected_numbers, scores, numbers):
+    """
+    한 프로필에서 선택된 키워드마다, (scores, numbers) 배치 중 그 키워드보다 순위가 높은 행
+    (점수가 더 높거나, 점수가 같고 먼저 나온 행) 수를 반환합니다.
+    배치의 각 행을 정렬된 선택 점수에 searchsorted 해 그 행보다 점수가 낮은 선택 키워드 수를 구하고,
+    이를 누적해 세므로 비용은 배치 크기 × log(선택 수)입니다.
+    """
+    order = np.argsort(selected_scores, kind="stable")
+    sorted_scores = selected_scores[order]
+    lower = np.searchsorted(sorted_scores, scores, side="left")
+    upper = np.searchsorted(sorted_scores, scores, side="right")
+    # lower 가 j 보다 큰 행은 정렬 위치 j 의 선택 키워드보다 점수가 높음
+    counts = np.bincount(lower, minlength=len(order) + 1)
+    above = counts[::-1].cumsum()[::-1][1:]
+    # 점수가 같은 행은 먼저 나온 행만 순위가 높음
+    tied = np.flatnonzero(upper > lower)
+    if len(tied):
+        tied_numbers = numbers[tied]
+        for start in np.unique(lower[tied]).tolist():
+            earlier = np.sort(tied_numbers[lower[tied] == start])
+            stop = upper[tied][lower[tied] == start][0]
+            above[start:stop] += np.searchsorted(earlier, selected_numbers[order[start:stop]], side="left")
+    result = np.empty(len(order), dtype=np.int64)
+    result[order] = above
+    return result
+
+def rank_stability(ranks, top_N):
+    """
+    프로필별 순위 행렬에서 키워드마다 순위 안정성 지표를 계산합니다.
+      - rank_std   : 프로필 간 순위의 표준편차 (작을수록 가중치에 덜 민감)
+      - rank_range : 가장 나쁜 순위 - 가장 좋은 순위
+      - top_hits   : 상위 top_N 에 든 프로필 수
+    """
+    return {
+        "rank_std": ranks.std(axis=1),
+        "rank_range": ranks.max(axis=1) - ranks.min(axis=1),
+        "top_hits": (ranks <= top_N).sum(axis=1),
+    }
+
+def process_file(file_path, progress_data, profiles, top_N=100):
+    """
+    엑셀 파일의 모든 키워드를 profiles(이름 → 가중치)의 모든 프로필로 점수화하고,
+    첫 번째 프로필의 점수(final_score) 상위 top_N 키워드를 저장합니다. 각 키워드에는 파일 전체 기준
+    프로필별 순위(rank_<프로필>)와 순위 안정성(rank_std, rank_range, top<N>_count)이 함께 기록되며,
+    프로필 가중치는 "가중치프로필" 시트에 저장됩니다.
 
-def process_file(file_path, progress_data, weights, top_N=100):
+    행은 읽기 전용 워크시트에서 BATCH_ROWS 행씩 스트리밍으로 두 번 읽습니다.
+    첫 번째 읽기에서는 (현재 상위 버퍼 + 배치) 중 상위 top_N 행과 그 행들의 프로필별 점수만 남기고,
+    두 번째 읽기에서는 프로필별로 선택된 키워드보다 순위가 높은 행 수를 count_above 로 세어 정확한 순위를 구합니다.
+    배치 점수는 매번 버리므로 메모리는 배치 하나와 top_N × 프로필 수에 비례하며, 수백만 행 키워드 파일도 처리할 수 있습니다.
+    점수가 같으면 파일에서 먼저 나온 행이 높은 순위입니다.
+    """
     try:
-        wb = openpyxl.load_workbook(file_path)
+        wb = openpyxl.load_workbook(file_path, read_only=True)
         sheet = wb.active
     except Exception as e:
         progress_data["error"] = f"파일 로드 실패: {e}"
         progress_data["completed"] = True
         return
 
-    headers = [cell.value for cell in sheet[1]]
+    headers = list(next(sheet.iter_rows(max_row=1, values_only=True), ()))
     try:
         idx_recent = headers.index("최근\n30일\n검색량")
         idx_competition = headers.index("네이버\n경쟁강도")
     except ValueError as e:
+        wb.close()
         progress_data["error"] = f"필수 컬럼이 없습니다: {e}"
         progress_data["completed"] = True
         return
@@ -44,47 +138,83 @@ def process_file(file_path, progress_data, weights, top_N=100):
     except ValueError:
         idx_rocket = None
 
-    # 새 헤더에 최종 점수(final_score) 추가
-    new_headers = headers + ["final_score"]
-    data_rows = []
-    total_rows = sheet.max_row - 1  # 헤더 제외
-    progress_data["total"] = total_rows
+    profile_names = list(profiles)
+    # 새 헤더에 최종 점수(final_score), 프로필별 순위, 순위 안정성 추가
+    new_headers = (headers + ["final_score"] + [f"rank_{name}" for name in profile_names]
+                   + ["rank_std", "rank_range", f"top{top_N}_count"])
+    width = len(headers)
+    progress_data["total"] = 2 * ((sheet.max_row or 1) - 1)  # 헤더 제외, 두 번 읽음
     progress_data["processed"] = 0
 
-    # 각 행을 처리하여 최종 점수 계산
-    for row in sheet.iter_rows(min_row=2, values_only=True):
-        row = list(row)
-        search_volume = to_float(row[idx_recent])
-        competition = to_float(row[idx_competition])
-        # wing_ratio 계산: "쿠팡\n로켓\n+\n그로스\n비율" 값이 있으면 wing_ratio = 100 - 해당 값, 없으면 0
-        if idx_rocket is not None:
-            rocket_value = to_float(row[idx_rocket])
-            wing_ratio = 100 - rocket_value
-        else:
-            wing_ratio = 0.0
-
-        final_score = calculate_keyword_score(
-            search_volume, competition, wing_ratio,
-            weights.get("type_weight", 0),
-            weights.get("intent_weight", 0),
-            weights.get("competitor_weight", 0),
-            weights.get("platform_weight", 0),
-            weights.get("wing_weight", 0)
-        )
-        new_row = row + [final_score]
-        data_rows.append(new_row)
-        progress_data["processed"] += 1
-
-    # 내림차순 정렬하여 상위 키워드 추출
-    data_rows.sort(key=lambda r: r[-1], reverse=True)
-    top_keywords = data_rows[:top_N]
+    def scored_batches():
+        """시트의 데이터 행을 BATCH_ROWS 행씩 읽어 (행 목록, 행 번호, 점수 행렬)을 생성합니다."""
+        data_rows = sheet.iter_rows(min_row=2, values_only=True)
+        row_count = 0
+        while True:
+            batch_rows = []
+            for row in data_rows:
+                # 읽기 전용 모드에서는 끝의 빈 셀이 생략될 수 있음
+                if len(row) < width:
+                    row = row + (None,) * (width - len(row))
+                batch_rows.append(row)
+                if len(batch_rows) >= BATCH_ROWS:
+                    break
+            if not batch_rows:
+                return
+            search_volume = np.fromiter((to_float(row[idx_recent]) for row in batch_rows), float, len(batch_rows))
+            competition = np.fromiter((to_float(row[idx_competition]) for row in batch_rows), float, len(batch_rows))
+            # wing_ratio 계산: "쿠팡\n로켓\n+\n그로스\n비율" 값이 있으면 wing_ratio = 100 - 해당 값, 없으면 0
+            if idx_rocket is not None:
+                wing_ratio = 100 - np.fromiter((to_float(row[idx_rocket]) for row in batch_rows), float, len(batch_rows))
+            else:
+                wing_ratio = np.zeros(len(batch_rows))
+            scores = score_matrix(search_volume, competition, wing_ratio, profiles)
+            numbers = np.arange(row_count, row_count + len(batch_rows))
+            row_count += len(batch_rows)
+            progress_data["processed"] += len(batch_rows)
+            yield batch_rows, numbers, scores
+
+    # 첫 번째 읽기: 첫 번째 프로필 기준 상위 top_N 버퍼 (점수, 행 번호, 원본 행, 프로필별 점수)
+    top_scores = np.zeros(0)
+    top_numbers = np.zeros(0, dtype=np.int64)
+    top_rows = []
+    top_profile_scores = np.zeros((0, len(profile_names)))
+    for batch_rows, numbers, scores in scored_batches():
+        top_scores, top_numbers, keep = merge_top(top_scores, top_numbers, scores[:, 0], numbers, top_N)
+        candidate_rows = top_rows + batch_rows
+        top_rows = [candidate_rows[i] for i in keep.tolist()]
+        top_profile_scores = np.concatenate([top_profile_scores, scores])[keep]
+
+    # 첫 번째 프로필 점수 내림차순, 동점은 먼저 나온 행 순서로 상위 키워드 정렬
+    order = np.lexsort((top_numbers, -top_scores))
+    final_scores = top_scores[order]
+    row_numbers = top_numbers[order]
+    top_rows = [top_rows[i] for i in order.tolist()]
+    top_profile_scores = top_profile_scores[order]
+
+    # 두 번째 읽기: 프로필별로 선택된 키워드보다 순위가 높은 행 수를 세어 파일 전체 기준 순위 계산
+    ranks = np.ones((len(row_numbers), len(profile_names)), dtype=np.int64)
+    if len(row_numbers):
+        for batch_rows, numbers, scores in scored_batches():
+            for col in range(len(profile_names)):
+                ranks[:, col] += count_above(top_profile_scores[:, col], row_numbers, scores[:, col], numbers)
+    wb.close()
+    stability = rank_stability(ranks, top_N)
 
     # 새 워크북 생성 후 데이터 기록
     new_wb = openpyxl.Workbook()
     new_sheet = new_wb.active
     new_sheet.append(new_headers)
-    for r in top_keywords:
-        new_sheet.append(r)
+    for i, row in enumerate(top_rows):
+        new_sheet.append(list(row) + [final_scores[i].item()]
+                         + ranks[i].tolist()
+                         + [stability["rank_std"][i].item(), stability["rank_range"][i].item(),
+                            stability["top_hits"][i].item()])
+
+    profile_sheet = new_wb.create_sheet(title="가중치프로필")
+    profile_sheet.append(["profile"] + list(WEIGHT_KEYS))
+    for name, weights in profiles.items():
+        profile_sheet.append([name] + [weights.get(key, 0) for key in WEIGHT_KEYS])
 
     current_date = datetime.now().strftime("%Y-%m-%d")
     base_name = os.path.splitext(os.path.basename(file_path))[0]
@@ -139,8 +269,17 @@ weights = {
     "wing_weight": 0.2          # wing_ratio가 높을수록 최종 점수를 높게 반영 (예: 0.2의 가중치)
 }
 
+# 함께 비교할 가중치 프로필 – 첫 번째 프로필(기본)이 final_score 와 상위 키워드 선별 기준입니다.
+# 프로필을 추가하면 한 번의 실행으로 모든 프로필의 순위와 순위 안정성을 함께 확인할 수 있습니다.
+profiles = {
+    "기본": weights,
+    "윙중시": dict(weights, wing_weight=0.5),
+    "경쟁회피": dict(weights, competitor_weight=-0.2),
+    "가중치없음": {key: 0 for key in WEIGHT_KEYS},
+}
+
 progress_data = {"processed": 0, "total": 0, "completed": False}
-thread = threading.Thread(target=process_file, args=(file_path, progress_data, weights))
+thread = threading.Thread(target=process_file, args=(file_path, progress_data, profiles))
 thread.start()
 
 root.after(100, update_progress, progress_data, progress_bar, progress_label, root)
@@ -1,11 +1,20 @@
 import tkinter as tk
 from tkinter import filedialog
 import openpyxl
+import numpy as np
 import re
 from tqdm import tqdm
 import time
 import os
+import json
 from datetime import datetime
+from operator import itemgetter
+
+# 순위 결과 저장 형식 (Parquet 은 pyarrow 가 설치된 경우에만 저장)
+RESULT_FORMATS = ("jsonl", "parquet")
+
+# 카테고리 컬럼 이름 (셀 값 그대로라 숫자 ID 와 문자열이 섞일 수 있어 저장 시 문자열로 통일)
+CATEGORY_COLUMNS = ["대카테고리", "중카테고리", "소카테고리", "세부카테고리"]
 
 def select_excel_file():
     """Tkinter를 사용하여 엑셀 파일 선택 다이얼로그를 열고, 선택된 파일 경로를 반환합니다."""
@@ -54,10 +63,66 @@ def extract_category_indices(header):
     """
     category_indices = {}
     for idx, col in enumerate(header):
-        if col in ["대카테고리", "중카테고리", "소카테고리", "세부카테고리"]:
+        if col in CATEGORY_COLUMNS:
             category_indices[col] = idx
     return category_indices
 
+def load_date_matrix(ws, date_indices, category_indices):
+    """
+    모든 행의 날짜 컬럼 값을 하나의 float 행렬(카테고리 × 날짜)로 읽어오고,
+    각 행의 카테고리 정보(딕셔너리) 리스트와 함께 반환합니다.
+    행렬의 열 순서는 date_indices(최신 → 과거)를 따르며,
+    숫자(int, float)가 아닌 셀은 0으로 처리합니다.
+    진행 상황은 tqdm로 표시합니다.
+    """
+    if len(date_indices) == 1:
+        get_dates = lambda values: (values[date_indices[0]],)
+    else:
+        get_dates = itemgetter(*date_indices)
+    
+    categories = []
+    date_values = []
+    total_rows = ws.max_row - 1  # 헤더 제외
+    for row_values in tqdm(ws.iter_rows(min_row=2, max_row=ws.max_row, values_only=True),
+                           total=total_rows, desc="Loading rows"):
+        categories.append({key: row_values[idx] for key, idx in category_indices.items()})
+        date_values.append(get_dates(row_values))
+    
+    # 셀 타입을 한 번에 판별해 숫자 셀만 남기고 나머지는 0으로 변환
+    cells = np.array(date_values, dtype=object).reshape(len(date_values), len(date_indices))
+    cell_types = np.frompyfunc(type, 1, 1)(cells)
+    is_number = (cell_types == int) | (cell_types == float) | (cell_types == bool)
+    matrix = np.where(is_number, cells, 0).astype(float)
+    return categories, matrix
+
+def compute_growth_metrics(matrix, recent_count=3):
+    """
+    날짜 행렬(카테고리 × 날짜, 최신 → 과거)에서 모든 카테고리의
+      - 전체 날짜 데이터 합계(total)
+      - 최신 recent_count 개 날짜의 합계(recent_sum)
+      - 이전 합계(older_sum)
+      - 성장률(growth_rate)
+      - 최종 점수(final_score = total * (1 + growth_rate))
+    를 한 번에 계산하여 배열 딕셔너리로 반환합니다.
+    모든 값이 정수이면 합계들은 정수 배열로 반환합니다.
+    """
+    if np.array_equal(matrix, np.floor(matrix)):
+        matrix = matrix.astype(np.int64)
+    total = matrix.sum(axis=1)
+    recent_sum = matrix[:, :recent_count].sum(axis=1)
+    older_sum = total - recent_sum
+    # 이전 합계가 0인 경우 성장률 = 최근 합계
+    has_older = older_sum > 0
+    growth_rate = np.where(has_older, recent_sum / np.where(has_older, older_sum, 1), recent_sum)
+    final_score = total * (1 + growth_rate)
+    return {
+        'total': total,
+        'recent_sum': recent_sum,
+        'older_sum': older_sum,
+        'growth_rate': growth_rate,
+        'final_score': final_score,
+    }
+
 def process_rows(ws, header, date_indices, category_indices, recent_count=3):
     """
     각 행에 대해:
@@ -67,48 +132,16 @@ def process_rows(ws, header, date_indices, category_indices, recent_count=3):
       - 성장률(growth_rate)
       - 최종 점수(final_score = total * (1 + growth_rate))
     를 계산하고, 카테고리 정보와 함께 딕셔너리 형태로 리스트에 저장합니다.
-    진행 상황은 tqdm로 표시합니다.
+    계산은 날짜 행렬 전체에 대한 배열 연산으로 한 번에 수행합니다.
     """
+    categories, matrix = load_date_matrix(ws, date_indices, category_indices)
+    metrics = compute_growth_metrics(matrix, recent_count)
+    
     rows_data = []
-    total_rows = ws.max_row - 1  # 헤더 제외
-    for row in tqdm(ws.iter_rows(min_row=2, max_row=ws.max_row), total=total_rows, desc="Processing rows"):
-        row_values = [cell.value for cell in row]
-        # 전체 합계 계산
-        total = 0
-        for idx in date_indices:
-            try:
-                val = row_values[idx]
-                if isinstance(val, (int, float)):
-                    total += val
-            except Exception as e:
-                pass
-        # 최신 날짜 데이터 합계 계산 (recent_count개)
-        recent_sum = 0
-        for idx in date_indices[:recent_count]:
-            try:
-                val = row_values[idx]
-                if isinstance(val, (int, float)):
-                    recent_sum += val
-            except Exception as e:
-                pass
-        older_sum = total - recent_sum
-        if older_sum > 0:
-            growth_rate = recent_sum / older_sum
-        else:
-            growth_rate = recent_sum  # 이전 합계가 0인 경우
-
-        # 최종 점수 계산 (선택 사항: volume과 성장률을 함께 고려)
-        final_score = total * (1 + growth_rate)
-        
-        # 카테고리 정보 추출
-        data = {}
-        for key, idx in category_indices.items():
-            data[key] = row_values[idx]
-        data['total'] = total
-        data['recent_sum'] = recent_sum
-        data['older_sum'] = older_sum
-        data['growth_rate'] = growth_rate
-        data['final_score'] = final_score
+    columns = [(key, values.tolist()) for key, values in metrics.items()]
+    for i, data in enumerate(categories):
+        for key, values in columns:
+            data[key] = values[i]
         rows_data.append(data)
     return rows_data
 
@@ -124,19 +157,65 @@ def rank_categories_by_growth(rows_data):
 
 def save_results_by_growth(ranked_data, original_file_path):
     """
-    성장률 기준 전체 순위 결과를 원본 파일명에 현재 날짜와 시간, 그리고 '_growthRanked' 접미사를 붙여 텍스트 파일로 저장합니다.
+    성장률 기준 전체 순위 결과를 원본 파일명에 현재 날짜와 시간, 그리고 '_growthRanked' 접미사를 붙여
+    JSONL/Parquet 파일로 저장합니다 (write_ranked_results, load_ranked_results 로 다시 읽음).
     """
     base_name = os.path.splitext(os.path.basename(original_file_path))[0]
     timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M")
-    new_filename = f"{base_name}_{timestamp}_growthRanked.txt"
-    
-    with open(new_filename, "w", encoding="utf-8") as f:
-        f.write("전체 카테고리 성장률 순위:\n")
-        f.write("====================================\n")
-        for data in ranked_data:
-            f.write(f"Rank {data['rank']}: {data}\n")
+    new_filename = f"{base_name}_{timestamp}_growthRanked"
     
-    print(f"\n결과가 '{new_filename}' 파일에 저장되었습니다.")
+    saved_files = write_ranked_results(ranked_data, new_filename)
+    print(f"\n결과가 {', '.join(repr(path) for path in saved_files)} 파일에 저장되었습니다.")
+
+def _json_default(value):
+    """numpy 스칼라처럼 json 이 직접 변환하지 못하는 값을 파이썬 기본 타입으로 바꿉니다."""
+    if hasattr(value, 'item'):
+        return value.item()
+    raise TypeError(f"JSON으로 변환할 수 없는 값입니다: {value!r}")
+
+def _with_text_categories(data):
+    """행 딕셔너리의 카테고리 값(CATEGORY_COLUMNS)을 문자열로 바꾼 사본을 반환합니다 (None 은 그대로)."""
+    return {key: (str(value) if key in CATEGORY_COLUMNS and value is not None else value)
+            for key, value in data.items()}
+
+def write_ranked_results(ranked_data, base_path, formats=RESULT_FORMATS):
+    """
+    순위 결과(딕셔너리 리스트)를 base_path 에 확장자를 붙여 JSONL(.jsonl), Parquet(.parquet)으로 저장합니다.
+    JSONL 은 한 줄에 한 행의 JSON 객체이며, Parquet 은 pyarrow 가 설치되어 있지 않으면 건너뜁니다.
+    카테고리 값은 문자열로 통일해 저장합니다 (빈 셀은 None). 한 컬럼에 숫자와 문자열이 섞이면 Parquet 컬럼
+    타입을 정할 수 없기 때문입니다. 저장한 파일 경로 리스트를 반환합니다.
+    """
+    ranked_data = [_with_text_categories(data) for data in ranked_data]
+    saved_files = []
+    if "jsonl" in formats:
+        jsonl_path = base_path + ".jsonl"
+        with open(jsonl_path, "w", encoding="utf-8") as f:
+            for data in ranked_data:
+                f.write(json.dumps(data, ensure_ascii=False, default=_json_default) + "\n")
+        saved_files.append(jsonl_path)
+    if "parquet" in formats:
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            print("pyarrow가 설치되어 있지 않아 Parquet 저장을 건너뜁니다.")
+        else:
+            parquet_path = base_path + ".parquet"
+            pq.write_table(pa.Table.from_pylist(ranked_data), parquet_path)
+            saved_files.append(parquet_path)
+    return saved_files
+
+def load_ranked_results(file_path):
+    """
+    write_ranked_results 로 저장한 .jsonl 또는 .parquet 파일을 딕셔너리 리스트로 읽어옵니다.
+    Parquet 은 pyarrow 가 필요합니다. pandas 분석에서는 pd.read_json(file_path, lines=True)
+    또는 pd.read_parquet(file_path) 로 같은 파일을 바로 읽을 수 있습니다.
+    """
+    if file_path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+        return pq.read_table(file_path).to_pylist()
+    with open(file_path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
 
 def main():
     file_path = select_excel_file()
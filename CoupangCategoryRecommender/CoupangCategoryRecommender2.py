@@ -1,11 +1,24 @@
 import tkinter as tk
 from tkinter import filedialog
 import openpyxl
+import numpy as np
 import re
 from tqdm import tqdm
 import time
 import os
+import json
+import heapq
 from datetime import datetime
+from operator import itemgetter
+
+# 스트리밍 처리 시 한 번에 계산하는 행 수
+BATCH_ROWS = 10000
+
+# 순위 결과 저장 형식 (Parquet 은 pyarrow 가 설치된 경우에만 저장)
+RESULT_FORMATS = ("jsonl", "parquet")
+
+# 카테고리 컬럼 이름 (셀 값 그대로라 숫자 ID 와 문자열이 섞일 수 있어 저장 시 문자열로 통일)
+CATEGORY_COLUMNS = ["대카테고리", "중카테고리", "소카테고리", "세부카테고리"]
 
 def select_excel_file():
     """
@@ -20,11 +33,12 @@ def select_excel_file():
     )
     return file_path
 
-def load_workbook_file(file_path):
+def load_workbook_file(file_path, read_only=False):
     """
     openpyxl을 사용해 엑셀 파일을 불러오고, 기본 워크시트를 반환합니다.
+    read_only=True 이면 행을 순서대로 한 번만 읽을 수 있는 읽기 전용 워크시트를 반환합니다.
     """
-    wb = openpyxl.load_workbook(file_path, data_only=True)
+    wb = openpyxl.load_workbook(file_path, data_only=True, read_only=read_only)
     ws = wb.active
     return ws
 
@@ -61,91 +75,183 @@ def extract_category_indices(header):
     """
     category_indices = {}
     for idx, col in enumerate(header):
-        if col in ["대카테고리", "중카테고리", "소카테고리", "세부카테고리"]:
+        if col in CATEGORY_COLUMNS:
             category_indices[col] = idx
     return category_indices
 
-def process_rows(ws, header, date_indices, category_indices, recent_count=3):
+def to_numeric_matrix(date_values, date_count):
     """
-    각 행에 대해:
+    행별 날짜 값 튜플 리스트를 float 행렬로 변환합니다.
+    셀 타입을 한 번에 판별해 숫자 셀만 남기고 나머지는 0으로 처리합니다.
+    """
+    cells = np.array(date_values, dtype=object).reshape(len(date_values), date_count)
+    cell_types = np.frompyfunc(type, 1, 1)(cells)
+    is_number = (cell_types == int) | (cell_types == float) | (cell_types == bool)
+    return np.where(is_number, cells, 0).astype(float)
+
+def compute_growth_metrics(matrix, recent_count=3):
+    """
+    날짜 행렬(카테고리 × 날짜, 최신 → 과거)에서 모든 카테고리의
       - 전체 날짜 데이터 합계(total)
       - 최신 recent_count 개 날짜의 합계(recent_sum)
       - 이전 합계(older_sum)
       - 성장률(growth_rate)
       - 최종 점수(final_score = total * (1 + growth_rate))
-    를 계산하고, 카테고리 정보와 함께 딕셔너리 형태로 리스트에 저장합니다.
-    진행 상황은 tqdm로 표시합니다.
-    """
-    rows_data = []
-    total_rows = ws.max_row - 1  # 헤더 제외
-    for row in tqdm(ws.iter_rows(min_row=2, max_row=ws.max_row), total=total_rows, desc="Processing rows"):
-        row_values = [cell.value for cell in row]
-        # 전체 합계 계산
-        total = 0
-        for idx in date_indices:
-            try:
-                val = row_values[idx]
-                if isinstance(val, (int, float)):
-                    total += val
-            except Exception as e:
-                pass
-        # 최신 날짜 데이터 합계 계산 (recent_count개)
-        recent_sum = 0
-        for idx in date_indices[:recent_count]:
-            try:
-                val = row_values[idx]
-                if isinstance(val, (int, float)):
-                    recent_sum += val
-            except Exception as e:
-                pass
-        older_sum = total - recent_sum
-        if older_sum > 0:
-            growth_rate = recent_sum / older_sum
+    를 한 번에 계산하여 배열 딕셔너리로 반환합니다.
+    모든 값이 정수이면 합계들은 정수 배열로 반환합니다.
+    """
+    if np.array_equal(matrix, np.floor(matrix)):
+        matrix = matrix.astype(np.int64)
+    total = matrix.sum(axis=1)
+    recent_sum = matrix[:, :recent_count].sum(axis=1)
+    older_sum = total - recent_sum
+    # 이전 합계가 0일 경우 성장률 = 최근 합계
+    has_older = older_sum > 0
+    growth_rate = np.where(has_older, recent_sum / np.where(has_older, older_sum, 1), recent_sum)
+    final_score = total * (1 + growth_rate)
+    return {
+        'total': total,
+        'recent_sum': recent_sum,
+        'older_sum': older_sum,
+        'growth_rate': growth_rate,
+        'final_score': final_score,
+    }
+
+def stream_top_categories(ws, header, date_indices, category_indices, top_n=31, recent_count=3):
+    """
+    워크시트(읽기 전용 권장)의 행을 한 번만 순서대로 읽으면서 최종 점수(final_score)
+    상위 top_n 개 카테고리만 크기 top_n 의 힙에 유지합니다.
+    BATCH_ROWS 행씩 모아 지표를 배열 연산으로 계산하고, 힙의 최솟값보다 점수가 높은
+    행만 (점수, 행 순서, 카테고리 튜플, 합계들) 형태의 작은 튜플로 힙에 넣습니다.
+    메모리는 O(top_n + BATCH_ROWS), 정렬 비용은 O(행 수 · log top_n) 입니다.
+    결과는 final_score 내림차순으로 1위부터 rank 가 부여된 카테고리 딕셔너리 리스트이며,
+    점수가 같으면 먼저 나온 행이 높은 순위를 받습니다.
+    """
+    width = len(header)
+    keys = list(category_indices)
+    get_categories = itemgetter(*category_indices.values())
+    if len(date_indices) == 1:
+        get_dates = lambda values: (values[date_indices[0]],)
+    else:
+        get_dates = itemgetter(*date_indices)
+    
+    heap = []
+    seq = 0
+    batch_categories = []
+    batch_dates = []
+    
+    def flush():
+        nonlocal seq
+        matrix = to_numeric_matrix(batch_dates, len(date_indices))
+        metrics = compute_growth_metrics(matrix, recent_count)
+        scores = metrics['final_score']
+        if len(heap) >= top_n:
+            # 힙이 가득 찼으면 현재 최솟값 이상인 행만 후보
+            candidates = np.flatnonzero(scores >= heap[0][0])
         else:
-            growth_rate = recent_sum  # 이전 합계가 0일 경우
-        
-        # 최종 점수 계산: 전체 합계에 성장률을 가중치로 반영
-        final_score = total * (1 + growth_rate)
-        
-        # 카테고리 정보 추출
-        data = {}
-        for key, idx in category_indices.items():
-            data[key] = row_values[idx]
+            candidates = range(len(scores))
+        for i in candidates:
+            entry = (scores[i].item(), -(seq + i), batch_categories[i],
+                     metrics['total'][i].item(), metrics['recent_sum'][i].item(),
+                     metrics['older_sum'][i].item(), metrics['growth_rate'][i].item())
+            if len(heap) < top_n:
+                heapq.heappush(heap, entry)
+            else:
+                heapq.heappushpop(heap, entry)
+        seq += len(scores)
+        batch_categories.clear()
+        batch_dates.clear()
+    
+    total_rows = ws.max_row - 1 if ws.max_row else None  # 헤더 제외
+    for row_values in tqdm(ws.iter_rows(min_row=2, values_only=True),
+                           total=total_rows, desc="Streaming rows"):
+        # 읽기 전용 모드에서는 끝의 빈 셀이 생략될 수 있음
+        if len(row_values) < width:
+            row_values = row_values + (None,) * (width - len(row_values))
+        category_values = get_categories(row_values)
+        if len(keys) == 1:
+            category_values = (category_values,)
+        batch_categories.append(category_values)
+        batch_dates.append(get_dates(row_values))
+        if len(batch_dates) >= BATCH_ROWS:
+            flush()
+    if batch_dates:
+        flush()
+    
+    top_categories = []
+    for rank, entry in enumerate(sorted(heap, reverse=True), start=1):
+        final_score, _, category_values, total, recent_sum, older_sum, growth_rate = entry
+        data = dict(zip(keys, category_values))
         data['total'] = total
         data['recent_sum'] = recent_sum
         data['older_sum'] = older_sum
         data['growth_rate'] = growth_rate
         data['final_score'] = final_score
-        rows_data.append(data)
-    return rows_data
-
-def rank_categories(rows_data, top_n=31):
-    """
-    최종 점수(final_score)를 기준으로 내림차순 정렬한 후,
-    상위 top_n(예시에서는 31)개의 카테고리를 추출하고,
-    순위를 1위부터 부여합니다.
-    """
-    rows_data_sorted = sorted(rows_data, key=lambda x: x['final_score'], reverse=True)
-    top_categories = rows_data_sorted[:top_n]
-    for rank, data in enumerate(top_categories, start=1):
         data['rank'] = rank
+        top_categories.append(data)
     return top_categories
 
 def save_results(top_categories, original_file_path):
     """
-    추천 결과(1위부터 31위까지)를 원본 파일명에 현재 날짜와 시간, 그리고 '_추천카테고리'를 붙여 텍스트 파일로 저장합니다.
+    추천 결과(1위부터 31위까지)를 원본 파일명에 현재 날짜와 시간, 그리고 '_추천카테고리'를 붙여
+    JSONL/Parquet 파일로 저장합니다 (write_ranked_results, load_ranked_results 로 다시 읽음).
     """
     base_name = os.path.splitext(os.path.basename(original_file_path))[0]
     timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M")
-    new_filename = f"{base_name}_{timestamp}_추천카테고리.txt"
+    new_filename = f"{base_name}_{timestamp}_추천카테고리"
     
-    with open(new_filename, "w", encoding="utf-8") as f:
-        f.write("추천 카테고리 순위 (Top 31):\n")
-        f.write("====================================\n")
-        for data in top_categories:
-            f.write(f"Rank {data['rank']}: {data}\n")
-    
-    print(f"\n결과가 '{new_filename}' 파일에 저장되었습니다.")
+    saved_files = write_ranked_results(top_categories, new_filename)
+    print(f"\n결과가 {', '.join(repr(path) for path in saved_files)} 파일에 저장되었습니다.")
+
+def _json_default(value):
+    """numpy 스칼라처럼 json 이 직접 변환하지 못하는 값을 파이썬 기본 타입으로 바꿉니다."""
+    if hasattr(value, 'item'):
+        return value.item()
+    raise TypeError(f"JSON으로 변환할 수 없는 값입니다: {value!r}")
+
+def _with_text_categories(data):
+    """행 딕셔너리의 카테고리 값(CATEGORY_COLUMNS)을 문자열로 바꾼 사본을 반환합니다 (None 은 그대로)."""
+    return {key: (str(value) if key in CATEGORY_COLUMNS and value is not None else value)
+            for key, value in data.items()}
+
+def write_ranked_results(ranked_data, base_path, formats=RESULT_FORMATS):
+    """
+    순위 결과(딕셔너리 리스트)를 base_path 에 확장자를 붙여 JSONL(.jsonl), Parquet(.parquet)으로 저장합니다.
+    JSONL 은 한 줄에 한 행의 JSON 객체이며, Parquet 은 pyarrow 가 설치되어 있지 않으면 건너뜁니다.
+    카테고리 값은 문자열로 통일해 저장합니다 (빈 셀은 None). 한 컬럼에 숫자와 문자열이 섞이면 Parquet 컬럼
+    타입을 정할 수 없기 때문입니다. 저장한 파일 경로 리스트를 반환합니다.
+    """
+    ranked_data = [_with_text_categories(data) for data in ranked_data]
+    saved_files = []
+    if "jsonl" in formats:
+        jsonl_path = base_path + ".jsonl"
+        with open(jsonl_path, "w", encoding="utf-8") as f:
+            for data in ranked_data:
+                f.write(json.dumps(data, ensure_ascii=False, default=_json_default) + "\n")
+        saved_files.append(jsonl_path)
+    if "parquet" in formats:
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            print("pyarrow가 설치되어 있지 않아 Parquet 저장을 건너뜁니다.")
+        else:
+            parquet_path = base_path + ".parquet"
+            pq.write_table(pa.Table.from_pylist(ranked_data), parquet_path)
+            saved_files.append(parquet_path)
+    return saved_files
+
+def load_ranked_results(file_path):
+    """
+    write_ranked_results 로 저장한 .jsonl 또는 .parquet 파일을 딕셔너리 리스트로 읽어옵니다.
+    Parquet 은 pyarrow 가 필요합니다. pandas 분석에서는 pd.read_json(file_path, lines=True)
+    또는 pd.read_parquet(file_path) 로 같은 파일을 바로 읽을 수 있습니다.
+    """
+    if file_path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+        return pq.read_table(file_path).to_pylist()
+    with open(file_path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
 
 def main():
     file_path = select_excel_file()
@@ -154,7 +260,7 @@ def main():
         return
 
     print("엑셀 파일을 불러오는 중입니다...")
-    ws = load_workbook_file(file_path)
+    ws = load_workbook_file(file_path, read_only=True)
     
     header = get_header(ws)
     print("헤더:", header)
@@ -172,10 +278,11 @@ def main():
     print("카테고리 컬럼 인덱스:", category_indices)
     
     print("각 행의 데이터를 계산 중 (총합, 최근 합계, 성장률, 최종 점수)...")
-    rows_data = process_rows(ws, header, date_indices, category_indices, recent_count=3)
+    top_categories = stream_top_categories(ws, header, date_indices, category_indices,
+                                           top_n=31, recent_count=3)
+    ws.parent.close()
     time.sleep(1)
-    
-    top_categories = rank_categories(rows_data, top_n=31)
+
     print("\n추천 카테고리 순위 (Top 31):")
     for data in top_categories:
         print(f"Rank {data['rank']}: {data}")
@@ -1,23 +1,94 @@
+import argparse
 import tkinter as tk
 from tkinter import filedialog
 import openpyxl
+import numpy as np
 import re
 from tqdm import tqdm
 import time
 import os
-from datetime import datetime
+from datetime import datetime, timedelta
+from operator import itemgetter
+from multiprocessing import Pool
 from openpyxl import Workbook
 
+# 다중 기간 성장 지표에 사용할 기간(일 단위, 최신 날짜 기준)
+GROWTH_WINDOWS = (7, 14, 30)
+
+# 카테고리 계층 (상위 → 하위)
+CATEGORY_LEVELS = ["대카테고리", "중카테고리", "소카테고리", "세부카테고리"]
+
+# 엑셀에 기록할 성장률 지표 컬럼
+METRIC_COLUMNS = ["total", "recent_sum", "older_sum", "growth_rate", "final_score"]
+
+# 증분 업데이트 상태에 보관하는 최신 날짜 수 (다중 기간 지표의 직전 기간까지 포함)
+STATE_TAIL_DAYS = 2 * max(GROWTH_WINDOWS)
+
+# 증분 업데이트 상태에 보관하는 가장 오래된 날짜 수 (cagr 의 시작 구간)
+HEAD_DAYS = min(GROWTH_WINDOWS)
+
+# 급등/급락 탐지: 최신 몇 개 날짜를 평가할지, 각 날짜의 기준선으로 직전 몇 일을 쓸지, 플래그 기준 z-score
+SPIKE_RECENT_DAYS = 3
+SPIKE_BASELINE_DAYS = 28
+SPIKE_Z_THRESHOLD = 3.0
+
+# 기준선 표준편차의 하한 (판매량처럼 개수 데이터에서 평소 값이 일정한 카테고리의 z-score 폭주 방지)
+SPIKE_MIN_STD = 1.0
+
+# 폴더 모드: 파일별로 백분위 순위를 매길 지표 (파일 간 비교용 정규화)
+LEADERBOARD_METRIC = "growth_rate"
+
+# 폴더 모드에서 입력으로 보지 않을 이 스크립트의 결과 파일 이름 표시
+OUTPUT_MARKERS = ("_growthRanked", "_leaderboard")
+
+# True 이면 증분 업데이트 후 전체 날짜로 다시 계산한 상태와 비교해 검증 (체크섬 모드, --verify 의 기본값)
+VERIFY_WITH_FULL_RECOMPUTE = False
+
+# 명령줄 옵션 (옵션 없이 실행하면 예전처럼 상태 파일 없이 전체 날짜로 한 번에 계산)
+def parse_args(argv=None):
+    """증분 업데이트 상태 파일과 체크섬 검증 옵션을 읽습니다."""
+    parser = argparse.ArgumentParser(description="쿠팡 카테고리 성장률 순위를 계산해 엑셀로 저장합니다.")
+    state_group = parser.add_mutually_exclusive_group()
+    state_group.add_argument("--state", metavar="NPZ",
+                             help="이전 실행의 상태 파일(.npz)에 새 날짜 컬럼만 반영 (증분 업데이트)")
+    state_group.add_argument("--select-state", action="store_true",
+                             help="이전 상태 파일을 다이얼로그로 선택해 증분 업데이트")
+    parser.add_argument("--save-state", action="store_true",
+                        help="다음 실행의 증분 업데이트용 상태 파일(<결과>_state.npz)을 저장 "
+                             "(--state, --select-state 를 쓰면 항상 저장)")
+    parser.add_argument("--verify", action="store_true", default=VERIFY_WITH_FULL_RECOMPUTE,
+                        help="증분 업데이트 후 전체 날짜로 다시 계산한 결과와 비교 (체크섬 모드)")
+    return parser.parse_args(argv)
+
 # 엑셀 파일 선택 (CoupangCategoryGrowthRanker 용)
-def select_excel_file():
-    """Tkinter를 사용하여 엑셀 파일 선택 다이얼로그를 열고, 선택된 파일 경로를 반환합니다."""
+def select_excel_files():
+    """
+    Tkinter를 사용하여 엑셀 파일 선택 다이얼로그를 열고, 선택된 파일 경로 리스트를 반환합니다.
+    날짜 범위가 다른 여러 내보내기 파일을 함께 선택하면 하나의 날짜 축으로 합쳐 계산합니다.
+    """
     root = tk.Tk()
     root.withdraw()  # Tk 창 숨김
-    file_path = filedialog.askopenfilename(
-        title="엑셀 파일을 선택하세요",
+    file_paths = filedialog.askopenfilenames(
+        title="엑셀 파일을 선택하세요 (여러 개 선택 시 날짜 축을 맞춰 합침)",
         filetypes=[("Excel files", "*.xlsx *.xls")]
     )
-    return file_path
+    return list(file_paths)
+
+# 폴더 모드용 폴더 선택
+def select_folder():
+    """파일을 선택하지 않았을 때, 폴더 안의 모든 엑셀 파일을 처리할 폴더를 선택합니다 (취소하면 빈 문자열)."""
+    return filedialog.askdirectory(title="폴더 모드: 모든 엑셀 파일을 처리할 폴더를 선택하세요 (취소하면 종료)")
+
+# 이전 실행의 증분 업데이트 상태 파일 선택
+def select_state_file():
+    """
+    이전 실행에서 저장한 상태 파일(.npz)을 선택하는 다이얼로그를 엽니다.
+    취소하면 빈 문자열을 반환하며, 이 경우 모든 날짜 컬럼으로 전체 계산을 수행합니다.
+    """
+    return filedialog.askopenfilename(
+        title="이전 상태 파일을 선택하세요 (취소하면 전체 날짜로 다시 계산)",
+        filetypes=[("Growth state", "*.npz")]
+    )
 
 # 엑셀 파일 불러오기
 def load_workbook_file(file_path):
@@ -60,12 +131,371 @@ def extract_category_indices(header):
     """
     category_indices = {}
     for idx, col in enumerate(header):
-        if col in ["대카테고리", "중카테고리", "소카테고리", "세부카테고리"]:
+        if col in CATEGORY_LEVELS:
             category_indices[col] = idx
     return category_indices
 
+# 모든 행의 날짜 데이터를 하나의 행렬(카테고리 × 날짜)로 읽기
+def load_date_matrix(ws, date_indices, category_indices):
+    """
+    모든 행의 날짜 컬럼 값을 하나의 float 행렬(카테고리 × 날짜)로 읽어오고,
+    각 행의 카테고리 정보(딕셔너리) 리스트와 함께 반환합니다.
+    행렬의 열 순서는 date_indices(최신 → 과거)를 따르며,
+    숫자(int, float)가 아닌 셀은 0으로 처리합니다.
+    진행 상황은 tqdm로 표시합니다.
+    """
+    get_dates = _values_getter(date_indices)
+    
+    categories = []
+    date_values = []
+    total_rows = ws.max_row - 1  # 헤더 제외
+    for row_values in tqdm(ws.iter_rows(min_row=2, max_row=ws.max_row, values_only=True),
+                           total=total_rows, desc="Loading rows"):
+        categories.append({key: row_values[idx] for key, idx in category_indices.items()})
+        date_values.append(get_dates(row_values))
+    return categories, to_numeric_matrix(date_values, len(date_indices))
+
+# 행 값에서 주어진 인덱스의 값들을 튜플로 꺼내는 함수 생성
+def _values_getter(indices):
+    """itemgetter와 같지만 인덱스가 0개 또는 1개여도 항상 튜플을 반환하는 함수를 만듭니다."""
+    if not indices:
+        return lambda values: ()
+    if len(indices) == 1:
+        return lambda values: (values[indices[0]],)
+    return itemgetter(*indices)
+
+# 날짜 셀 값 튜플 리스트를 숫자 행렬로 변환
+def to_numeric_matrix(date_values, date_count):
+    """셀 타입을 한 번에 판별해 숫자 셀만 남기고 나머지는 0으로 변환한 float 행렬을 반환합니다."""
+    cells = np.array(date_values, dtype=object).reshape(len(date_values), date_count)
+    cell_types = np.frompyfunc(type, 1, 1)(cells)
+    is_number = (cell_types == int) | (cell_types == float) | (cell_types == bool)
+    return np.where(is_number, cells, 0).astype(float)
+
+# 카테고리 딕셔너리 리스트를 4단계 카테고리 튜플 리스트로 변환
+def category_keys(categories):
+    """각 카테고리 딕셔너리를 CATEGORY_LEVELS 순서의 튜플(없는 계층은 None)로 변환합니다."""
+    return [tuple(category.get(level) for level in CATEGORY_LEVELS) for category in categories]
+
+# 상태 파일과 워크북 사이에서 카테고리 튜플을 비교하기 위한 키
+def _match_key(key):
+    """
+    카테고리 튜플의 값을 문자열로 바꾼 비교용 키를 반환합니다 (None 은 그대로).
+    상태 파일에는 카테고리 값이 문자열로 저장되므로, 숫자 카테고리 ID 도 워크북 값과 맞춰 찾을 수 있습니다.
+    """
+    return tuple(None if value is None else str(value) for value in key)
+
+# 여러 내보내기 파일을 카테고리 튜플 기준으로 하나의 날짜 축에 정렬
+def load_aligned_exports(file_paths):
+    """
+    날짜 범위가 서로 다르거나 겹치는 여러 엑셀 파일을 4단계 카테고리 튜플로 해시 인덱싱해 합칩니다.
+    모든 파일의 가장 오래된 날짜부터 가장 최신 날짜까지 하루 간격의 합집합 날짜 축(최신 → 과거)을
+    만들고, 각 파일의 날짜 행렬을 그 축의 해당 열에 배치합니다.
+      - 같은 카테고리의 같은 날짜가 여러 파일에 있으면 최신 날짜가 더 늦은 파일의 값을 사용합니다.
+      - 어떤 파일에도 없는 날짜나 카테고리가 없는 파일의 날짜는 0으로 채웁니다.
+      - 한 파일 안에서 같은 카테고리 튜플이 반복되면 마지막 행의 값을 사용합니다.
+    (카테고리 튜플 리스트, 날짜 행렬, 날짜 문자열 리스트)를 반환하며,
+    날짜나 카테고리 컬럼이 없는 파일은 건너뜁니다.
+    """
+    exports = []
+    for file_path in file_paths:
+        print(f"엑셀 파일을 불러오는 중입니다: {file_path}")
+        ws = load_workbook_file(file_path)
+        header = get_header(ws)
+        date_indices = extract_date_columns_indices(header)
+        category_indices = extract_category_indices(header)
+        if not date_indices or not category_indices:
+            print(f"날짜 또는 카테고리 컬럼이 없어 건너뜁니다: {file_path}")
+            continue
+        categories, matrix = load_date_matrix(ws, date_indices, category_indices)
+        exports.append((category_keys(categories), [header[idx] for idx in date_indices], matrix))
+    if not exports:
+        return [], np.zeros((0, 0)), []
+    
+    # 최신 날짜가 이른 파일부터 배치해, 겹치는 날짜는 나중(더 최신) 파일의 값으로 덮어씀
+    exports.sort(key=lambda export: export[1][0])
+    newest = datetime.strptime(max(export[1][0] for export in exports), "%Y-%m-%d")
+    oldest = datetime.strptime(min(export[1][-1] for export in exports), "%Y-%m-%d")
+    dates = [(newest - timedelta(days=offset)).strftime("%Y-%m-%d")
+             for offset in range((newest - oldest).days + 1)]
+    date_positions = {date: position for position, date in enumerate(dates)}
+    
+    row_positions = {}
+    for keys, _, _ in exports:
+        for key in keys:
+            row_positions.setdefault(key, len(row_positions))
+    merged = np.zeros((len(row_positions), len(dates)))
+    covered = np.zeros(len(dates), dtype=bool)
+    for keys, export_dates, matrix in exports:
+        rows = np.fromiter((row_positions[key] for key in keys), dtype=np.int64, count=len(keys))
+        columns = np.array([date_positions[date] for date in export_dates], dtype=np.int64)
+        merged[np.ix_(rows, columns)] = matrix
+        covered[columns] = True
+    
+    missing_dates = [date for date, has_data in zip(dates, covered) if not has_data]
+    if missing_dates:
+        print(f"어느 파일에도 없는 날짜 {len(missing_dates)}일은 0으로 채웁니다: {missing_dates}")
+    return list(row_positions), merged, dates
+
+# 날짜 행렬로 증분 업데이트용 상태 생성
+def build_state(keys, matrix, dates=None, tail_days=STATE_TAIL_DAYS):
+    """
+    날짜 행렬(카테고리 × 날짜, 최신 → 과거)로 지표 계산과 증분 업데이트에 쓰는 상태를 만듭니다.
+      - keys      : 행별 4단계 카테고리 튜플
+      - dates     : 행렬 열과 같은 순서의 날짜 문자열 리스트 (최신 → 과거)
+      - day_count : 누적된 날짜 수
+      - total     : 전체 날짜 합계
+      - tail      : 최신 tail_days 일 값 (최신 → 과거, 날짜가 부족하면 0으로 채움)
+      - head      : 가장 오래된 HEAD_DAYS 일 값 (과거 → 최신, cagr 계산용)
+    total, tail, head 는 행끼리 더할 수 있으므로 계층별 합산도 상태 위에서 수행합니다.
+    """
+    n_rows, n_days = matrix.shape
+    tail = np.zeros((n_rows, tail_days))
+    tail[:, :min(tail_days, n_days)] = matrix[:, :tail_days]
+    head = np.zeros((n_rows, HEAD_DAYS))
+    head[:, :min(HEAD_DAYS, n_days)] = matrix[:, ::-1][:, :HEAD_DAYS]
+    return {
+        'keys': list(keys),
+        'dates': list(dates) if dates is not None else [],
+        'day_count': n_days,
+        'total': matrix.sum(axis=1),
+        'tail': tail,
+        'head': head,
+    }
+
+# 새 워크북의 최신 날짜 컬럼만 읽어 상태 갱신
+def update_state(state, ws, header, date_indices, category_indices):
+    """
+    새 워크북에서 상태의 마지막 날짜 이후 날짜 컬럼만 읽어 갱신한 새 상태를 반환합니다.
+    상태에 있는 카테고리는 새 날짜 값을 total 에 더하고 tail/head 를 밀어내기만 하므로
+    과거 날짜 수와 무관하게 O(행 수)로 갱신됩니다. 처음 등장한 카테고리는 그 행의 날짜 컬럼 전체로
+    상태를 만들며(워크북보다 오래된 날짜는 0), 새 워크북에 없는 카테고리는 상태에서 제외됩니다.
+    카테고리는 _match_key 로 비교하고, 행 순서와 카테고리 값은 새 워크북을 따릅니다.
+    """
+    latest = state['dates'][0] if state['dates'] else ""
+    new_indices = [idx for idx in date_indices if header[idx] > latest]
+    get_new = _values_getter(new_indices)
+    get_all = _values_getter(date_indices)
+    index_of = {_match_key(key): i for i, key in enumerate(state['keys'])}
+    
+    keys, is_fresh, positions, new_values, fresh_values = [], [], [], [], []
+    total_rows = ws.max_row - 1  # 헤더 제외
+    for row_values in tqdm(ws.iter_rows(min_row=2, max_row=ws.max_row, values_only=True),
+                           total=total_rows, desc="Updating rows"):
+        key = tuple(row_values[category_indices[level]] if level in category_indices else None
+                    for level in CATEGORY_LEVELS)
+        keys.append(key)
+        position = index_of.get(_match_key(key))
+        is_fresh.append(position is None)
+        if position is None:
+            fresh_values.append(get_all(row_values))
+        else:
+            positions.append(position)
+            new_values.append(get_new(row_values))
+    
+    day_count = state['day_count'] + len(new_indices)
+    tail_days = state['tail'].shape[1]
+    
+    # 기존 카테고리: 새 날짜 값만 더하고 밀어내기
+    new_matrix = to_numeric_matrix(new_values, len(new_indices))
+    positions = np.array(positions, dtype=np.int64)
+    total = state['total'][positions] + new_matrix.sum(axis=1)
+    tail = np.concatenate([new_matrix, state['tail'][positions]], axis=1)[:, :tail_days]
+    head = state['head'][positions].copy()
+    filled = min(state['day_count'], HEAD_DAYS)
+    oldest_new = new_matrix[:, ::-1][:, :HEAD_DAYS - filled]
+    head[:, filled:filled + oldest_new.shape[1]] = oldest_new
+    
+    # 처음 등장한 카테고리: 누적 날짜 수에 맞춰 전체 날짜로 상태 생성
+    fresh_matrix = to_numeric_matrix(fresh_values, len(date_indices))[:, :day_count]
+    fresh_matrix = np.pad(fresh_matrix, ((0, 0), (0, day_count - fresh_matrix.shape[1])))
+    fresh = build_state([], fresh_matrix, tail_days=tail_days)
+    
+    is_fresh = np.array(is_fresh, dtype=bool)
+    def merge(existing, created):
+        merged = np.empty((len(keys),) + existing.shape[1:])
+        merged[~is_fresh] = existing
+        merged[is_fresh] = created
+        return merged
+    
+    return {
+        'keys': keys,
+        'dates': [header[idx] for idx in new_indices] + state['dates'],
+        'day_count': day_count,
+        'total': merge(total, fresh['total']),
+        'tail': merge(tail, fresh['tail']),
+        'head': merge(head, fresh['head']),
+    }
+
+# 체크섬 모드: 전체 날짜로 다시 계산한 상태와 증분 갱신 상태 비교
+def verify_state(state, ws, header, date_indices, category_indices):
+    """
+    워크북의 날짜 컬럼 전체로 상태를 다시 만들어 증분 갱신된 상태와 비교하고, 불일치 행 수를 반환합니다.
+    워크북이 상태가 누적한 전체 기간을 담고 있을 때만 의미가 있습니다.
+    """
+    categories, matrix = load_date_matrix(ws, date_indices, category_indices)
+    full = build_state(category_keys(categories), matrix, tail_days=state['tail'].shape[1])
+    if full['keys'] != state['keys'] or full['day_count'] != state['day_count']:
+        print(f"체크섬 검증 실패: 카테고리 또는 날짜 수가 다릅니다 "
+              f"(전체 계산 {full['day_count']}일, 증분 상태 {state['day_count']}일)")
+        return len(state['keys'])
+    
+    mismatched = np.zeros(len(state['keys']), dtype=bool)
+    for name in ('total', 'tail', 'head'):
+        expected = full[name].reshape(len(mismatched), -1)
+        actual = state[name].reshape(len(mismatched), -1)
+        mismatched |= ~np.isclose(expected, actual).all(axis=1)
+    mismatch_count = int(mismatched.sum())
+    print(f"체크섬 검증: 전체 {len(mismatched)}개 카테고리 중 불일치 {mismatch_count}개")
+    return mismatch_count
+
+# 상태를 파일(.npz)로 저장
+def save_state(state, state_path):
+    """
+    상태를 압축된 .npz 파일로 저장합니다. 카테고리 값은 문자열로 저장하고,
+    없는 계층(None)은 별도의 마스크로 기록합니다.
+    """
+    key_count = len(state['keys'])
+    keys = [["" if value is None else str(value) for value in key] for key in state['keys']]
+    key_is_none = [[value is None for value in key] for key in state['keys']]
+    np.savez_compressed(
+        state_path,
+        keys=np.array(keys, dtype=str).reshape(key_count, len(CATEGORY_LEVELS)),
+        key_is_none=np.array(key_is_none, dtype=bool).reshape(key_count, len(CATEGORY_LEVELS)),
+        dates=np.array(state['dates'], dtype=str),
+        day_count=np.int64(state['day_count']),
+        total=state['total'],
+        tail=state['tail'],
+        head=state['head'],
+    )
+    print(f"증분 업데이트 상태가 저장되었습니다: {state_path}")
+
+# 저장된 상태 파일(.npz) 불러오기
+def load_state(state_path):
+    """save_state 로 저장한 상태 파일을 불러와 상태 딕셔너리로 반환합니다."""
+    with np.load(state_path) as data:
+        keys = [tuple(None if is_none else value for value, is_none in zip(key, nones))
+                for key, nones in zip(data['keys'].tolist(), data['key_is_none'].tolist())]
+        return {
+            'keys': keys,
+            'dates': data['dates'].tolist(),
+            'day_count': int(data['day_count']),
+            'total': data['total'],
+            'tail': data['tail'],
+            'head': data['head'],
+        }
+
+# 상태에서 총합, 최근 합계, 성장률, 최종 점수를 배열 연산으로 계산
+def compute_growth_metrics(state, recent_count=3):
+    """
+    상태(build_state)에서 모든 카테고리의
+      - 전체 날짜 데이터 합계(total)
+      - 최신 recent_count 개 날짜의 합계(recent_sum)
+      - 이전 합계(older_sum)
+      - 성장률(growth_rate)
+      - 최종 점수(final_score = total * (1 + growth_rate))
+    를 한 번에 계산하여 배열 딕셔너리로 반환합니다.
+    모든 값이 정수이면 합계들은 정수 배열로 반환합니다.
+    """
+    if recent_count > state['tail'].shape[1] and state['day_count'] > state['tail'].shape[1]:
+        raise ValueError(f"recent_count({recent_count})가 상태에 보관된 날짜 수보다 큽니다.")
+    total = state['total']
+    recent = state['tail'][:, :recent_count]
+    if np.array_equal(recent, np.floor(recent)) and np.array_equal(total, np.floor(total)):
+        total = total.astype(np.int64)
+        recent = recent.astype(np.int64)
+    recent_sum = recent.sum(axis=1)
+    older_sum = total - recent_sum
+    # 이전 합계가 0인 경우 성장률 = 최근 합계
+    has_older = older_sum > 0
+    growth_rate = np.where(has_older, recent_sum / np.where(has_older, older_sum, 1), recent_sum)
+    final_score = total * (1 + growth_rate)
+    return {
+        'total': total,
+        'recent_sum': recent_sum,
+        'older_sum': older_sum,
+        'growth_rate': growth_rate,
+        'final_score': final_score,
+    }
+
+# 누적합 행렬에서 최신 window 일 동안의 최소제곱 추세 기울기 계산
+def _trend_slope(cumsum, cumsum2, window):
+    """
+    최신 window 개 날짜 값에 대한 최소제곱 직선의 기울기(하루당 증가량)를 반환합니다.
+    시간 t를 과거 → 최신(0 … window-1)으로 두면 Σt·y 는 누적합의 누적합 cumsum2[:, window-1]과
+    같으므로, 행렬을 다시 순회하지 않고 누적합만으로 계산합니다.
+    """
+    if window < 2:
+        return np.zeros(cumsum.shape[0])
+    sum_t = window * (window - 1) / 2
+    sum_tt = (window - 1) * window * (2 * window - 1) / 6
+    sum_y = cumsum[:, window]
+    sum_ty = cumsum2[:, window - 1]
+    return (window * sum_ty - sum_t * sum_y) / (window * sum_tt - sum_t ** 2)
+
+# 다중 기간(7/14/30일) 성장 지표를 누적합으로 한 번에 계산
+def compute_window_metrics(state, windows=GROWTH_WINDOWS):
+    """
+    상태의 최신 날짜 값(tail, 최신 → 과거)의 누적합 한 번으로 기간별 지표를 계산합니다.
+      - sum_{w}d   : 최신 w일 합계
+      - pop_{w}d   : 직전 w일 대비 최신 w일 비율 (직전 합계가 0이면 최신 합계, growth_rate와 같은 규칙)
+      - slope_{w}d : 최신 w일의 최소제곱 추세 기울기 (하루당 증가량)
+      - cagr       : 가장 오래된 구간(head) 대비 최신 구간의 일 단위 복리 성장률
+                     (구간 길이는 가장 짧은 기간, 양 끝 구간 합계가 0이면 0)
+    날짜 컬럼이 w일보다 적으면 있는 날짜만 사용하며, 날짜 컬럼은 하루 간격이라고 가정합니다.
+    tail 은 2 * max(windows) 일 이상을 보관해야 합니다(STATE_TAIL_DAYS).
+    """
+    n_days = min(state['day_count'], state['tail'].shape[1])
+    matrix = state['tail'][:, :n_days]
+    n_rows = matrix.shape[0]
+    cumsum = np.zeros((n_rows, n_days + 1))
+    np.cumsum(matrix, axis=1, out=cumsum[:, 1:])
+    cumsum2 = np.cumsum(cumsum, axis=1)
+    
+    metrics = {}
+    for window in windows:
+        days = min(window, n_days)
+        current = cumsum[:, days]
+        previous = cumsum[:, min(2 * window, n_days)] - current
+        has_previous = previous > 0
+        metrics[f'sum_{window}d'] = current
+        metrics[f'pop_{window}d'] = np.where(
+            has_previous, current / np.where(has_previous, previous, 1), current)
+        metrics[f'slope_{window}d'] = _trend_slope(cumsum, cumsum2, days)
+    
+    block = min(min(windows), HEAD_DAYS, state['day_count'] // 2)
+    periods = state['day_count'] - block
+    if block > 0:
+        newest = cumsum[:, block]
+        oldest = state['head'][:, :block].sum(axis=1)
+        valid = (newest > 0) & (oldest > 0)
+        ratio = np.where(valid, newest / np.where(valid, oldest, 1), 1)
+        metrics['cagr'] = np.where(valid, ratio ** (1 / periods) - 1, 0)
+    else:
+        metrics['cagr'] = np.zeros(n_rows)
+    return metrics
+
+# 지표 값 기준 내림차순 순위(1위부터) 계산
+def rank_descending(values):
+    """값이 클수록 높은 순위(1위)를 부여한 정수 배열을 반환합니다. 동점은 원래 행 순서를 따릅니다."""
+    ranks = np.empty(len(values), dtype=np.int64)
+    ranks[np.argsort(-values, kind='stable')] = np.arange(1, len(values) + 1)
+    return ranks
+
+# 다중 기간 지표 컬럼 이름 (지표, 순위 순서)
+def window_metric_columns(windows=GROWTH_WINDOWS):
+    """엑셀에 추가로 기록할 다중 기간 지표 컬럼과 순위 컬럼 이름 리스트를 반환합니다."""
+    names = []
+    for window in windows:
+        names += [f'sum_{window}d', f'pop_{window}d', f'slope_{window}d']
+    names.append('cagr')
+    columns = []
+    for name in names:
+        columns += [name, f'{name}_rank']
+    return columns
+
 # 각 행에 대해 총합, 최근 데이터 합계, 성장률, 최종 점수 계산
-def process_rows(ws, header, date_indices, category_indices, recent_count=3):
+def process_rows(ws, header, date_indices, category_indices, recent_count=3, windows=GROWTH_WINDOWS):
     """
     각 행에 대해:
       - 전체 날짜 데이터 합계(total)
@@ -74,51 +504,171 @@ def process_rows(ws, header, date_indices, category_indices, recent_count=3):
       - 성장률(growth_rate)
       - 최종 점수(final_score = total * (1 + growth_rate))
     를 계산하고, 카테고리 정보와 함께 딕셔너리 형태로 리스트에 저장합니다.
-    진행 상황은 tqdm로 표시합니다.
+    windows 기간별 다중 지표(compute_window_metrics)와 각 지표의 순위(_rank)도 함께 저장합니다.
+    계산은 날짜 행렬 전체에 대한 배열 연산으로 한 번에 수행합니다.
     """
+    categories, matrix = load_date_matrix(ws, date_indices, category_indices)
+    return rows_from_matrix(categories, matrix, recent_count, windows)
+
+# 날짜 행렬과 카테고리 정보로 행별 지표 딕셔너리 리스트 생성
+def rows_from_matrix(categories, matrix, recent_count=3, windows=GROWTH_WINDOWS):
+    """
+    카테고리 정보 리스트와 날짜 행렬(같은 행 순서)로 process_rows와 같은 형태의
+    딕셔너리 리스트를 만듭니다. 카테고리 딕셔너리는 복사해서 사용합니다.
+    """
+    state = build_state(category_keys(categories), matrix)
+    return rows_from_state(state, recent_count, windows, categories)
+
+# 상태로 행별 지표 딕셔너리 리스트 생성
+def rows_from_state(state, recent_count=3, windows=GROWTH_WINDOWS, categories=None):
+    """
+    상태(build_state / update_state)로 process_rows와 같은 형태의 딕셔너리 리스트를 만듭니다.
+    categories(같은 행 순서의 딕셔너리 리스트)가 주어지면 복사해서 사용하고,
+    없으면 상태의 카테고리 튜플로 카테고리 정보를 채웁니다.
+    """
+    metrics = compute_growth_metrics(state, recent_count)
+    for name, values in compute_window_metrics(state, windows).items():
+        metrics[name] = values
+        metrics[f'{name}_rank'] = rank_descending(values)
+    
+    if categories is None:
+        categories = [dict(zip(CATEGORY_LEVELS, key)) for key in state['keys']]
     rows_data = []
-    total_rows = ws.max_row - 1  # 헤더 제외
-    for row in tqdm(ws.iter_rows(min_row=2, max_row=ws.max_row), total=total_rows, desc="Processing rows"):
-        row_values = [cell.value for cell in row]
-        # 전체 합계 계산
-        total = 0
-        for idx in date_indices:
-            try:
-                val = row_values[idx]
-                if isinstance(val, (int, float)):
-                    total += val
-            except Exception:
-                pass
-        # 최신 날짜 데이터 합계 계산 (recent_count 개)
-        recent_sum = 0
-        for idx in date_indices[:recent_count]:
-            try:
-                val = row_values[idx]
-                if isinstance(val, (int, float)):
-                    recent_sum += val
-            except Exception:
-                pass
-        older_sum = total - recent_sum
-        if older_sum > 0:
-            growth_rate = recent_sum / older_sum
-        else:
-            growth_rate = recent_sum  # 이전 합계가 0인 경우
-        
-        # 최종 점수 계산 (예: 총합과 성장률을 함께 고려)
-        final_score = total * (1 + growth_rate)
-        
-        # 카테고리 정보 추출
-        data = {}
-        for key, idx in category_indices.items():
-            data[key] = row_values[idx]
-        data['total'] = total
-        data['recent_sum'] = recent_sum
-        data['older_sum'] = older_sum
-        data['growth_rate'] = growth_rate
-        data['final_score'] = final_score
+    columns = [(key, values.tolist()) for key, values in metrics.items()]
+    for i, category in enumerate(categories):
+        data = dict(category)
+        for key, values in columns:
+            data[key] = values[i]
         rows_data.append(data)
     return rows_data
 
+# 같은 키를 가진 행들의 날짜 데이터를 합산
+def _group_sum(keys, matrix):
+    """
+    keys(행마다 하나의 튜플)가 같은 행들을 합산합니다.
+    (고유 키 리스트(첫 등장 순서), 합산 행렬, 행별 그룹 번호 배열)을 반환합니다.
+    """
+    group_ids = {}
+    ids = np.fromiter((group_ids.setdefault(key, len(group_ids)) for key in keys),
+                      dtype=np.int64, count=len(keys))
+    if len(ids) == 0:
+        return [], np.zeros((0, matrix.shape[1])), ids
+    order = np.argsort(ids, kind='stable')
+    starts = np.flatnonzero(np.r_[True, np.diff(ids[order]) != 0])
+    summed = np.add.reduceat(matrix[order], starts, axis=0)
+    return list(group_ids), summed, ids
+
+# 카테고리 계층별(대/중/소) 날짜 데이터 합산 및 성장률 순위 계산
+def rollup_categories(state, recent_count=3, windows=GROWTH_WINDOWS):
+    """
+    세부카테고리 행들의 상태(total, tail, head)를 소 → 중 → 대카테고리 순으로 합산하고,
+    각 계층에서 합산된 상태로 성장률 등 모든 지표를 다시 계산합니다
+    (하위 카테고리 성장률의 평균이 아님). 각 계층은 바로 아래 계층의 합산 결과에서
+    만들어지므로 원본 행 전체는 한 번만 그룹화합니다.
+    {계층 이름: 성장률 순위가 매겨진 딕셔너리 리스트}를 반환하며,
+    row_count 는 합산된 원본 행 수입니다.
+    """
+    tail_days = state['tail'].shape[1]
+    values = np.column_stack([state['total'], state['tail'], state['head']])
+    level_results = {}
+    keys = [key[:-1] for key in state['keys']]
+    row_counts = np.ones(len(keys))
+    for depth in range(len(CATEGORY_LEVELS) - 1, 0, -1):
+        keys = [key[:depth] for key in keys]
+        keys, values, ids = _group_sum(keys, values)
+        row_counts = np.bincount(ids, weights=row_counts, minlength=len(keys))
+        
+        level_categories = []
+        for key, row_count in zip(keys, row_counts.astype(np.int64).tolist()):
+            data = dict(zip(CATEGORY_LEVELS[:depth], key))
+            data['row_count'] = row_count
+            level_categories.append(data)
+        level_state = dict(state, keys=keys, total=values[:, 0],
+                           tail=values[:, 1:1 + tail_days], head=values[:, 1 + tail_days:])
+        rows_data = rows_from_state(level_state, recent_count, windows, level_categories)
+        level_results[CATEGORY_LEVELS[depth - 1]] = rank_categories_by_growth(rows_data)
+    return level_results
+
+# 급등/급락 시트 컬럼 이름
+def spike_columns(recent_days=SPIKE_RECENT_DAYS):
+    """이상 탐지 시트에 기록할 컬럼 이름 리스트를 반환합니다. z_{k}d 는 최신 날짜로부터 k일 전의 z-score 입니다."""
+    return (["rank"] + CATEGORY_LEVELS + ["latest", "baseline_mean", "baseline_std"]
+            + [f"z_{k}d" for k in range(recent_days)] + ["max_z", "min_z", "flag"])
+
+# 최신 날짜들의 급등/급락을 누적합 기반 이동 평균/표준편차로 한 번에 탐지
+def detect_spikes(state, recent_days=SPIKE_RECENT_DAYS, baseline_days=SPIKE_BASELINE_DAYS,
+                  threshold=SPIKE_Z_THRESHOLD):
+    """
+    상태의 최신 날짜 값(tail, 최신 → 과거)에서 최신 recent_days 개 날짜 각각에 대해
+    바로 직전 baseline_days 일의 평균/표준편차를 기준선으로 z-score 를 계산합니다.
+    기준선의 합과 제곱합은 값과 제곱값의 누적합 차이로 구하므로, 모든 카테고리와 평가 날짜를
+    (카테고리 × 평가 날짜) 배열 연산 한 번으로 처리합니다. 표준편차는 SPIKE_MIN_STD 를 하한으로 하며,
+    기준선 날짜가 없으면 z-score 는 0 입니다.
+      - z        : (카테고리 × recent_days) z-score 배열 (열 0 이 최신 날짜)
+      - max_z / min_z : 평가 날짜 중 가장 큰/작은 z-score
+      - flag     : max_z >= threshold 이면 "급등", min_z <= -threshold 이면 "급락"
+                   (둘 다이면 절댓값이 큰 쪽), 아니면 ""
+    """
+    n_days = min(state['day_count'], state['tail'].shape[1])
+    matrix = state['tail'][:, :n_days]
+    n_rows = matrix.shape[0]
+    recent_days = min(recent_days, n_days)
+    cumsum = np.zeros((n_rows, n_days + 1))
+    cumsum_sq = np.zeros((n_rows, n_days + 1))
+    np.cumsum(matrix, axis=1, out=cumsum[:, 1:])
+    np.cumsum(matrix ** 2, axis=1, out=cumsum_sq[:, 1:])
+    
+    # 평가 날짜 k 의 기준선은 열 k+1 … k+baseline_days (있는 날짜까지)
+    starts = np.arange(recent_days) + 1
+    ends = np.minimum(starts + baseline_days, n_days)
+    counts = np.maximum(ends - starts, 0)
+    safe_counts = np.maximum(counts, 1)
+    baseline_sum = cumsum[:, ends] - cumsum[:, np.minimum(starts, n_days)]
+    baseline_sq = cumsum_sq[:, ends] - cumsum_sq[:, np.minimum(starts, n_days)]
+    mean = baseline_sum / safe_counts
+    std = np.sqrt(np.maximum(baseline_sq / safe_counts - mean ** 2, 0))
+    z = np.where(counts > 0, (matrix[:, :recent_days] - mean) / np.maximum(std, SPIKE_MIN_STD), 0)
+    
+    if recent_days > 0:
+        max_z = z.max(axis=1)
+        min_z = z.min(axis=1)
+    else:
+        max_z = min_z = np.zeros(n_rows)
+    surge = (max_z >= threshold) & (max_z >= -min_z)
+    collapse = (min_z <= -threshold) & ~surge
+    return {
+        'latest': matrix[:, 0] if n_days else np.zeros(n_rows),
+        'baseline_mean': mean[:, 0] if recent_days else np.zeros(n_rows),
+        'baseline_std': std[:, 0] if recent_days else np.zeros(n_rows),
+        'z': z,
+        'max_z': max_z,
+        'min_z': min_z,
+        'flag': np.where(surge, "급등", np.where(collapse, "급락", "")),
+    }
+
+# 급등/급락 탐지 결과를 z-score 절댓값 순위가 매겨진 딕셔너리 리스트로 변환
+def rank_spikes(state, recent_days=SPIKE_RECENT_DAYS, baseline_days=SPIKE_BASELINE_DAYS,
+                threshold=SPIKE_Z_THRESHOLD):
+    """
+    detect_spikes 결과를 카테고리별 딕셔너리로 만들고, 가장 강한 변화(max_z 와 -min_z 중 큰 값)의
+    내림차순으로 순위를 부여한 리스트를 반환합니다. 플래그가 붙은 카테고리가 위쪽에 모입니다.
+    """
+    spikes = detect_spikes(state, recent_days, baseline_days, threshold)
+    strength = np.maximum(spikes['max_z'], -spikes['min_z'])
+    order = np.argsort(-strength, kind='stable')
+    columns = [(name, spikes[name].tolist())
+               for name in ('latest', 'baseline_mean', 'baseline_std', 'max_z', 'min_z', 'flag')]
+    z_columns = [(f"z_{k}d", spikes['z'][:, k].tolist()) for k in range(spikes['z'].shape[1])]
+    
+    spike_data = []
+    for rank, i in enumerate(order.tolist(), start=1):
+        data = dict(zip(CATEGORY_LEVELS, state['keys'][i]))
+        for name, values in columns + z_columns:
+            data[name] = values[i]
+        data['rank'] = rank
+        spike_data.append(data)
+    return spike_data
+
 # 성장률 기준으로 내림차순 정렬 후 순위 부여
 def rank_categories_by_growth(rows_data):
     """
@@ -131,10 +681,13 @@ def rank_categories_by_growth(rows_data):
     return rows_data_sorted
 
 # 계산된 결과를 원본 파일과 같은 경로에 엑셀 파일로 저장하는 함수
-def save_results_to_excel(ranked_data, original_file_path):
+def save_results_to_excel(ranked_data, original_file_path, level_results=None, spike_data=None):
     """
     계산된 카테고리 성장률 결과를 원본 파일과 같은 디렉토리에 엑셀 파일로 저장합니다.
     파일명은 원본 파일명을 기반으로 현재 날짜와 시간을 포함합니다.
+    level_results(rollup_categories 결과)가 주어지면 계층별 순위를 각각 별도 시트로 저장하고,
+    spike_data(rank_spikes 결과)가 주어지면 급등/급락 순위를 "급등락" 시트로 저장합니다.
+    저장한 엑셀 파일 경로를 반환합니다.
     """
     base_name = os.path.splitext(os.path.basename(original_file_path))[0]
     now_str = datetime.now().strftime("%Y-%m-%d_%H%M")
@@ -144,26 +697,193 @@ def save_results_to_excel(ranked_data, original_file_path):
     
     wb = Workbook()
     ws = wb.active
+    ws.title = CATEGORY_LEVELS[-1]
     
     # 저장할 컬럼 정의
-    columns = ["rank", "대카테고리", "중카테고리", "소카테고리", "세부카테고리", 
-               "total", "recent_sum", "older_sum", "growth_rate", "final_score"]
+    columns = ["rank"] + CATEGORY_LEVELS + METRIC_COLUMNS + window_metric_columns()
     ws.append(columns)
     
     for data in ranked_data:
         row = [data.get(col, "") for col in columns]
         ws.append(row)
     
+    # 계층별 합산 순위 시트 (대 → 중 → 소)
+    for level, level_data in sorted((level_results or {}).items(),
+                                    key=lambda item: CATEGORY_LEVELS.index(item[0])):
+        depth = CATEGORY_LEVELS.index(level) + 1
+        level_ws = wb.create_sheet(title=level)
+        level_columns = (["rank"] + CATEGORY_LEVELS[:depth] + ["row_count"]
+                         + METRIC_COLUMNS + window_metric_columns())
+        level_ws.append(level_columns)
+        for data in level_data:
+            level_ws.append([data.get(col, "") for col in level_columns])
+    
+    # 급등/급락 탐지 순위 시트
+    if spike_data is not None:
+        spike_ws = wb.create_sheet(title="급등락")
+        z_count = sum(1 for col in spike_data[0] if col.startswith("z_")) if spike_data else SPIKE_RECENT_DAYS
+        columns = spike_columns(z_count)
+        spike_ws.append(columns)
+        for data in spike_data:
+            spike_ws.append([data.get(col, "") for col in columns])
+    
     wb.save(output_file)
     print(f"\n엑셀 파일이 원본 파일과 동일한 경로에 저장되었습니다: {output_file}")
+    return output_file
 
-# 메인 함수: 데이터를 계산하고, 엑셀 파일로 저장하는 전체 과정을 수행
-def main():
-    file_path = select_excel_file()
-    if not file_path:
-        print("파일이 선택되지 않았습니다.")
-        return
+# 백분위 순위 (0~100, 클수록 높은 값)
+def percentile_rank(values):
+    """각 값보다 작거나 같은 값의 비율(%)을 반환합니다. 동점은 같은 백분위를 받습니다."""
+    if len(values) == 0:
+        return np.zeros(0)
+    sorted_values = np.sort(values)
+    return np.searchsorted(sorted_values, values, side='right') / len(values) * 100
+
+# 폴더 모드 작업 단위: 엑셀 파일 한 개의 성장률 순위 계산 (프로세스에서 실행)
+def rank_export_file(file_path):
+    """
+    엑셀 파일 한 개를 전체 계산해 성장률 순위를 매기고, LEADERBOARD_METRIC 의 파일 내 백분위
+    (percentile)를 각 행에 추가합니다. 다이얼로그 없이 실행되므로 프로세스 풀에서 호출할 수 있으며,
+    {file, rows, seconds, error} 딕셔너리를 반환합니다 (실패하면 rows 는 빈 리스트, error 에 사유).
+    """
+    start = time.perf_counter()
+    result = {'file': file_path, 'rows': [], 'seconds': 0.0, 'error': ""}
+    try:
+        ws = load_workbook_file(file_path)
+        header = get_header(ws)
+        date_indices = extract_date_columns_indices(header)
+        category_indices = extract_category_indices(header)
+        if not date_indices or not category_indices:
+            result['error'] = "날짜 또는 카테고리 컬럼 없음"
+        else:
+            categories, matrix = load_date_matrix(ws, date_indices, category_indices)
+            state = build_state(category_keys(categories), matrix, [header[idx] for idx in date_indices])
+            rows_data = rows_from_state(state, recent_count=3)
+            percentiles = percentile_rank(np.array([data[LEADERBOARD_METRIC] for data in rows_data],
+                                                   dtype=float)).tolist()
+            for data, percentile in zip(rows_data, percentiles):
+                data['percentile'] = percentile
+            result['rows'] = rank_categories_by_growth(rows_data)
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+    result['seconds'] = time.perf_counter() - start
+    return result
+
+# 폴더 안의 모든 엑셀 파일을 프로세스 풀로 처리
+def rank_folder(folder_path, processes=None):
+    """
+    폴더 안의 모든 엑셀 파일(이 스크립트의 결과 파일과 임시 파일 제외)을 프로세스 풀에서
+    rank_export_file 로 처리하고, 파일 이름 순서의 결과 리스트를 반환합니다.
+    """
+    file_paths = sorted(
+        os.path.join(folder_path, name) for name in os.listdir(folder_path)
+        if name.lower().endswith((".xlsx", ".xls")) and not name.startswith("~$")
+        and not any(marker in name for marker in OUTPUT_MARKERS)
+    )
+    if not file_paths:
+        return []
+    processes = min(processes or os.cpu_count() or 1, len(file_paths))
+    with Pool(processes) as pool:
+        results = list(tqdm(pool.imap_unordered(rank_export_file, file_paths),
+                            total=len(file_paths), desc="Ranking files"))
+    results.sort(key=lambda result: result['file'])
+    return results
+
+# 파일별 결과를 하나의 리더보드로 합치기
+def build_leaderboard(results):
+    """
+    모든 파일의 행을 파일 내 백분위(percentile) 내림차순, 같은 백분위는 LEADERBOARD_METRIC 내림차순으로
+    합쳐 순위를 매긴 리스트를 반환합니다. 각 행에는 source_file 과 파일 내 순위(file_rank)가 추가됩니다.
+    """
+    leaderboard = []
+    for result in results:
+        source_file = os.path.basename(result['file'])
+        for data in result['rows']:
+            entry = dict(data, source_file=source_file, file_rank=data['rank'])
+            leaderboard.append(entry)
+    leaderboard.sort(key=lambda data: (data['percentile'], data[LEADERBOARD_METRIC]), reverse=True)
+    for rank, data in enumerate(leaderboard, start=1):
+        data['rank'] = rank
+    return leaderboard
+
+# 엑셀 시트 이름으로 쓸 수 있게 정리 (31자, 금지 문자 제거, 중복 방지)
+def _sheet_title(name, used_titles):
+    """name 을 엑셀 시트 이름 규칙에 맞게 바꾸고, used_titles 와 겹치지 않게 만든 뒤 기록해 반환합니다."""
+    title = re.sub(r'[\\/*?:\[\]]', "_", name)[:31] or "sheet"
+    candidate, suffix = title, 1
+    while candidate in used_titles:
+        suffix += 1
+        candidate = f"{title[:31 - len(str(suffix)) - 1]}~{suffix}"
+    used_titles.add(candidate)
+    return candidate
+
+# 폴더 모드 결과(리더보드, 파일별 시트, 요약)를 엑셀로 저장
+def save_folder_results(results, leaderboard, folder_path, total_seconds):
+    """
+    폴더 안에 "<폴더명>_<날짜시간>_leaderboard.xlsx" 를 스트리밍(write_only) 방식으로 저장합니다.
+      - 요약     : 파일별 행 수, 처리 시간(초), 오류
+      - 리더보드 : build_leaderboard 결과
+      - 파일별 시트 : 각 파일의 성장률 순위와 파일 내 백분위
+    저장한 파일 경로를 반환합니다.
+    """
+    folder_name = os.path.basename(os.path.normpath(folder_path))
+    now_str = datetime.now().strftime("%Y-%m-%d_%H%M")
+    output_file = os.path.join(folder_path, f"{folder_name}_{now_str}_leaderboard.xlsx")
+    
+    wb = Workbook(write_only=True)
+    used_titles = {"요약", "리더보드"}
+    summary_ws = wb.create_sheet(title="요약")
+    summary_ws.append(["file", "rows", "seconds", "error"])
+    for result in results:
+        summary_ws.append([os.path.basename(result['file']), len(result['rows']),
+                           round(result['seconds'], 3), result['error']])
+    summary_ws.append(["(전체 경과 시간)", len(leaderboard), round(total_seconds, 3), ""])
+    
+    leaderboard_ws = wb.create_sheet(title="리더보드")
+    columns = ["rank", "source_file", "file_rank", "percentile"] + CATEGORY_LEVELS + METRIC_COLUMNS
+    leaderboard_ws.append(columns)
+    for data in leaderboard:
+        leaderboard_ws.append([data.get(col, "") for col in columns])
     
+    file_columns = ["rank", "percentile"] + CATEGORY_LEVELS + METRIC_COLUMNS + window_metric_columns()
+    for result in results:
+        if not result['rows']:
+            continue
+        base_name = os.path.splitext(os.path.basename(result['file']))[0]
+        file_ws = wb.create_sheet(title=_sheet_title(base_name, used_titles))
+        file_ws.append(file_columns)
+        for data in result['rows']:
+            file_ws.append([data.get(col, "") for col in file_columns])
+    
+    wb.save(output_file)
+    print(f"\n폴더 리더보드가 저장되었습니다: {output_file}")
+    return output_file
+
+# 폴더 모드 전체 과정: 병렬 처리 → 리더보드 → 저장
+def run_folder_mode(folder_path):
+    """폴더의 모든 엑셀 파일을 병렬로 순위 계산하고, 파일별 처리 시간을 요약한 뒤 리더보드를 저장합니다."""
+    start = time.perf_counter()
+    results = rank_folder(folder_path)
+    if not results:
+        print("폴더에 처리할 엑셀 파일이 없습니다.")
+        return None
+    leaderboard = build_leaderboard(results)
+    total_seconds = time.perf_counter() - start
+    
+    print("\n파일별 처리 결과:")
+    for result in results:
+        status = f"오류: {result['error']}" if result['error'] else f"{len(result['rows'])}행"
+        print(f"  {os.path.basename(result['file'])}: {result['seconds']:.2f}초, {status}")
+    print(f"전체 {len(results)}개 파일, {total_seconds:.2f}초")
+    return save_folder_results(results, leaderboard, folder_path, total_seconds)
+
+# 엑셀 파일 한 개로 상태 계산 (이전 상태가 있으면 증분 업데이트)
+def load_export_state(file_path, state_path=None, verify=VERIFY_WITH_FULL_RECOMPUTE):
+    """
+    엑셀 파일 한 개를 읽어 상태를 만듭니다. 이전 상태 파일(state_path)이 있으면 새 날짜 컬럼만 반영하고
+    (verify 이면 전체 계산과 비교해 검증), 없으면 모든 날짜 컬럼으로 전체 계산합니다.
+    필요한 컬럼이 없으면 None 을 반환합니다.
+    """
     print("엑셀 파일을 불러오는 중입니다...")
     ws = load_workbook_file(file_path)
     
@@ -173,27 +893,80 @@ def main():
     date_indices = extract_date_columns_indices(header)
     if not date_indices:
         print("날짜 형식의 컬럼이 발견되지 않았습니다.")
-        return
+        return None
     print("날짜 컬럼 인덱스:", date_indices)
     
     category_indices = extract_category_indices(header)
     if not category_indices:
         print("카테고리 관련 컬럼이 발견되지 않았습니다.")
-        return
+        return None
     print("카테고리 컬럼 인덱스:", category_indices)
     
+    if state_path:
+        print(f"이전 상태({state_path})에 새 날짜 컬럼만 반영하는 중...")
+        previous_state = load_state(state_path)
+        state = update_state(previous_state, ws, header, date_indices, category_indices)
+        print(f"새로 반영된 날짜: {state['dates'][:state['day_count'] - previous_state['day_count']]}")
+        if verify:
+            verify_state(state, ws, header, date_indices, category_indices)
+        return state
+    
     print("각 행의 데이터를 계산 중 (전체 합계, 최근 합계, 성장률 등)...")
-    rows_data = process_rows(ws, header, date_indices, category_indices, recent_count=3)
+    categories, matrix = load_date_matrix(ws, date_indices, category_indices)
+    return build_state(category_keys(categories), matrix, [header[idx] for idx in date_indices])
+
+# 메인 함수: 데이터를 계산하고, 엑셀 파일로 저장하는 전체 과정을 수행
+def main(argv=None):
+    args = parse_args(argv)
+    file_paths = select_excel_files()
+    if not file_paths:
+        folder_path = select_folder()
+        if folder_path:
+            run_folder_mode(folder_path)
+        else:
+            print("파일이 선택되지 않았습니다.")
+        return
+    
+    if len(file_paths) > 1:
+        if args.state or args.select_state:
+            print("여러 파일을 합칠 때는 이전 상태 파일을 쓰지 않고 전체 날짜로 계산합니다.")
+        print(f"{len(file_paths)}개 파일의 날짜 축을 맞춰 하나로 합치는 중...")
+        keys, matrix, dates = load_aligned_exports(file_paths)
+        if not keys:
+            print("합칠 수 있는 파일이 없습니다.")
+            return
+        print(f"합쳐진 카테고리 {len(keys)}개, 날짜 {dates[-1]} ~ {dates[0]} ({len(dates)}일)")
+        state = build_state(keys, matrix, dates)
+    else:
+        state_path = args.state or (select_state_file() if args.select_state else None)
+        state = load_export_state(file_paths[0], state_path, args.verify)
+        if state is None:
+            return
+    file_path = file_paths[0]
+    
+    rows_data = rows_from_state(state, recent_count=3)
     time.sleep(1)
     
     ranked_data = rank_categories_by_growth(rows_data)
     
+    print("카테고리 계층별(대/중/소) 합산 성장률을 계산 중...")
+    level_results = rollup_categories(state, recent_count=3)
+    
+    print("최신 날짜의 급등/급락을 탐지하는 중...")
+    spike_data = rank_spikes(state)
+    flagged = [data for data in spike_data if data['flag']]
+    print(f"급등/급락 카테고리 {len(flagged)}개 (|z| >= {SPIKE_Z_THRESHOLD})")
+    
     print("\n전체 카테고리 성장률 순위:")
     for data in ranked_data:
         print(f"Rank {data['rank']}: {data}")
     
-    # 텍스트 파일 생성 없이 바로 엑셀 파일로 저장 (원본 파일과 같은 경로)
-    save_results_to_excel(ranked_data, file_path)
+    # 텍스트 파일 생성 없이 바로 엑셀 파일로 저장 (첫 번째 원본 파일과 같은 경로)
+    output_file = save_results_to_excel(ranked_data, file_path, level_results, spike_data)
+    
+    # 요청한 경우에만 다음 실행에서 새 날짜만 반영할 수 있도록 상태 저장
+    if args.save_state or args.state or args.select_state:
+        save_state(state, os.path.splitext(output_file)[0] + "_state.npz")
 
 if __name__ == "__main__":
     main()
@@ -1,10 +1,512 @@
-import pandas as pd
-import numpy as np
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 from datetime import datetime
+from contextlib import contextmanager
 import os
+import json
+import time
 import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# pandas/numpy are imported on the first file load (see import_data_libs)
+# so that the window appears without waiting for them
+pd = None
+np = None
+
+# Default analysis cutoffs (editable at runtime from the 기준값 panel)
+DEFAULT_THRESHOLDS = {
+    'min_search_volume': 7999,
+    'attraction_5': 50000,
+    'attraction_4': 30000,
+    'attraction_3': 15000,
+    'attraction_2': 5000,
+    'growth_bonus': 0.5,
+    'rapid_growth': 1.0,
+    'max_competition': 4,
+}
+
+THRESHOLD_FIELDS = [
+    ('min_search_volume', "최소 검색량 (초과 시 유지)"),
+    ('attraction_5', "매력도 5점 검색량 (초과)"),
+    ('attraction_4', "매력도 4점 검색량 (초과)"),
+    ('attraction_3', "매력도 3점 검색량 (초과)"),
+    ('attraction_2', "매력도 2점 검색량 (초과)"),
+    ('growth_bonus', "성장성 가산점 기준 (초과)"),
+    ('rapid_growth', "급성장 기준 (초과)"),
+    ('max_competition', "저경쟁 기준 경쟁률 (미만)"),
+]
+
+# Output formats offered by "전체 분석 내보내기"
+EXPORT_FORMATS = ['xlsx', 'csv', 'parquet']
+
+# Rows converted per batch when streaming a DataFrame into a workbook
+WRITE_CHUNK_ROWS = 50000
+
+# Rows per chunk (and Parquet row group) in 대용량 모드
+CHUNK_ROWS = 100000
+
+# Per-run stage timings are appended here, one JSON object per line
+TIMING_LOG_FILE = "분석_타이밍_로그.jsonl"
+
+# How long closing the window waits for a cancelled job to stop
+CLOSE_WAIT_SECONDS = 5
+
+# Delay before recounting after the last keystroke in a threshold field
+COUNT_DEBOUNCE_MS = 150
+
+
+def import_data_libs():
+    """Import pandas and numpy into this module on first use"""
+    global pd, np
+    if pd is None:
+        import pandas
+        import numpy
+        pd, np = pandas, numpy
+
+
+def find_search_volume_col(columns):
+    """Return the recent-months search volume column name, or None"""
+    return next(
+        (col for col in columns if '검색량' in col and '최근' in col and '개월' in col),
+        None
+    )
+
+
+def clean_search_volume(series):
+    """Convert a search volume column with thousands separators to float"""
+    return (
+        series
+        .astype(str)
+        .str.replace(',', '')
+        .replace(['', 'nan', 'NaN', 'NULL', 'None'], '0')
+        .astype(float)
+    )
+
+
+def filter_search_volume(df, thresholds):
+    """
+    Clean column names and the search volume column, then keep only rows
+    above the minimum search volume threshold.
+    """
+    df = df.copy()
+    df.columns = df.columns.str.replace('\n', '').str.strip()
+    
+    search_volume_col = find_search_volume_col(df.columns)
+    if not search_volume_col:
+        raise KeyError("검색량 관련 컬럼을 찾을 수 없습니다")
+    
+    df[search_volume_col] = clean_search_volume(df[search_volume_col])
+    
+    # Remove rows with null or low search volume
+    df = df.dropna(subset=[search_volume_col])
+    return df[df[search_volume_col] > thresholds['min_search_volume']]
+
+
+def clean_growth_rate(series):
+    """Convert a percentage growth column ('12.5%') to a float ratio"""
+    return (
+        series
+        .fillna('0%')
+        .astype(str)
+        .str.replace('%', '')
+        .replace(['', 'nan', 'NaN', 'NULL'], '0')
+        .astype(float) / 100
+    )
+
+
+def find_competition_col(columns):
+    """Return the competition column name ('경쟁률' preferred), or None"""
+    if '경쟁률' in columns:
+        return '경쟁률'
+    return next((col for col in columns if '경쟁' in col and '광고' not in col), None)
+
+
+def clean_competition(series):
+    """Convert a competition column to float; unparsable values become NaN"""
+    return pd.to_numeric(series.astype(str).str.replace(',', ''), errors='coerce')
+
+
+def build_competition_result(df, thresholds):
+    """Rows below the competition threshold, least competitive first"""
+    competition_col = find_competition_col(df.columns)
+    if not competition_col:
+        raise KeyError("경쟁도 관련 컬럼을 찾을 수 없습니다")
+    result_df = df[df[competition_col] < thresholds['max_competition']]
+    result_df = result_df.sort_values(competition_col, kind='stable').copy()
+    result_df.insert(0, '경쟁도순위', range(1, len(result_df) + 1))
+    return result_df
+
+
+def build_attraction_result(df, thresholds):
+    """All rows ordered by attractiveness score"""
+    result_df = df.sort_values('매력도', ascending=False, kind='stable').copy()
+    result_df.insert(0, '매력도순위', range(1, len(result_df) + 1))
+    return result_df
+
+
+def build_growth_result(df, thresholds):
+    """Rows with positive growth, fastest first"""
+    result_df = df[df['성장성'] > 0].sort_values('성장성', ascending=False, kind='stable').copy()
+    result_df.insert(0, '성장성순위', range(1, len(result_df) + 1))
+    return result_df
+
+
+def build_rapid_growth_result(df, thresholds):
+    """Rows above the 급성장 threshold, fastest first"""
+    result_df = df[df['성장성'] > thresholds['rapid_growth']]
+    result_df = result_df.sort_values('성장성', ascending=False, kind='stable').copy()
+    result_df.insert(0, '급성장순위', range(1, len(result_df) + 1))
+    return result_df
+
+
+# (name, builder) for every analysis; the name is used for sheets and files
+ANALYSES = [
+    ('경쟁도', build_competition_result),
+    ('매력도', build_attraction_result),
+    ('성장성', build_growth_result),
+    ('급성장', build_rapid_growth_result),
+]
+
+
+def _iter_row_values(df, token=None):
+    """Yield plain Python row lists in batches, with NaN mapped to None"""
+    for start in range(0, len(df), WRITE_CHUNK_ROWS):
+        if token is not None:
+            token.check()
+        chunk = df.iloc[start:start + WRITE_CHUNK_ROWS].astype(object)
+        yield from chunk.where(chunk.notna(), None).to_numpy().tolist()
+
+
+def _write_atomic(path, write):
+    """
+    Call write(tmp_path) on a temporary file next to path and move it into
+    place only when it succeeds, so a failed or cancelled write leaves no
+    truncated file behind
+    """
+    root, ext = os.path.splitext(path)
+    tmp_path = f"{root}.tmp{ext}"
+    try:
+        write(tmp_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, path)
+
+
+def write_workbook(sheets, output_file, token=None):
+    """
+    Write {sheet name: DataFrame} to a single xlsx file with a constant-memory
+    writer. XlsxWriter is used when installed, openpyxl write-only otherwise.
+    The file only appears once it is complete.
+    """
+    try:
+        import xlsxwriter
+    except ImportError:
+        xlsxwriter = None
+
+    def write_xlsxwriter(path):
+        wb = xlsxwriter.Workbook(path, {'constant_memory': True})
+        for name, df in sheets.items():
+            ws = wb.add_worksheet(name)
+            ws.write_row(0, 0, [str(col) for col in df.columns])
+            for row_num, row in enumerate(_iter_row_values(df, token), start=1):
+                ws.write_row(row_num, 0, row)
+        wb.close()
+
+    def write_openpyxl(path):
+        from openpyxl import Workbook
+        wb = Workbook(write_only=True)
+        for name, df in sheets.items():
+            ws = wb.create_sheet(title=name)
+            ws.append([str(col) for col in df.columns])
+            for row in _iter_row_values(df, token):
+                ws.append(row)
+        wb.save(path)
+
+    _write_atomic(output_file, write_xlsxwriter if xlsxwriter is not None else write_openpyxl)
+
+
+def export_results(sheets, output_format, base_name, token=None):
+    """
+    Save analysis results in the chosen format and return the output path.
+    xlsx produces one workbook with a sheet per analysis; csv and parquet
+    produce one file per analysis inside a folder named after base_name.
+    Every file is written atomically, and a failed or cancelled csv/parquet
+    export removes the files it already wrote (and the folder, if it made it).
+    """
+    if output_format == 'xlsx':
+        output_file = f"{base_name}.xlsx"
+        write_workbook(sheets, output_file, token)
+        return output_file
+    if output_format not in ('csv', 'parquet'):
+        raise ValueError(f"지원하지 않는 형식입니다: {output_format}")
+
+    created_dir = not os.path.isdir(base_name)
+    os.makedirs(base_name, exist_ok=True)
+    written = []
+    try:
+        for name, df in sheets.items():
+            if token is not None:
+                token.check()
+            path = os.path.join(base_name, f"{name}.{output_format}")
+            if output_format == 'csv':
+                _write_atomic(path, lambda tmp_path: df.to_csv(tmp_path, index=False, encoding='utf-8-sig'))
+            else:
+                # Mixed-type object columns are not representable in Parquet
+                df = df.astype({col: 'string' for col in df.columns if df[col].dtype == object})
+                _write_atomic(path, lambda tmp_path: df.to_parquet(tmp_path, index=False))
+            written.append(path)
+    except BaseException:
+        for path in written:
+            os.remove(path)
+        if created_dir and not os.listdir(base_name):
+            os.rmdir(base_name)
+        raise
+    return base_name
+
+
+def convert_to_columnar(file_path, chunk_rows=CHUNK_ROWS, token=None):
+    """
+    Stream the active sheet of an xlsx file into a Parquet copy next to it,
+    one row group per chunk, and return the Parquet path. An existing copy
+    newer than the source is reused, so the conversion happens once per file.
+    A cancelled conversion leaves no Parquet file behind.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("대용량 모드에는 pyarrow 패키지가 필요합니다 (pip install pyarrow)")
+    from openpyxl import load_workbook
+
+    parquet_path = os.path.splitext(file_path)[0] + '.parquet'
+    if (os.path.exists(parquet_path)
+            and os.path.getmtime(parquet_path) >= os.path.getmtime(file_path)):
+        return parquet_path
+
+    wb = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        rows = wb.active.iter_rows(values_only=True)
+        header = [str(col).replace('\n', '').strip() for col in next(rows)]
+        width = len(header)
+        # Every column is stored as text: Excel columns often mix numbers and
+        # strings, and all row groups must share one schema
+        schema = pa.schema([(name, pa.string()) for name in header])
+
+        def to_table(batch):
+            columns = zip(*(row[:width] + (None,) * (width - len(row)) for row in batch))
+            arrays = [pa.array([None if v is None else str(v) for v in col], pa.string())
+                      for col in columns]
+            return pa.Table.from_arrays(arrays, schema=schema)
+
+        tmp_path = parquet_path + '.tmp'
+        try:
+            with pq.ParquetWriter(tmp_path, schema) as writer:
+                batch = []
+                for row in rows:
+                    batch.append(row)
+                    if len(batch) >= chunk_rows:
+                        writer.write_table(to_table(batch))
+                        batch = []
+                        if token is not None:
+                            token.check()
+                if batch:
+                    writer.write_table(to_table(batch))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+    finally:
+        wb.close()
+
+    os.replace(tmp_path, parquet_path)
+    return parquet_path
+
+
+def iter_columnar_chunks(parquet_path, columns=None, chunk_rows=CHUNK_ROWS):
+    """Yield DataFrame chunks of a Parquet file, optionally only some columns"""
+    import pyarrow.parquet as pq
+    parquet_file = pq.ParquetFile(parquet_path)
+    for batch in parquet_file.iter_batches(batch_size=chunk_rows, columns=columns):
+        yield batch.to_pandas()
+
+
+def read_threshold_columns(parquet_path):
+    """Read only the columns ThresholdIndex needs from a Parquet file"""
+    import pyarrow.parquet as pq
+    names = pq.read_schema(parquet_path).names
+    wanted = [
+        find_search_volume_col(names),
+        '예상3개월검색량상승률' if '예상3개월검색량상승률' in names else None,
+        find_competition_col(names),
+    ]
+    wanted = [col for col in wanted if col]
+    return pq.read_table(parquet_path, columns=wanted).to_pandas()
+
+
+def restore_numeric_columns(df):
+    """Convert text columns whose every non-empty value parses as a number"""
+    for col in df.columns:
+        if pd.api.types.is_numeric_dtype(df[col]) or pd.api.types.is_bool_dtype(df[col]):
+            continue
+        converted = pd.to_numeric(df[col], errors='coerce')
+        if converted.notna().sum() == df[col].notna().sum():
+            df[col] = converted
+    return df
+
+
+class ThresholdIndex:
+    """
+    Sorted views of the tunable columns, built once per loaded file so that
+    "rows matching" counts can be answered without touching the DataFrame.
+    """
+
+    def __init__(self, search_volume, growth, competition):
+        search_volume = np.asarray(search_volume, dtype=float)
+        growth = np.asarray(growth, dtype=float)
+        competition = np.asarray(competition, dtype=float)
+        self.total = len(search_volume)
+        # Rows without a search volume never survive preprocessing
+        valid = ~np.isnan(search_volume)
+        search_volume, growth, competition = search_volume[valid], growth[valid], competition[valid]
+        order = np.argsort(search_volume, kind='stable')
+        self.volume_sorted = search_volume[order]
+        self.volume_cumsum = np.concatenate(([0.0], np.cumsum(self.volume_sorted)))
+        # Other columns aligned with the volume order, so rows kept by the
+        # volume cutoff are always a contiguous tail of these arrays
+        self.growth_by_volume = growth[order]
+        self.competition_by_volume = competition[order]
+
+    @classmethod
+    def from_dataframe(cls, df):
+        """Build the index from a raw (not yet preprocessed) DataFrame"""
+        columns = df.columns.str.replace('\n', '').str.strip()
+        search_volume_col = find_search_volume_col(columns)
+        if not search_volume_col:
+            raise KeyError("검색량 관련 컬럼을 찾을 수 없습니다")
+        search_volume = clean_search_volume(df.iloc[:, columns.get_loc(search_volume_col)])
+        if '예상3개월검색량상승률' in columns:
+            growth = clean_growth_rate(df.iloc[:, columns.get_loc('예상3개월검색량상승률')])
+        else:
+            growth = np.zeros(len(df))
+        competition_col = find_competition_col(columns)
+        if competition_col:
+            competition = clean_competition(df.iloc[:, columns.get_loc(competition_col)])
+        else:
+            competition = np.full(len(df), np.nan)
+        return cls(search_volume, growth, competition)
+
+    def _first_above(self, value):
+        """Position of the first sorted search volume strictly above value"""
+        return int(np.searchsorted(self.volume_sorted, value, side='right'))
+
+    def counts(self, thresholds):
+        """Return matching row counts for every threshold field"""
+        start = self._first_above(thresholds['min_search_volume'])
+        kept_growth = self.growth_by_volume[start:]
+        kept_competition = self.competition_by_volume[start:]
+        valid_total = len(self.volume_sorted)
+        counts = {
+            'min_search_volume': valid_total - start,
+            'kept_volume_sum': self.volume_cumsum[-1] - self.volume_cumsum[start],
+            'growth_bonus': int(np.count_nonzero(kept_growth > thresholds['growth_bonus'])),
+            'rapid_growth': int(np.count_nonzero(kept_growth > thresholds['rapid_growth'])),
+            'max_competition': int(np.count_nonzero(kept_competition < thresholds['max_competition'])),
+        }
+        for key in ('attraction_5', 'attraction_4', 'attraction_3', 'attraction_2'):
+            counts[key] = valid_total - max(start, self._first_above(thresholds[key]))
+        return counts
+
+
+class JobCancelled(Exception):
+    """Raised inside a worker when its cancel token has been set"""
+    pass
+
+
+class CancelToken:
+    """Cooperative cancellation flag shared between the GUI and a worker"""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def check(self):
+        """Raise JobCancelled if cancellation was requested"""
+        if self._event.is_set():
+            raise JobCancelled()
+
+
+class Job:
+    """
+    One worker run split into named stages (load, clean, metrics, sort, write).
+    Each stage reports its row count and elapsed time through `report`, and
+    the whole run is summarized to TIMING_LOG_FILE when it ends.
+    """
+
+    def __init__(self, name, report, source=None):
+        self.name = name
+        self.report = report
+        self.source = source
+        self.token = CancelToken()
+        self.stages = {}
+        self.started_at = datetime.now()
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def stage(self, stage_name):
+        """
+        Time one stage, or one chunk of it. Set 'rows' on the yielded dict;
+        repeated entries into the same stage add up time and rows. The cancel
+        token is checked on entry, i.e. between chunks.
+        """
+        self.token.check()
+        record = self.stages.setdefault(stage_name, {'rows': None, 'seconds': 0.0})
+        chunk = {'rows': None}
+        self.report(f"{self.name}: {stage_name} 진행 중...")
+        start = time.perf_counter()
+        try:
+            yield chunk
+        finally:
+            record['seconds'] += time.perf_counter() - start
+            if chunk['rows'] is not None:
+                record['rows'] = (record['rows'] or 0) + chunk['rows']
+            self.report(f"{self.name}: {self._describe(stage_name, record)}")
+
+    @staticmethod
+    def _describe(stage_name, record):
+        rows = f"{record['rows']:,}행, " if record['rows'] is not None else ""
+        return f"{stage_name} {rows}{record['seconds']:.2f}초"
+
+    def summary_text(self):
+        """One-line timing summary of every stage run so far"""
+        return " | ".join(self._describe(name, record) for name, record in self.stages.items())
+
+    def save_summary(self, status):
+        """Append this run's timings to TIMING_LOG_FILE"""
+        summary = {
+            'job': self.name,
+            'source': self.source,
+            'status': status,
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'total_seconds': round(time.perf_counter() - self._started, 3),
+            'stages': [
+                {'stage': name, 'rows': record['rows'], 'seconds': round(record['seconds'], 3)}
+                for name, record in self.stages.items()
+            ],
+        }
+        try:
+            with open(TIMING_LOG_FILE, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(summary, ensure_ascii=False) + '\n')
+        except OSError:
+            pass
+
 
 class ProductAnalyzer:
     def __init__(self):
@@ -12,13 +514,22 @@ class ProductAnalyzer:
         self.df = None
         self.original_df = None
         self.preprocessed_df = None
+        self.columnar_path = None
+        self.source_file = None
+        self.current_job = None
+        self.current_thread = None
+        self.thresholds = dict(DEFAULT_THRESHOLDS)
+        self.threshold_index = None
+        self._count_after_id = None
+        self._count_generation = 0
+        self.count_executor = ThreadPoolExecutor(max_workers=1)
         self.setup_gui()
         
     def setup_gui(self):
         """Set up the graphical user interface"""
         self.root = tk.Tk()
         self.root.title("상품 분석기")
-        self.root.geometry("800x800")
+        self.root.geometry("800x1000")
         
         # Main frame
         main_frame = ttk.Frame(self.root, padding="10")
@@ -40,6 +551,11 @@ class ProductAnalyzer:
         upload_btn = ttk.Button(file_frame, text="파일 선택", command=self.load_file)
         upload_btn.pack(side=tk.RIGHT, padx=5)
         
+        # Out-of-core mode: convert to Parquet once and stream chunks
+        self.chunked_mode = tk.BooleanVar(value=False)
+        ttk.Checkbutton(file_frame, text="대용량 모드 (청크 처리)",
+                        variable=self.chunked_mode).pack(side=tk.RIGHT, padx=5)
+        
         # Separator
         ttk.Separator(main_frame, orient='horizontal').pack(fill='x', pady=10)
         
@@ -51,11 +567,27 @@ class ProductAnalyzer:
         self.preprocess_stats.pack(pady=5)
         
         self.preprocess_btn = ttk.Button(preprocess_frame, 
-                                       text="전처리 시작 (검색량 500 이하 제거)", 
+                                       text=self._preprocess_button_text(), 
                                        command=self.start_preprocessing)
         self.preprocess_btn.pack(pady=5)
         self.preprocess_btn['state'] = 'disabled'
         
+        # Threshold tuning section
+        threshold_frame = ttk.LabelFrame(main_frame, text="기준값 설정 (입력 즉시 해당 행 수 갱신)", padding="10")
+        threshold_frame.pack(fill='x', pady=10)
+        
+        self.threshold_vars = {}
+        self.count_labels = {}
+        for row, (key, text) in enumerate(THRESHOLD_FIELDS):
+            ttk.Label(threshold_frame, text=text).grid(row=row, column=0, sticky='w', padx=5, pady=2)
+            var = tk.StringVar(value=str(DEFAULT_THRESHOLDS[key]))
+            var.trace_add('write', self._schedule_count_update)
+            ttk.Entry(threshold_frame, textvariable=var, width=12).grid(row=row, column=1, padx=5, pady=2)
+            count_label = ttk.Label(threshold_frame, text="해당 행: -", width=36)
+            count_label.grid(row=row, column=2, sticky='w', padx=5, pady=2)
+            self.threshold_vars[key] = var
+            self.count_labels[key] = count_label
+        
         # Separator
         ttk.Separator(main_frame, orient='horizontal').pack(fill='x', pady=10)
         
@@ -67,6 +599,14 @@ class ProductAnalyzer:
         self.progress = ttk.Progressbar(analysis_frame, mode='indeterminate')
         self.progress.pack(fill=tk.X, pady=10)
         
+        # Stage progress / timing summary of the current job, and its cancel button
+        self.stage_label = ttk.Label(analysis_frame, text="", wraplength=700)
+        self.stage_label.pack(pady=2)
+        
+        self.cancel_btn = ttk.Button(analysis_frame, text="작업 취소", command=self.cancel_job)
+        self.cancel_btn.pack(pady=2)
+        self.cancel_btn['state'] = 'disabled'
+        
         # Analysis buttons
         self.buttons_frame = ttk.Frame(analysis_frame)
         self.buttons_frame.pack(pady=10)
@@ -85,6 +625,19 @@ class ProductAnalyzer:
             btn['state'] = 'disabled'
             self.analysis_buttons.append(btn)
         
+        # Export-all row: every analysis in one pass, in the chosen format
+        export_frame = ttk.Frame(analysis_frame)
+        export_frame.pack(pady=5)
+        
+        self.export_format = tk.StringVar(value=EXPORT_FORMATS[0])
+        ttk.Combobox(export_frame, textvariable=self.export_format, values=EXPORT_FORMATS,
+                     state='readonly', width=8).pack(side=tk.LEFT, padx=5)
+        export_btn = ttk.Button(export_frame, text="5. 전체 분석 한번에 내보내기",
+                                command=self.export_all_analyses, width=30)
+        export_btn.pack(side=tk.LEFT, padx=5)
+        export_btn['state'] = 'disabled'
+        self.analysis_buttons.append(export_btn)
+        
         # Status label
         self.status_label = ttk.Label(main_frame, text="파일을 선택해주세요")
         self.status_label.pack(pady=20)
@@ -94,78 +647,211 @@ class ProductAnalyzer:
 
     def on_closing(self):
         """Handle application closing"""
-        if hasattr(self, 'current_thread') and self.current_thread.is_alive():
-            if messagebox.askokcancel("종료", "작업이 진행 중입니다. 정말 종료하시겠습니까?"):
-                self.root.destroy()
+        if self.current_thread is not None and self.current_thread.is_alive():
+            if messagebox.askokcancel("종료", "작업이 진행 중입니다. 작업을 취소하고 종료하시겠습니까?"):
+                self.cancel_job()
+                self._close_when_idle(time.monotonic() + CLOSE_WAIT_SECONDS)
         else:
-            self.root.destroy()
+            self._shutdown()
+
+    def _close_when_idle(self, deadline):
+        """Wait for the cancelled worker to stop, up to the deadline"""
+        if self.current_thread.is_alive() and time.monotonic() < deadline:
+            self.root.after(100, self._close_when_idle, deadline)
+            return
+        self._shutdown()
+
+    def _shutdown(self):
+        self.count_executor.shutdown(wait=False)
+        self.root.destroy()
+
+    def _start_job(self, name, work, on_success, on_error):
+        """
+        Run work(job) on a daemon thread. on_success receives its return
+        value and on_error the error message; the timing summary is saved
+        however the run ends.
+        """
+        job = Job(name, self._report_stage, source=self.source_file)
+        self.current_job = job
+        self.progress.start()
+        self.cancel_btn['state'] = 'normal'
+        
+        def run():
+            try:
+                result = work(job)
+            except JobCancelled:
+                job.save_summary('cancelled')
+                callback = self._job_cancelled
+            except Exception as e:
+                job.save_summary('failed')
+                error_msg = str(e)
+                callback = lambda: on_error(error_msg)
+            else:
+                job.save_summary('done')
+                callback = lambda: on_success(result)
+            self.root.after(0, self._finish_job, job, callback)
+        
+        self.current_thread = threading.Thread(target=run)
+        self.current_thread.daemon = True
+        self.current_thread.start()
+
+    def _report_stage(self, text):
+        """Worker: show stage progress in the GUI"""
+        self.root.after(0, lambda: self.stage_label.config(text=text))
+
+    def _finish_job(self, job, callback):
+        """Show the timing summary, then hand over to the job's callback"""
+        if job is self.current_job:
+            self.cancel_btn['state'] = 'disabled'
+            self.stage_label.config(text=f"{job.name} 소요 시간 — {job.summary_text()}")
+        callback()
+
+    def cancel_job(self):
+        """Ask the running job to stop at its next stage or chunk boundary"""
+        if self.current_job is not None:
+            self.current_job.token.cancel()
+            self.status_label.config(text="작업 취소 중...")
+
+    def _job_cancelled(self):
+        self.progress.stop()
+        self.status_label.config(text="작업이 취소되었습니다")
+
+    def _preprocess_button_text(self):
+        """Label for the preprocessing button reflecting the current cutoff"""
+        return f"전처리 시작 (검색량 {self.thresholds['min_search_volume']:,g} 이하 제거)"
+
+    def _read_thresholds(self):
+        """Parse the threshold fields; return None if any field is invalid"""
+        thresholds = {}
+        for key, var in self.threshold_vars.items():
+            try:
+                thresholds[key] = float(var.get().replace(',', ''))
+            except ValueError:
+                self.count_labels[key].config(text="해당 행: 잘못된 값")
+                return None
+        return thresholds
+
+    def _schedule_count_update(self, *args):
+        """Debounce threshold edits so counting runs once typing pauses"""
+        if self._count_after_id is not None:
+            self.root.after_cancel(self._count_after_id)
+        self._count_after_id = self.root.after(COUNT_DEBOUNCE_MS, self._submit_count_update)
+
+    def _submit_count_update(self):
+        """Apply edited thresholds and recount matching rows on the worker"""
+        self._count_after_id = None
+        thresholds = self._read_thresholds()
+        if thresholds is None:
+            return
+        
+        changed = thresholds != self.thresholds
+        self.thresholds = thresholds
+        self.preprocess_btn.config(text=self._preprocess_button_text())
+        if changed and self.df is not None:
+            self.status_label.config(text="기준값이 변경되었습니다. 전처리를 다시 실행하면 반영됩니다.")
+        
+        if self.threshold_index is None:
+            for label in self.count_labels.values():
+                label.config(text="해당 행: -")
+            return
+        
+        # Results from older submissions are dropped when they arrive
+        self._count_generation += 1
+        self.count_executor.submit(self._compute_counts, self.threshold_index,
+                                   thresholds, self._count_generation)
+
+    def _compute_counts(self, index, thresholds, generation):
+        """Worker: count matching rows from the precomputed index"""
+        try:
+            counts = index.counts(thresholds)
+        except Exception:
+            return
+        self.root.after(0, self._update_counts, counts, generation)
+
+    def _update_counts(self, counts, generation):
+        """Show the latest match counts next to each threshold field"""
+        if generation != self._count_generation:
+            return
+        
+        total = self.threshold_index.total
+        for key, label in self.count_labels.items():
+            text = f"해당 행: {counts[key]:,} / {total:,}"
+            if key == 'min_search_volume':
+                text += f" (검색량 합계 {counts['kept_volume_sum']:,.0f})"
+            label.config(text=text)
 
     def start_preprocessing(self):
         """Start the preprocessing operation"""
-        try:
-            self.progress.start()
-            self.status_label.config(text="데이터 전처리 중...")
-            
-            # Run in thread
-            self.current_thread = threading.Thread(target=self._preprocess_data)
-            self.current_thread.daemon = True
-            self.current_thread.start()
-            
-        except Exception as e:
-            self.progress.stop()
-            self.status_label.config(text="전처리 실패")
-            messagebox.showerror("에러", f"데이터 전처리 중 오류 발생: {str(e)}")
+        self.status_label.config(text="데이터 전처리 중...")
+        
+        # Run in thread with a snapshot of the current thresholds
+        thresholds = dict(self.thresholds)
+        target = self._preprocess_chunked if self.columnar_path else self._preprocess_data
+        self._start_job("전처리", lambda job: target(job, thresholds),
+                        lambda counts: self._update_preprocessing_complete(*counts),
+                        self._update_preprocessing_error)
 
-    def _preprocess_data(self):
+    def _preprocess_data(self, job, thresholds):
         """Perform the actual preprocessing operations"""
-        try:
-            df = self.original_df.copy()
-            
-            # Clean column names
-            df.columns = df.columns.str.replace('\n', '').str.strip()
-            
-            rows_before = len(df)
-            
-            # Find search volume column
-            search_volume_col = next(
-                (col for col in df.columns if '검색량' in col and '최근' in col and '개월' in col),
-                None
-            )
-            if not search_volume_col:
-                raise KeyError("검색량 관련 컬럼을 찾을 수 없습니다")
-            
-            # Clean search volume data
-            df[search_volume_col] = (
-                df[search_volume_col]
-                .astype(str)
-                .str.replace(',', '')
-                .replace(['', 'nan', 'NaN', 'NULL'], '0')
-                .astype(float)
-            )
-            
-            # Remove rows with null or low search volume
-            df = df.dropna(subset=[search_volume_col])
-            df = df[df[search_volume_col] > 7999]
-            
-            rows_after = len(df)
-            
-            # Save preprocessed data
-            self.preprocessed_df = df
-            
-            # Calculate additional metrics
-            self.df = self.process_additional_metrics(df)
-            
-            # Update GUI in main thread
-            self.root.after(0, self._update_preprocessing_complete, rows_before, rows_after)
+        rows_before = len(self.original_df)
+        
+        # Clean and filter by search volume
+        with job.stage('clean') as stage:
+            df = filter_search_volume(self.original_df, thresholds)
+            stage['rows'] = len(df)
+        
+        # Calculate additional metrics
+        with job.stage('metrics') as stage:
+            metrics_df = self.process_additional_metrics(df, thresholds)
+            stage['rows'] = len(metrics_df)
+        
+        self.preprocessed_df = df
+        self.df = metrics_df
+        return rows_before, len(df)
+
+    def _preprocess_chunked(self, job, thresholds):
+        """
+        Out-of-core preprocessing: stream Parquet chunks through the search
+        volume filter and metric calculations, keeping only surviving rows.
+        """
+        rows_before = 0
+        kept_chunks = []
+        chunks = iter_columnar_chunks(self.columnar_path)
+        while True:
+            with job.stage('load') as stage:
+                chunk = next(chunks, None)
+                stage['rows'] = len(chunk) if chunk is not None else 0
+            if chunk is None:
+                break
+            rows_before += len(chunk)
             
-        except Exception as e:
-            self.root.after(0, self._update_preprocessing_error, str(e))
+            with job.stage('clean') as stage:
+                chunk = filter_search_volume(chunk, thresholds)
+                stage['rows'] = len(chunk)
+            if len(chunk):
+                with job.stage('metrics') as stage:
+                    kept_chunks.append(self.process_additional_metrics(chunk, thresholds))
+                    stage['rows'] = len(chunk)
+        
+        if not kept_chunks:
+            raise ValueError("검색량 기준을 통과한 행이 없습니다")
+        
+        with job.stage('metrics'):
+            # Parquet copy stores text; give numeric columns their type back
+            df = restore_numeric_columns(pd.concat(kept_chunks, ignore_index=True))
+        
+        self.df = df
+        # Survivors are held once, as self.df only
+        self.preprocessed_df = None
+        return rows_before, len(df)
 
-    def process_additional_metrics(self, df):
+    def process_additional_metrics(self, df, thresholds=None):
         """
         Calculate additional metrics for product analysis with enhanced error handling
         and data validation.
         """
+        if thresholds is None:
+            thresholds = self.thresholds
         try:
             # Deep copy to avoid modifying original
             df = df.copy()
@@ -184,54 +870,41 @@ class ProductAnalyzer:
             
             # 2. Growth rate calculation with validation
             if '예상3개월검색량상승률' in df.columns:
-                df['성장성'] = (
-                    df['예상3개월검색량상승률']
-                    .fillna('0%')
-                    .astype(str)
-                    .str.replace('%', '')
-                    .replace(['', 'nan', 'NaN', 'NULL'], '0')
-                    .astype(float) / 100
-                )
+                df['성장성'] = clean_growth_rate(df['예상3개월검색량상승률'])
             else:
                 df['성장성'] = 0.0
                 
             # 3. Find search volume column
-            search_volume_col = next(
-                (col for col in df.columns if '검색량' in col and '최근' in col and '개월' in col),
-                None
-            )
+            search_volume_col = find_search_volume_col(df.columns)
             if not search_volume_col:
                 raise KeyError("검색량 관련 컬럼을 찾을 수 없습니다")
                 
             # 4. Ensure search volume is numeric
-            df[search_volume_col] = (
-                df[search_volume_col]
-                .astype(str)
-                .str.replace(',', '')
-                .replace(['', 'nan', 'NaN', 'NULL'], '0')
-                .astype(float)
-            )
+            df[search_volume_col] = clean_search_volume(df[search_volume_col])
+            
+            # 5. Ensure competition is numeric when the column exists
+            competition_col = find_competition_col(df.columns)
+            if competition_col:
+                df[competition_col] = clean_competition(df[competition_col])
             
-            # 5. Calculate base attractiveness score
+            # 6. Calculate base attractiveness score
             df['매력도'] = np.select(
                 condlist=[
-                    df[search_volume_col] > 50000,
-                    df[search_volume_col] > 30000,
-                    df[search_volume_col] > 15000,
-                    df[search_volume_col] > 5000
+                    df[search_volume_col] > thresholds['attraction_5'],
+                    df[search_volume_col] > thresholds['attraction_4'],
+                    df[search_volume_col] > thresholds['attraction_3'],
+                    df[search_volume_col] > thresholds['attraction_2']
                 ],
                 choicelist=[5, 4, 3, 2],
                 default=1
             )
             
-            # 6. Adjust attractiveness based on shopping keyword and growth
-            df['매력도'] = df.apply(
-                lambda row: min(5, 
-                    row['매력도'] + 
-                    (1 if row['쇼핑성키워드'] else 0) +
-                    (1 if row['성장성'] > 0.5 else 0)
-                ),
-                axis=1
+            # 7. Adjust attractiveness based on shopping keyword and growth
+            df['매력도'] = np.minimum(
+                5,
+                df['매력도']
+                + df['쇼핑성키워드'].astype(int)
+                + (df['성장성'] > thresholds['growth_bonus']).astype(int)
             )
             
             return df
@@ -274,26 +947,38 @@ class ProductAnalyzer:
         )
         if file_path:
             self.status_label.config(text="파일 로딩 중...")
-            self.progress.start()
             self.file_label.config(text=f"선택된 파일: {os.path.basename(file_path)}")
+            self.source_file = file_path
             
-            self.current_thread = threading.Thread(target=self.load_file_thread, args=(file_path,))
-            self.current_thread.daemon = True
-            self.current_thread.start()
+            chunked = self.chunked_mode.get()
+            self._start_job("파일 로딩", lambda job: self.load_file_thread(job, file_path, chunked),
+                            lambda result: self.file_loaded_success(), self.file_loaded_error)
     
-    def load_file_thread(self, file_path):
-        """Thread for file loading operation"""
+    def load_file_thread(self, job, file_path, chunked=False):
+        """Worker for file loading operation"""
+        with job.stage('load') as stage:
+            import_data_libs()
+            if chunked:
+                self.original_df = None
+                self.columnar_path = convert_to_columnar(file_path, token=job.token)
+                index_source = read_threshold_columns(self.columnar_path)
+            else:
+                self.columnar_path = None
+                self.original_df = pd.read_excel(file_path)
+                index_source = self.original_df
+            stage['rows'] = len(index_source)
         try:
-            self.original_df = pd.read_excel(file_path)
-            self.root.after(0, self.file_loaded_success)
-        except Exception as e:
-            self.root.after(0, lambda: self.file_loaded_error(str(e)))
+            self.threshold_index = ThresholdIndex.from_dataframe(index_source)
+        except Exception:
+            # Counts stay unavailable; preprocessing reports the real error
+            self.threshold_index = None
     
     def file_loaded_success(self):
         """Handle successful file loading"""
         self.progress.stop()
         self.status_label.config(text="파일 로딩 완료. 전처리를 시작해주세요.")
         self.preprocess_btn['state'] = 'normal'
+        self._submit_count_update()
         messagebox.showinfo("성공", "파일이 성공적으로 로드되었습니다. 전처리를 진행해주세요.")
     
     def file_loaded_error(self, error_msg):
@@ -302,141 +987,80 @@ class ProductAnalyzer:
         self.status_label.config(text="파일 로딩 실패")
         messagebox.showerror("에러", f"파일 로딩 중 오류 발생: {error_msg}")
 
-    def analyze_competition(self):
-        """Analyze products with low competition"""
-        try:
-            if self.df is None:
-                raise ValueError("분석할 데이터가 없습니다")
-                
-            # Start progress indication
-            self.progress.start()
-            self.status_label.config(text="경쟁도 분석 중...")
+    def _run_analysis(self, name, builder):
+        """Build one analysis result on a worker thread and save it as xlsx"""
+        if self.df is None:
+            self._analysis_error(name, "분석할 데이터가 없습니다")
+            return
             
-            def process():
-                # Get competition analysis results
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                output_file = f"경쟁도_분석결과_{timestamp}.xlsx"
-                
-                # Save results
-                self.df.to_excel(output_file, index=False)
-                
-                # Update GUI in main thread
-                self.root.after(0, lambda: self._analysis_complete(output_file))
-                
-            # Run analysis in thread
-            self.current_thread = threading.Thread(target=process)
-            self.current_thread.daemon = True
-            self.current_thread.start()
+        self.status_label.config(text=f"{name} 분석 중...")
+        df = self.df
+        thresholds = dict(self.thresholds)
+        
+        def process(job):
+            with job.stage('sort') as stage:
+                result_df = builder(df, thresholds)
+                stage['rows'] = len(result_df)
             
-        except Exception as e:
-            self.progress.stop()
-            self.status_label.config(text="분석 실패")
-            messagebox.showerror("에러", f"경쟁도 분석 중 오류 발생: {str(e)}")
+            # Save results with timestamp
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            output_file = f"{name}_분석결과_{timestamp}.xlsx"
+            with job.stage('write') as stage:
+                write_workbook({name: result_df}, output_file, job.token)
+                stage['rows'] = len(result_df)
+            return output_file
+        
+        self._start_job(f"{name} 분석", process, self._analysis_complete,
+                        lambda error_msg: self._analysis_error(name, error_msg))
+
+    def analyze_competition(self):
+        """Analyze products with low competition"""
+        self._run_analysis('경쟁도', build_competition_result)
 
     def analyze_attraction(self):
         """Analyze products with high attraction scores"""
-        try:
-            if self.df is None:
-                raise ValueError("분석할 데이터가 없습니다")
-                
-            # Start progress indication
-            self.progress.start()
-            self.status_label.config(text="매력도 분석 중...")
-            
-            def process():
-                # Sort by attractiveness score and filter top products
-                result_df = self.df.sort_values('매력도', ascending=False).copy()
-                
-                # Add ranking information
-                result_df.insert(0, '매력도순위', range(1, len(result_df) + 1))
-                
-                # Save results with timestamp
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                output_file = f"매력도_분석결과_{timestamp}.xlsx"
-                result_df.to_excel(output_file, index=False)
-                
-                # Update GUI in main thread
-                self.root.after(0, lambda: self._analysis_complete(output_file))
-            
-            # Run analysis in thread
-            self.current_thread = threading.Thread(target=process)
-            self.current_thread.daemon = True
-            self.current_thread.start()
-            
-        except Exception as e:
-            self.progress.stop()
-            self.status_label.config(text="분석 실패")
-            messagebox.showerror("에러", f"매력도 분석 중 오류 발생: {str(e)}")
+        self._run_analysis('매력도', build_attraction_result)
 
     def analyze_growth(self):
         """Analyze products with steady growth"""
-        try:
-            if self.df is None:
-                raise ValueError("분석할 데이터가 없습니다")
-                
-            # Start progress indication
-            self.progress.start()
-            self.status_label.config(text="성장성 분석 중...")
-            
-            def process():
-                # Filter and sort by growth rate
-                result_df = self.df[self.df['성장성'] > 0].sort_values('성장성', ascending=False).copy()
-                
-                # Add ranking information
-                result_df.insert(0, '성장성순위', range(1, len(result_df) + 1))
-                
-                # Save results with timestamp
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                output_file = f"성장성_분석결과_{timestamp}.xlsx"
-                result_df.to_excel(output_file, index=False)
-                
-                # Update GUI in main thread
-                self.root.after(0, lambda: self._analysis_complete(output_file))
-            
-            # Run analysis in thread
-            self.current_thread = threading.Thread(target=process)
-            self.current_thread.daemon = True
-            self.current_thread.start()
-            
-        except Exception as e:
-            self.progress.stop()
-            self.status_label.config(text="분석 실패")
-            messagebox.showerror("에러", f"성장성 분석 중 오류 발생: {str(e)}")
+        self._run_analysis('성장성', build_growth_result)
 
     def analyze_rapid_growth(self):
         """Analyze products with rapid growth"""
-        try:
-            if self.df is None:
-                raise ValueError("분석할 데이터가 없습니다")
-                
-            # Start progress indication
-            self.progress.start()
-            self.status_label.config(text="급성장 분석 중...")
-            
-            def process():
-                # Filter for rapidly growing products (growth > 100%)
-                result_df = self.df[self.df['성장성'] > 1.0].sort_values('성장성', ascending=False).copy()
-                
-                # Add ranking information
-                result_df.insert(0, '급성장순위', range(1, len(result_df) + 1))
-                
-                # Save results with timestamp
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                output_file = f"급성장_분석결과_{timestamp}.xlsx"
-                result_df.to_excel(output_file, index=False)
-                
-                # Update GUI in main thread
-                self.root.after(0, lambda: self._analysis_complete(output_file))
+        self._run_analysis('급성장', build_rapid_growth_result)
+
+    def export_all_analyses(self):
+        """Compute every analysis in one worker pass and export them together"""
+        if self.df is None:
+            self._analysis_error("전체", "분석할 데이터가 없습니다")
+            return
             
-            # Run analysis in thread
-            self.current_thread = threading.Thread(target=process)
-            self.current_thread.daemon = True
-            self.current_thread.start()
+        self.status_label.config(text="전체 분석 내보내는 중...")
+        df = self.df
+        thresholds = dict(self.thresholds)
+        output_format = self.export_format.get()
+        
+        def process(job):
+            sheets = {}
+            for name, builder in ANALYSES:
+                with job.stage('sort') as stage:
+                    sheets[name] = builder(df, thresholds)
+                    stage['rows'] = len(sheets[name])
             
-        except Exception as e:
-            self.progress.stop()
-            self.status_label.config(text="분석 실패")
-            messagebox.showerror("에러", f"급성장 분석 중 오류 발생: {str(e)}")
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            with job.stage('write') as stage:
+                output_file = export_results(sheets, output_format, f"전체_분석결과_{timestamp}", job.token)
+                stage['rows'] = sum(len(result_df) for result_df in sheets.values())
+            return output_file
+        
+        self._start_job("전체 분석", process, self._analysis_complete,
+                        lambda error_msg: self._analysis_error("전체", error_msg))
+
+    def _analysis_error(self, name, error_msg):
+        """Handle failure of analysis operations"""
+        self.progress.stop()
+        self.status_label.config(text="분석 실패")
+        messagebox.showerror("에러", f"{name} 분석 중 오류 발생: {error_msg}")
 
     def _analysis_complete(self, output_file):
         """Handle completion of analysis operations"""
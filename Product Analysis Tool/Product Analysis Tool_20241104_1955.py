@@ -1,15 +1,35 @@
 import pandas as pd
+import numpy as np
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 from datetime import datetime
+from openpyxl import Workbook
 import os
+import queue
 import threading
 
+# 결과 저장 시 한 번에 변환/기록하는 행 수 (이 단위마다 취소 여부 확인)
+WRITE_CHUNK_ROWS = 20000
+
+class JobCancelled(Exception):
+    """작업 취소 요청 시 작업 함수 내부에서 발생"""
+    pass
+
 class ProductAnalyzer:
     def __init__(self):
         self.df = None
+        self.pending_jobs = 0
+        self.jobs = queue.Queue()
+        # 작업마다 등록 시 취소 이벤트를 만듦: job_events 는 끝나지 않은 작업들의 이벤트,
+        # cancel_event 는 워커가 실행 중인 작업의 이벤트
+        self.job_events = set()
+        self.cancel_event = threading.Event()
         self.setup_gui()
         
+        # 분석 작업은 큐에 넣고 백그라운드 워커 하나가 순서대로 처리
+        self.worker = threading.Thread(target=self._job_worker, daemon=True)
+        self.worker.start()
+        
     def setup_gui(self):
         self.root = tk.Tk()
         self.root.title("상품 분석기")
@@ -54,6 +74,11 @@ class ProductAnalyzer:
             btn = ttk.Button(self.buttons_frame, text=text, command=command, width=40)
             btn.pack(pady=5)
         
+        # 작업 취소 버튼 (진행 중이거나 대기 중인 작업 모두 취소)
+        self.cancel_btn = ttk.Button(main_frame, text="작업 취소", command=self.cancel_jobs)
+        self.cancel_btn.pack(pady=5)
+        self.cancel_btn['state'] = 'disabled'
+        
         # 상태 표시 레이블
         self.status_label = ttk.Label(main_frame, text="파일을 선택해주세요")
         self.status_label.pack(pady=20)
@@ -95,88 +120,159 @@ class ProductAnalyzer:
         self.status_label.config(text="파일 로딩 실패")
         messagebox.showerror("에러", f"파일 로딩 중 오류 발생: {error_msg}")
     
-    def process_data(self, conditions, analysis_type):
+    def process_data(self, build_conditions, analysis_type):
         if self.df is None:
             messagebox.showwarning("주의", "먼저 파일을 로드해주세요")
             return
         
-        try:
-            self.status_label.config(text="데이터 분석 중...")
-            self.progress.start()
-            
-            # 조건에 맞는 데이터 필터링
-            filtered_df = self.df.copy()
-            for condition in conditions:
-                filtered_df = filtered_df[condition]
-            
-            # 검색량 기준 정렬 및 순서 부여
-            filtered_df = filtered_df.sort_values('검색량', ascending=False)
-            filtered_df.insert(0, '순서_검색량순', range(1, len(filtered_df) + 1))
-            
-            # 필요한 컬럼만 선택
-            columns = ['순서_검색량순', '키워드', '카테고리전체', '검색량', 
-                      '경쟁률', '광고경쟁강도', '계절성']
-            result_df = filtered_df[columns]
-            
-            # 파일명 생성
-            filename = f"{datetime.now().strftime('%Y-%m-%d')} 좋은 상품 리스트_{analysis_type}.xlsx"
-            
-            # 저장 경로 선택
-            save_path = filedialog.asksaveasfilename(
-                defaultextension=".xlsx",
-                initialfile=filename,
-                filetypes=[("Excel files", "*.xlsx")]
-            )
-            
-            if save_path:
-                result_df.to_excel(save_path, index=False)
-                self.progress.stop()
-                self.status_label.config(text="분석 완료")
-                messagebox.showinfo("완료", 
-                    "오래 기다려주셔서 감사합니다.\n"
-                    "완벽한 상품 리스트가 준비되었습니다.\n"
-                    "브랜드 키워드가 포함되어 있을 수 있으니 참고하세요.")
-                
-                # 파일 열기
-                os.startfile(save_path)
-                
-        except Exception as e:
+        # 파일명 생성
+        filename = f"{datetime.now().strftime('%Y-%m-%d')} 좋은 상품 리스트_{analysis_type}.xlsx"
+        
+        # 저장 경로 선택 (대화상자는 메인 스레드에서만 띄울 수 있으므로 작업 등록 전에 선택)
+        save_path = filedialog.asksaveasfilename(
+            defaultextension=".xlsx",
+            initialfile=filename,
+            filetypes=[("Excel files", "*.xlsx")]
+        )
+        if not save_path:
+            return
+        
+        self.pending_jobs += 1
+        self.cancel_btn['state'] = 'normal'
+        self.status_label.config(text=f"데이터 분석 대기 중... (대기 작업 {self.pending_jobs}개)")
+        self.progress.start()
+        cancel_event = threading.Event()
+        self.job_events.add(cancel_event)
+        self.jobs.put((self._filter_and_save, (self.df, build_conditions, save_path), cancel_event))
+    
+    def _job_worker(self):
+        """작업 큐에서 작업을 하나씩 꺼내 실행"""
+        while True:
+            job, args, cancel_event = self.jobs.get()
+            # 취소 이벤트는 작업 등록 시 만들어지므로, 꺼낸 직후에 누른 취소도 유실되지 않음
+            self.cancel_event = cancel_event
+            self.root.after(0, lambda: self.status_label.config(text="데이터 분석 중..."))
+            try:
+                result = job(*args)
+                self.root.after(0, self._job_done, result)
+            except JobCancelled:
+                self.root.after(0, self._job_cancelled)
+            except Exception as e:
+                error_msg = str(e)
+                self.root.after(0, lambda: self._job_failed(error_msg))
+            finally:
+                self.job_events.discard(cancel_event)
+                self.jobs.task_done()
+    
+    def _check_cancelled(self):
+        if self.cancel_event.is_set():
+            raise JobCancelled()
+    
+    def _filter_and_save(self, df, build_conditions, save_path):
+        """조건 필터링, 검색량 정렬, 엑셀 저장 (워커 스레드에서 실행)"""
+        # 모든 조건을 하나의 마스크로 결합 (조건마다 DataFrame을 복사하지 않음)
+        conditions = [np.asarray(condition, dtype=bool) for condition in build_conditions(df)]
+        mask = np.logical_and.reduce(conditions)
+        self._check_cancelled()
+        
+        # 검색량 기준 내림차순 정렬 (선택된 행의 위치만 정렬)
+        selected = np.flatnonzero(mask)
+        search_volume = pd.to_numeric(df['검색량'].iloc[selected], errors='coerce').to_numpy(dtype=float)
+        order = selected[np.argsort(-search_volume, kind='stable')]
+        self._check_cancelled()
+        
+        # 필요한 컬럼만 선택
+        columns = ['키워드', '카테고리전체', '검색량', 
+                  '경쟁률', '광고경쟁강도', '계절성']
+        missing = [col for col in columns if col not in df.columns]
+        if missing:
+            raise KeyError(f"필요한 컬럼이 없습니다: {missing}")
+        column_positions = df.columns.get_indexer(columns)
+        
+        # write-only 워크북에 청크 단위로 기록 (결과 DataFrame 전체를 만들지 않음)
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet()
+        ws.append(['순서_검색량순'] + columns)
+        for start in range(0, len(order), WRITE_CHUNK_ROWS):
+            self._check_cancelled()
+            chunk = df.iloc[order[start:start + WRITE_CHUNK_ROWS], column_positions].astype(object)
+            values = chunk.where(chunk.notna(), None).to_numpy().tolist()
+            for rank, row in enumerate(values, start=start + 1):
+                ws.append([rank] + row)
+        
+        self._check_cancelled()
+        wb.save(save_path)
+        return save_path
+    
+    def cancel_jobs(self):
+        """진행 중인 작업과 대기 중인 작업을 모두 취소"""
+        while True:
+            try:
+                _, _, cancel_event = self.jobs.get_nowait()
+            except queue.Empty:
+                break
+            self.job_events.discard(cancel_event)
+            self.jobs.task_done()
+            self.pending_jobs -= 1
+        for cancel_event in list(self.job_events):
+            cancel_event.set()
+        self.status_label.config(text="작업 취소 중...")
+    
+    def _job_finished(self):
+        self.pending_jobs -= 1
+        if self.pending_jobs <= 0:
+            self.pending_jobs = 0
             self.progress.stop()
-            self.status_label.config(text="분석 실패")
-            messagebox.showerror("에러", f"데이터 처리 중 오류 발생: {str(e)}")
+            self.cancel_btn['state'] = 'disabled'
+    
+    def _job_done(self, save_path):
+        self._job_finished()
+        self.status_label.config(text="분석 완료")
+        messagebox.showinfo("완료", 
+            "오래 기다려주셔서 감사합니다.\n"
+            "완벽한 상품 리스트가 준비되었습니다.\n"
+            "브랜드 키워드가 포함되어 있을 수 있으니 참고하세요.")
+        
+        # 파일 열기
+        os.startfile(save_path)
+    
+    def _job_cancelled(self):
+        self._job_finished()
+        self.status_label.config(text="작업이 취소되었습니다")
+    
+    def _job_failed(self, error_msg):
+        self._job_finished()
+        self.status_label.config(text="분석 실패")
+        messagebox.showerror("에러", f"데이터 처리 중 오류 발생: {error_msg}")
     
     def analyze_competition(self):
-        conditions = [
-            (self.df['경쟁률'] < 4),
-            (self.df['검색량'] >= 15000),
-            (self.df['쇼핑성키워드'] == True)
-        ]
-        self.process_data(conditions, "경쟁도")
+        self.process_data(lambda df: [
+            (df['경쟁률'] < 4),
+            (df['검색량'] >= 15000),
+            (df['쇼핑성키워드'] == True)
+        ], "경쟁도")
     
     def analyze_attraction(self):
-        conditions = [
-            (self.df['매력도'] >= 3),
-            (self.df['검색량'] >= 15000),
-            (self.df['쇼핑성키워드'] == True)
-        ]
-        self.process_data(conditions, "매력도")
+        self.process_data(lambda df: [
+            (df['매력도'] >= 3),
+            (df['검색량'] >= 15000),
+            (df['쇼핑성키워드'] == True)
+        ], "매력도")
     
     def analyze_growth(self):
-        conditions = [
-            (self.df['성장성'] >= 0),
-            (self.df['검색량'] >= 8000),
-            (self.df['쇼핑성키워드'] == True),
-            (self.df['경쟁률'] < 4)
-        ]
-        self.process_data(conditions, "성장")
+        self.process_data(lambda df: [
+            (df['성장성'] >= 0),
+            (df['검색량'] >= 8000),
+            (df['쇼핑성키워드'] == True),
+            (df['경쟁률'] < 4)
+        ], "성장")
     
     def analyze_rapid_growth(self):
-        conditions = [
-            (self.df['성장성'] >= 0.15),
-            (self.df['검색량'] >= 10000),
-            (self.df['쇼핑성키워드'] == True)
-        ]
-        self.process_data(conditions, "급성장")
+        self.process_data(lambda df: [
+            (df['성장성'] >= 0.15),
+            (df['검색량'] >= 10000),
+            (df['쇼핑성키워드'] == True)
+        ], "급성장")
     
     def run(self):
         self.root.mainloop()
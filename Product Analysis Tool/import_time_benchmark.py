@@ -0,0 +1,98 @@
+"""
+Integrated Product Analyzer 시작 속도 측정 스크립트
+
+`python -X importtime`으로 분석기 모듈을 불러올 때의 import 시간을 측정하고,
+목표 시간(기본 300ms)을 넘거나 pandas/numpy 같은 무거운 패키지가 시작 시점에
+불러와지면 종료 코드 1을 반환합니다.
+
+사용법:
+    python import_time_benchmark.py [목표_ms] [반복_횟수]
+"""
+import os
+import re
+import subprocess
+import sys
+from statistics import median
+
+ANALYZER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             "Integrated Product Analyzer with Preprocessing_.py")
+
+# 창이 뜨기 전에 불러오면 안 되는 패키지 (첫 파일 로딩 시 지연 import)
+DEFERRED_PACKAGES = ["pandas", "numpy", "openpyxl", "pyarrow", "xlsxwriter"]
+
+DEFAULT_TARGET_MS = 300
+DEFAULT_RUNS = 5
+
+# 예: "import time:       521 |       1834 |   tkinter"
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+# 측정 대상 구간의 시작 표시 (인터프리터 시작과 로더 자체의 import는 제외)
+MARKER = "--- analyzer import start ---"
+
+# 분석기 모듈을 실행(__main__)하지 않고 import만 수행
+LOAD_CODE = (
+    "import importlib.util, sys\n"
+    f"sys.stderr.write('{MARKER}\\n'); sys.stderr.flush()\n"
+    "spec = importlib.util.spec_from_file_location('product_analyzer', sys.argv[1])\n"
+    "module = importlib.util.module_from_spec(spec)\n"
+    "spec.loader.exec_module(module)\n"
+)
+
+
+def measure_once(path):
+    """
+    분석기 모듈을 한 번 불러오고 (전체 import 시간 ms, {패키지: 누적 ms}) 반환.
+    MARKER 이후에 기록된 최상위 항목만 합산합니다.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", LOAD_CODE, path],
+        capture_output=True, text=True, encoding="utf-8", errors="replace"
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"모듈 로딩 실패:\n{result.stderr[-2000:]}")
+
+    top_level = {}
+    lines = result.stderr.splitlines()
+    for line in lines[lines.index(MARKER) + 1:]:
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        _, cumulative_us, indent, name = match.groups()
+        # 들여쓰기가 없는(1칸) 항목이 최상위 import
+        if len(indent) <= 1:
+            top_level[name] = top_level.get(name, 0) + int(cumulative_us) / 1000
+    return sum(top_level.values()), top_level
+
+
+def main():
+    target_ms = float(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_TARGET_MS
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_RUNS
+
+    totals = []
+    packages = {}
+    for _ in range(runs):
+        total_ms, top_level = measure_once(ANALYZER_PATH)
+        totals.append(total_ms)
+        packages = top_level
+
+    total_ms = median(totals)
+    print(f"분석기 모듈 import 시간 (중앙값, {runs}회): {total_ms:.1f}ms / 목표 {target_ms:.0f}ms")
+    print("가장 오래 걸린 최상위 import:")
+    for name, ms in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:10]:
+        print(f"  {ms:8.1f}ms  {name}")
+
+    failed = False
+    eager = [name for name in packages if name.split('.')[0] in DEFERRED_PACKAGES]
+    if eager:
+        print(f"실패: 시작 시점에 무거운 패키지를 불러옵니다: {', '.join(eager)}")
+        failed = True
+    if total_ms > target_ms:
+        print(f"실패: 목표 시간을 {total_ms - target_ms:.1f}ms 초과했습니다.")
+        failed = True
+    if not failed:
+        print("통과")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
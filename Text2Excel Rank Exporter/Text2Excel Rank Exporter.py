@@ -1,65 +1,206 @@
 import ast
+import json
+import re
+from functools import lru_cache
 import tkinter as tk
 from tkinter import filedialog
 import os
 from datetime import datetime
+from multiprocessing import Pool
 from openpyxl import Workbook
 
-# tkinter를 이용해 파일 선택창 띄우기
-root = tk.Tk()
-root.withdraw()  # tkinter 창 숨기기
-input_file = filedialog.askopenfilename(
-    title="파일 선택", 
-    filetypes=[("텍스트 파일", "*.txt"), ("모든 파일", "*.*")]
-)
-
-if not input_file:
-    print("파일이 선택되지 않았습니다.")
-    exit()
-
-# 원래 파일명에서 확장자 제거
-base_name = os.path.splitext(os.path.basename(input_file))[0]
-
-# 현재 날짜와 시간을 "yyyy-mm-dd_hhmm" 형식으로 가져와 결과 파일명 생성
-now_str = datetime.now().strftime("%Y-%m-%d_%H%M")
-output_file = f"{base_name}_{now_str}.xlsx"
-
-# 데이터를 저장할 리스트
-records = []
-
-# 파일 읽기 및 데이터 파싱
-with open(input_file, "r", encoding="utf-8") as file:
-    for line in file:
-        if line.startswith("Rank"):
-            rank_data = line.split(": ", 1)
-            if len(rank_data) == 2:
-                rank, data_str = rank_data
-                try:
-                    data_dict = ast.literal_eval(data_str.strip())  # 문자열을 딕셔너리로 변환
-                except Exception as e:
-                    print(f"데이터 변환 오류: {e}")
-                    continue
-                data_dict["Rank"] = rank
-                records.append(data_dict)
-
-# 데이터가 있는 경우 openpyxl을 사용해 엑셀 파일 생성 및 저장
-if records:
-    wb = Workbook()
-    ws = wb.active
-    
-    # 원하는 컬럼 순서 (해당 컬럼들이 딕셔너리에 존재해야 합니다)
-    columns = ["Rank", "대카테고리", "중카테고리", "소카테고리", "세부카테고리", 
-               "total", "recent_sum", "older_sum", "growth_rate", "final_score", "rank"]
-    
-    # 헤더 추가
-    ws.append(columns)
-    
-    # 각 record에 대해 row 추가
-    for record in records:
-        row = [record.get(col, "") for col in columns]
+# 원하는 컬럼 순서 (해당 컬럼들이 딕셔너리에 존재해야 합니다)
+COLUMNS = ["Rank", "대카테고리", "중카테고리", "소카테고리", "세부카테고리",
+           "total", "recent_sum", "older_sum", "growth_rate", "final_score", "rank"]
+
+# 이 크기(바이트) 이상의 텍스트 파일은 여러 프로세스로 나누어 파싱
+PARALLEL_MIN_BYTES = 16 * 1024 * 1024
+
+# 프로세스당 나누어 줄 조각 수 (조각 크기가 고르지 않아도 작업이 고르게 분배되도록)
+CHUNKS_PER_PROCESS = 4
+
+# 랭커가 쓰는 딕셔너리 repr 형식의 값: 따옴표/역슬래시 없는 문자열, 숫자, None/True/False
+_VALUE_PATTERN = r"'[^'\\]*'|-?\d+(?:\.\d*)?(?:[eE][-+]?\d+)?|-?inf|nan|None|True|False"
+_PAIR_PATTERN = rf"'([^'\\]*)': ({_VALUE_PATTERN})"
+_PAIR_RE = re.compile(_PAIR_PATTERN)
+_DICT_RE = re.compile(rf"\{{(?:{_PAIR_PATTERN}(?:, {_PAIR_PATTERN})*)?\}}")
+_CONSTANTS = {"None": None, "True": True, "False": False}
+
+# 랭커가 저장한 JSONL/Parquet 순위 파일을 딕셔너리 리스트로 읽기 (파싱 없이 바로 로드)
+def load_ranked_results(file_path):
+    """
+    CoupangCategoryGrowthRanker / CoupangCategoryRecommender2 의 write_ranked_results 로 저장한
+    .jsonl 또는 .parquet 파일을 딕셔너리 리스트로 읽어옵니다. Parquet 은 pyarrow 가 필요합니다.
+    """
+    if file_path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+        return pq.read_table(file_path).to_pylist()
+    with open(file_path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+# 정규식으로 잘라낸 값 토큰을 파이썬 값으로 변환
+def _convert_value(value):
+    """_VALUE_PATTERN 에 맞는 토큰 하나를 문자열, None/True/False, int, float 중 하나로 변환합니다."""
+    if value[0] == "'":
+        return value[1:-1]
+    if value in _CONSTANTS:
+        return _CONSTANTS[value]
+    if value.lstrip("-").isdigit():
+        return int(value)
+    return float(value)
+
+# 키 순서가 정해진 딕셔너리 repr 전체를 한 번에 매칭하는 정규식
+@lru_cache(maxsize=16)
+def _shape_regex(keys):
+    """키 순서가 keys 인 딕셔너리 repr 전체와 일치하고, 값마다 그룹 하나를 갖는 정규식을 반환합니다."""
+    pairs = ", ".join(f"'{re.escape(key)}': ({_VALUE_PATTERN})" for key in keys)
+    return re.compile(rf"\{{{pairs}\}}")
+
+# 직전에 파싱한 줄의 키 순서 (같은 파일의 줄들은 보통 같은 형태)
+_last_keys = None
+
+# 알려진 딕셔너리 repr 형식을 정규식 토크나이저로 빠르게 파싱
+def _parse_dict_fast(data_str):
+    """
+    랭커가 쓰는 단순한 딕셔너리 repr('키': 값, …)을 정규식으로 파싱합니다.
+    직전 줄과 키 순서가 같으면 그 형태 전용 정규식 한 번으로 모든 값을 꺼내고,
+    아니면 일반 토크나이저로 파싱한 뒤 새 키 순서를 기억합니다.
+    문자열 안에 따옴표나 이스케이프가 있는 등 형식이 다르면 None 을 반환하며,
+    이 경우 ast.literal_eval 로 처리합니다. (literal_eval 이 읽지 못하는 nan/inf 도 처리합니다.)
+    """
+    global _last_keys
+    if _last_keys is not None:
+        match = _shape_regex(_last_keys).fullmatch(data_str)
+        if match:
+            return dict(zip(_last_keys, map(_convert_value, match.groups())))
+    if not _DICT_RE.fullmatch(data_str):
+        return None
+    pairs = _PAIR_RE.findall(data_str)
+    _last_keys = tuple(key for key, _ in pairs)
+    return {key: _convert_value(value) for key, value in pairs}
+
+# 'Rank N: {...}' 한 줄을 딕셔너리로 변환
+def parse_rank_line(line):
+    """
+    예전 텍스트 순위 파일의 한 줄을 딕셔너리로 변환하고 "Rank" 키에 'Rank N' 을 저장합니다.
+    순위 줄이 아니거나 변환할 수 없으면 None 을 반환합니다.
+    """
+    if not line.startswith("Rank"):
+        return None
+    rank_data = line.split(": ", 1)
+    if len(rank_data) != 2:
+        return None
+    rank, data_str = rank_data
+    data_str = data_str.strip()
+    data_dict = _parse_dict_fast(data_str)
+    if data_dict is None:
+        try:
+            data_dict = ast.literal_eval(data_str)  # 문자열을 딕셔너리로 변환
+        except Exception as e:
+            print(f"데이터 변환 오류: {e}")
+            return None
+    data_dict["Rank"] = rank
+    return data_dict
+
+# 딕셔너리를 엑셀 행(COLUMNS 순서)으로 변환
+def record_to_row(record):
+    """레코드 딕셔너리에서 COLUMNS 순서대로 값을 꺼내 행 리스트로 반환합니다 (없는 컬럼은 빈 문자열)."""
+    return [record.get(col, "") for col in COLUMNS]
+
+# 텍스트 파일의 바이트 범위 [start, end) 를 파싱 (프로세스 작업 단위)
+def parse_text_chunk(args):
+    """
+    input_file 의 바이트 범위 [start, end) 에 있는 줄들을 파싱해 엑셀 행 리스트로 반환합니다.
+    범위는 줄 경계에 맞춰져 있어야 합니다(split_text_file). 프로세스 간에는 딕셔너리 대신
+    작은 행 리스트만 주고받습니다.
+    """
+    input_file, start, end = args
+    with open(input_file, "rb") as file:
+        file.seek(start)
+        text = file.read(end - start).decode("utf-8")
+    rows = []
+    for line in text.splitlines():
+        record = parse_rank_line(line)
+        if record is not None:
+            rows.append(record_to_row(record))
+    return rows
+
+# 텍스트 파일을 줄 경계에 맞춘 바이트 범위들로 나누기
+def split_text_file(input_file, chunk_count):
+    """파일을 대략 같은 크기의 chunk_count 개 바이트 범위로 나누되, 각 경계를 다음 줄 시작으로 맞춥니다."""
+    size = os.path.getsize(input_file)
+    boundaries = [0]
+    with open(input_file, "rb") as file:
+        for i in range(1, chunk_count):
+            file.seek(max(size * i // chunk_count, boundaries[-1]))
+            file.readline()
+            boundaries.append(min(file.tell(), size))
+    boundaries.append(size)
+    return [(input_file, start, end) for start, end in zip(boundaries, boundaries[1:]) if end > start]
+
+# 텍스트 순위 파일 전체를 엑셀 행 리스트로 변환 (큰 파일은 여러 프로세스로)
+def parse_text_file(input_file):
+    """
+    예전 텍스트 순위 파일을 파싱해 엑셀 행 리스트로 반환합니다.
+    PARALLEL_MIN_BYTES 이상이면 줄 경계에 맞춘 조각으로 나누어 CPU 수만큼의 프로세스로 파싱하며,
+    결과 행 순서는 파일 순서와 같습니다.
+    """
+    process_count = os.cpu_count() or 1
+    if os.path.getsize(input_file) < PARALLEL_MIN_BYTES or process_count == 1:
+        return parse_text_chunk((input_file, 0, os.path.getsize(input_file)))
+
+    chunks = split_text_file(input_file, process_count * CHUNKS_PER_PROCESS)
+    rows = []
+    with Pool(process_count) as pool:
+        for chunk_rows in pool.imap(parse_text_chunk, chunks):
+            rows.extend(chunk_rows)
+    return rows
+
+# 엑셀 행들을 write_only 워크북으로 저장
+def save_rows_to_excel(rows, output_file):
+    """헤더(COLUMNS)와 행들을 스트리밍(write_only) 워크북으로 저장합니다."""
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append(COLUMNS)
+    for row in rows:
         ws.append(row)
-        
     wb.save(output_file)
-    print(f"엑셀 파일 저장 완료: {output_file}")
-else:
-    print("데이터를 찾을 수 없습니다.")
+
+def main():
+    # tkinter를 이용해 파일 선택창 띄우기
+    root = tk.Tk()
+    root.withdraw()  # tkinter 창 숨기기
+    input_file = filedialog.askopenfilename(
+        title="파일 선택",
+        filetypes=[("순위 파일", "*.jsonl *.parquet *.txt"), ("텍스트 파일", "*.txt"), ("모든 파일", "*.*")]
+    )
+
+    if not input_file:
+        print("파일이 선택되지 않았습니다.")
+        return
+
+    # 원래 파일명에서 확장자 제거
+    base_name = os.path.splitext(os.path.basename(input_file))[0]
+
+    # 현재 날짜와 시간을 "yyyy-mm-dd_hhmm" 형식으로 가져와 결과 파일명 생성
+    now_str = datetime.now().strftime("%Y-%m-%d_%H%M")
+    output_file = f"{base_name}_{now_str}.xlsx"
+
+    # JSONL/Parquet 순위 파일은 바로 불러오고, 예전 텍스트 순위 파일은 파싱
+    if input_file.endswith((".jsonl", ".parquet")):
+        rows = []
+        for data_dict in load_ranked_results(input_file):
+            data_dict["Rank"] = f"Rank {data_dict.get('rank', '')}"
+            rows.append(record_to_row(data_dict))
+    else:
+        rows = parse_text_file(input_file)
+
+    # 데이터가 있는 경우 openpyxl을 사용해 엑셀 파일 생성 및 저장
+    if rows:
+        save_rows_to_excel(rows, output_file)
+        print(f"엑셀 파일 저장 완료: {output_file}")
+    else:
+        print("데이터를 찾을 수 없습니다.")
+
+if __name__ == "__main__":
+    main()
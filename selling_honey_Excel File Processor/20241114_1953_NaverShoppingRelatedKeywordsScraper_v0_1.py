@@ -2,15 +2,251 @@ import pandas as pd
 import requests
 import random
 import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
 from typing import List, Dict
 import json
-from datetime import datetime
+import re
+import sqlite3
+import unicodedata
+from datetime import datetime, timedelta
 import tkinter as tk
 from tkinter import filedialog
 import os
 
+try:
+    import aiohttp
+except ImportError:  # aiohttp 가 없으면 requests 를 스레드 풀에서 실행
+    aiohttp = None
+
+# 연관 검색어 API 주소 (키워드를 뒤에 붙임, 테스트 시 로컬 스텁 서버 주소로 교체 가능)
+BASE_URL = "https://search.shopping.naver.com/api/search/related/"
+
+# 동시에 진행할 최대 요청 수
+CONCURRENCY = 4
+
+# 호스트별 초당 요청 수와 몰아서 보낼 수 있는 최대 요청 수 (토큰 버킷)
+REQUESTS_PER_SECOND = 0.5
+BURST = 1
+
+# 연결/응답 대기 제한 시간 (초)
+CONNECT_TIMEOUT = 5
+READ_TIMEOUT = 15
+
+# 재시도 대기: min(BACKOFF_MAX, BACKOFF_BASE * 2^시도) 안에서 무작위 (full jitter)
+BACKOFF_BASE = 2.0
+BACKOFF_MAX = 60.0
+
+# 재시도할 HTTP 상태 코드 (연결 오류/시간 초과도 재시도), 이 중 Retry-After 를 따르는 코드
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+RETRY_AFTER_STATUSES = {429, 503}
+
+# Retry-After 로 기다리는 최대 시간 (초)
+RETRY_AFTER_MAX = 300.0
+
+# 연관 검색어 캐시 파일과 유효 기간 (초), 경로가 None 이면 캐시를 쓰지 않음
+CACHE_PATH = "naver_related_cache.sqlite3"
+CACHE_TTL = 7 * 24 * 3600
+
+# 체크포인트 저널 파일 이름 끝부분 (입력 CSV 옆에 생성)과 fsync 간격 (기록 수)
+JOURNAL_SUFFIX = "_related_journal.jsonl"
+JOURNAL_FSYNC_EVERY = 20
+
+class TokenBucket:
+    """초당 rate 개씩 토큰이 차고 최대 burst 개까지 쌓이는 비동기 토큰 버킷"""
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def pause(self, seconds: float):
+        """서버가 Retry-After 로 요청한 시간 동안 이 호스트의 모든 요청을 멈춤"""
+        self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+    async def acquire(self):
+        """토큰 하나를 얻을 때까지 대기 (대기 순서대로 처리)"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._blocked_until:
+                    await asyncio.sleep(self._blocked_until - now)
+                    continue
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+def parse_retry_after(value: str) -> float:
+    """Retry-After 헤더(초 또는 HTTP 날짜)를 기다릴 초로 변환 (읽을 수 없으면 0)"""
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now().astimezone()).total_seconds())
+    except (TypeError, ValueError):
+        return 0.0
+
+def parse_related(data: Dict) -> List[str]:
+    """연관 검색어 API 응답에서 키워드 목록 추출"""
+    return [item["key"] for item in data.get("related", [])]
+
+def normalize_keyword(keyword) -> str:
+    """캐시 키로 쓰는 키워드 정규형: 유니코드 NFKC, 앞뒤 공백 제거, 연속 공백은 하나로, 대소문자 무시"""
+    text = unicodedata.normalize("NFKC", "" if keyword is None else str(keyword))
+    return re.sub(r"\s+", " ", text).strip().casefold()
+
+class KeywordCache:
+    """정규화한 키워드별 연관 검색어와 수집 시각을 저장하는 SQLite 캐시"""
+    def __init__(self, path: str, ttl: float = CACHE_TTL):
+        self.path = path
+        self.ttl = ttl
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS related_keywords ("
+            "keyword TEXT PRIMARY KEY, related TEXT NOT NULL, fetched_at REAL NOT NULL)")
+        self.conn.commit()
+
+    def get(self, keyword: str):
+        """유효 기간 안의 캐시된 연관 검색어 (없거나 만료되면 None)"""
+        row = self.conn.execute(
+            "SELECT related FROM related_keywords WHERE keyword = ? AND fetched_at >= ?",
+            (normalize_keyword(keyword), time.time() - self.ttl)).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def put(self, keyword: str, related_keywords: List[str]):
+        """수집한 연관 검색어를 현재 시각과 함께 저장 (바로 커밋하므로 중단되어도 남음)"""
+        self.conn.execute(
+            "INSERT OR REPLACE INTO related_keywords (keyword, related, fetched_at) VALUES (?, ?, ?)",
+            (normalize_keyword(keyword), json.dumps(related_keywords, ensure_ascii=False), time.time()))
+        self.conn.commit()
+
+    def purge_expired(self) -> int:
+        """만료된 항목 삭제 후 삭제한 개수 반환"""
+        deleted = self.conn.execute(
+            "DELETE FROM related_keywords WHERE fetched_at < ?", (time.time() - self.ttl,)).rowcount
+        self.conn.commit()
+        return deleted
+
+    def close(self):
+        self.conn.close()
+
+class CheckpointJournal:
+    """키워드 하나당 한 줄씩 덧붙이는 JSONL 체크포인트 (fsync 는 fsync_every 개마다)"""
+    def __init__(self, path: str, fsync_every: int = JOURNAL_FSYNC_EVERY):
+        self.path = path
+        self.fsync_every = fsync_every
+        self._pending = 0
+        _truncate_partial_line(path)
+        self.file = open(path, "a", encoding="utf-8")
+
+    def append(self, position: int, keyword: str, related_keywords: List[str]):
+        """행 위치, 키워드, 연관 검색어 한 건 기록"""
+        record = {"row": position, "keyword": keyword, "related": related_keywords,
+                  "time": datetime.now().isoformat(timespec="seconds")}
+        self.file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._pending += 1
+        if self._pending >= self.fsync_every:
+            self.sync()
+
+    def sync(self):
+        """버퍼를 디스크까지 내려씀"""
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self._pending = 0
+
+    def close(self):
+        self.sync()
+        self.file.close()
+
+def _truncate_partial_line(path: str):
+    """중단으로 끝이 잘린 마지막 줄을 잘라내 이어 쓸 수 있게 함"""
+    if not os.path.exists(path):
+        return
+    with open(path, "rb+") as f:
+        data = f.read()
+        if data and not data.endswith(b"\n"):
+            f.truncate(data.rfind(b"\n") + 1)
+
+def journal_path_for(file_path: str) -> str:
+    """입력 CSV 에 대응하는 저널 파일 경로"""
+    return os.path.splitext(file_path)[0] + JOURNAL_SUFFIX
+
+def replay_journal(path: str, ttl: float = None) -> Dict[int, Dict]:
+    """저널을 읽어 행 위치별 마지막 기록 반환 (없거나 깨진 줄, ttl 초보다 오래된 기록은 무시)"""
+    records = {}
+    if not os.path.exists(path):
+        return records
+    oldest = datetime.now() - timedelta(seconds=ttl) if ttl is not None else None
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+                if oldest is not None and datetime.fromisoformat(record["time"]) < oldest:
+                    continue
+            except (ValueError, KeyError, TypeError):
+                continue
+            records[record["row"]] = record
+    return records
+
+def retire_journal(path: str) -> str:
+    """최종 결과를 저장한 뒤 저널을 완료 표시 이름으로 바꿔 다음 실행에서 재생되지 않게 함, 바뀐 경로 반환"""
+    if not os.path.exists(path):
+        return None
+    base = f"{os.path.splitext(path)[0]}_completed_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    completed_path, suffix = f"{base}.jsonl", 1
+    while os.path.exists(completed_path):  # 같은 초에 끝난 이전 실행의 저널을 덮어쓰지 않도록
+        suffix += 1
+        completed_path = f"{base}_{suffix}.jsonl"
+    os.replace(path, completed_path)
+    return completed_path
+
+def apply_journal(df: pd.DataFrame, records: Dict[int, Dict]) -> set:
+    """저널 기록 중 같은 행·같은 키워드인 것을 df 의 H열에 채우고, 채운 행 위치 집합 반환"""
+    keywords = df['키워드'].tolist()
+    indexes = df.index.tolist()
+    restored = set()
+    for position, record in records.items():
+        if 0 <= position < len(df) and record["keyword"] == keywords[position]:
+            df.at[indexes[position], 'H'] = json.dumps(record["related"], ensure_ascii=False)
+            restored.add(position)
+    return restored
+
+def materialize_results(file_path: str, output_filename: str, journal_path: str = None) -> int:
+    """입력 CSV 에 저널 결과를 채워 output_filename 으로 저장 (실행 중이거나 중단된 작업도 가능), 채운 행 수 반환"""
+    df = pd.read_csv(file_path)
+    restored = apply_journal(df, replay_journal(journal_path or journal_path_for(file_path)))
+    df.to_csv(output_filename, index=False, encoding='utf-8-sig')
+    return len(restored)
+
 class NaverShoppingScraper:
-    def __init__(self):
+    def __init__(self, base_url: str = BASE_URL, concurrency: int = CONCURRENCY,
+                 rate: float = REQUESTS_PER_SECOND, burst: int = BURST,
+                 cache_path: str = CACHE_PATH, cache_ttl: float = CACHE_TTL):
+        self.base_url = base_url
+        self.concurrency = concurrency
+        self.rate = rate
+        self.burst = burst
+        self._buckets = {}
+        self.metrics = []  # 요청 시도마다 시각, 키워드, 시도 번호, 상태 코드, 지연(ms), 오류
+        self.cache_ttl = cache_ttl
+        self.cache = KeywordCache(cache_path, cache_ttl) if cache_path else None
+        self.cache_hits = 0
+
+        # keep-alive 연결을 재사용하는 세션 (재시도는 직접 처리하므로 어댑터 재시도는 끔)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=concurrency, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
         self.user_agents = [
             "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36",
             "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36",
@@ -31,38 +267,239 @@ class NaverShoppingScraper:
         headers["user-agent"] = random.choice(self.user_agents)
         return headers
     
-    def _natural_delay(self):
-        """자연스러운 딜레이 생성 (5-15초)"""
-        base_delay = random.uniform(5, 15)
-        # 20% 확률로 추가 딜레이 (15-30초)
-        if random.random() < 0.2:
-            base_delay += random.uniform(10, 15)
-        time.sleep(base_delay)
-    
+    def _retry_delay(self, attempt: int, max_retries: int, status, retry_after) -> float:
+        """다음 재시도까지 기다릴 초 (재시도하지 않으면 None)"""
+        if attempt >= max_retries - 1 or (status is not None and status not in RETRY_STATUSES):
+            return None
+        delay = random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+        if status in RETRY_AFTER_STATUSES and retry_after:
+            delay = max(delay, min(RETRY_AFTER_MAX, parse_retry_after(retry_after)))
+        return delay
+
+    def _record(self, keyword: str, attempt: int, status, latency: float, error):
+        """요청 시도 한 번의 결과를 metrics 에 기록"""
+        self.metrics.append({
+            "time": datetime.now().isoformat(timespec="seconds"),
+            "keyword": keyword,
+            "attempt": attempt + 1,
+            "status": status,
+            "latency_ms": round(latency * 1000, 1),
+            "error": "" if error is None else str(error),
+        })
+
+    def _request_once(self, url: str, headers: Dict):
+        """세션으로 한 번 요청해 (상태 코드, Retry-After, 연관 검색어 또는 None) 반환"""
+        response = self.session.get(url, headers=headers, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT))
+        if response.status_code != 200:
+            return response.status_code, response.headers.get("Retry-After"), None
+        return response.status_code, None, parse_related(response.json())
+
+    def _cached(self, keyword: str):
+        """캐시에 유효한 결과가 있으면 반환 (없으면 None)"""
+        if self.cache is None:
+            return None
+        related_keywords = self.cache.get(keyword)
+        if related_keywords is not None:
+            self.cache_hits += 1
+        return related_keywords
+
+    def _store(self, keyword: str, related_keywords: List[str]):
+        """성공한 결과만 캐시에 저장 (실패한 키워드는 다음 실행에서 다시 수집)"""
+        if self.cache is not None:
+            self.cache.put(keyword, related_keywords)
+
     def get_related_keywords(self, keyword: str, max_retries: int = 3) -> List[str]:
-        """특정 키워드의 연관 검색어 수집"""
-        url = f"https://search.shopping.naver.com/api/search/related/{keyword}"
+        """특정 키워드의 연관 검색어 수집 (캐시에 있으면 바로 반환)"""
+        cached = self._cached(keyword)
+        if cached is not None:
+            return cached
+        url = f"{self.base_url}{keyword}"
         
         for attempt in range(max_retries):
+            headers = self._get_random_headers()
+            print(f"\n연결 시도 중... ({attempt + 1}/{max_retries})")
+            started = time.monotonic()
             try:
-                headers = self._get_random_headers()
-                print(f"\n연결 시도 중... ({attempt + 1}/{max_retries})")
-                response = requests.get(url, headers=headers)
-                response.raise_for_status()
-                
-                data = response.json()
-                related_keywords = [item["key"] for item in data.get("related", [])]
+                status, retry_after, related_keywords = self._request_once(url, headers)
+                error = None if related_keywords is not None else f"HTTP {status}"
+            except (requests.exceptions.RequestException, ValueError, KeyError, TypeError) as e:
+                status, retry_after, related_keywords, error = None, None, None, e
+            self._record(keyword, attempt, status, time.monotonic() - started, error)
+            if related_keywords is not None:
+                self._store(keyword, related_keywords)
                 return related_keywords
-                
-            except requests.exceptions.RequestException as e:
-                print(f"\n오류 발생: {str(e)}")
-                if attempt < max_retries - 1:
-                    print("재시도 중...")
-                    self._natural_delay()
-                    continue
-                print(f"\n'{keyword}' 키워드 처리 실패")
-                return []
+
+            print(f"\n오류 발생: {str(error)}")
+            delay = self._retry_delay(attempt, max_retries, status, retry_after)
+            if delay is None:
+                break
+            print(f"{delay:.1f}초 후 재시도 중...")
+            time.sleep(delay)
+        print(f"\n'{keyword}' 키워드 처리 실패")
+        return []
     
+    def _bucket(self, url: str):
+        """url 호스트의 토큰 버킷 (rate 가 없으면 None, 제한 없음)"""
+        if not self.rate:
+            return None
+        host = urlparse(url).netloc
+        if host not in self._buckets:
+            self._buckets[host] = TokenBucket(self.rate, self.burst)
+        return self._buckets[host]
+
+    async def _request_once_async(self, session, url: str, headers: Dict):
+        """aiohttp 세션(없으면 스레드 풀의 requests 세션)으로 한 번 요청 (_request_once 와 같은 반환값)"""
+        if aiohttp is None:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(session, self._request_once, url, headers)
+        async with session.get(url, headers=headers) as response:
+            if response.status != 200:
+                return response.status, response.headers.get("Retry-After"), None
+            return response.status, None, parse_related(await response.json(content_type=None))
+
+    async def fetch_related_keywords_async(self, session, keyword: str, max_retries: int = 3) -> List[str]:
+        """특정 키워드의 연관 검색어 비동기 수집 (실패하면 빈 리스트)"""
+        related_keywords = await self._fetch_related_async(session, keyword, max_retries)
+        return [] if related_keywords is None else related_keywords
+
+    async def _fetch_related_async(self, session, keyword: str, max_retries: int = 3):
+        """캐시에 있으면 바로 반환하고, 없으면 토큰 버킷을 거쳐 재시도하며 수집 (끝내 실패하면 None)"""
+        cached = self._cached(keyword)
+        if cached is not None:
+            return cached
+        url = f"{self.base_url}{keyword}"
+        bucket = self._bucket(url)
+
+        for attempt in range(max_retries):
+            if bucket is not None:
+                await bucket.acquire()
+            started = time.monotonic()
+            try:
+                status, retry_after, related_keywords = await self._request_once_async(
+                    session, url, self._get_random_headers())
+                error = None if related_keywords is not None else f"HTTP {status}"
+            except Exception as e:
+                status, retry_after, related_keywords, error = None, None, None, e
+            self._record(keyword, attempt, status, time.monotonic() - started, error)
+            if related_keywords is not None:
+                self._store(keyword, related_keywords)
+                return related_keywords
+
+            print(f"\n'{keyword}' 오류 발생 ({attempt + 1}/{max_retries}): {str(error)}")
+            delay = self._retry_delay(attempt, max_retries, status, retry_after)
+            if delay is None:
+                break
+            if bucket is not None and status in RETRY_AFTER_STATUSES and retry_after:
+                bucket.pause(delay)  # 서버가 속도를 낮추라고 하면 같은 호스트의 다른 요청도 함께 대기
+            await asyncio.sleep(delay)
+        print(f"\n'{keyword}' 키워드 처리 실패")
+        return None
+
+    async def _collect_async(self, items, on_result):
+        """(위치, 키워드)들을 최대 concurrency 개씩 동시에 수집하고, 끝나는 순서대로 on_result(위치, 결과) 호출
+        (실패한 키워드의 결과는 None)"""
+        self._buckets = {}  # asyncio.Lock 은 이벤트 루프에 묶이므로 실행마다 새로 생성
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def fetch(position, keyword):
+            async with semaphore:
+                return position, await self._fetch_related_async(session, keyword)
+
+        if aiohttp is not None:
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.concurrency),
+                timeout=aiohttp.ClientTimeout(sock_connect=CONNECT_TIMEOUT, sock_read=READ_TIMEOUT))
+        else:
+            session = ThreadPoolExecutor(max_workers=self.concurrency)
+        try:
+            tasks = [asyncio.ensure_future(fetch(position, keyword)) for position, keyword in items]
+            for future in asyncio.as_completed(tasks):
+                position, related_keywords = await future
+                on_result(position, related_keywords)
+        finally:
+            if aiohttp is not None:
+                await session.close()
+            else:
+                session.shutdown(wait=False)
+
+    def get_related_keywords_many(self, keywords: List[str]) -> List[List[str]]:
+        """여러 키워드의 연관 검색어를 동시에 수집해 입력 순서대로 반환"""
+        results = [[] for _ in keywords]
+
+        def on_result(position, related_keywords):
+            if related_keywords is not None:
+                results[position] = related_keywords
+
+        asyncio.run(self._collect_async(list(enumerate(keywords)), on_result))
+        return results
+
+    def fill_related_keywords(self, df: pd.DataFrame, journal_path: str = None):
+        """
+        df 의 '키워드' 열을 동시에 수집해 H열에 JSON 으로 채우기.
+        journal_path 가 있으면 먼저 저널을 재생해 끝난 행은 건너뛰고(cache_ttl 보다 오래된 기록은 다시 수집),
+        새 결과를 저널에 한 줄씩 덧붙임
+        (실패한 키워드는 저널에 남기지 않으므로 다음 실행에서 다시 수집)
+        """
+        total_keywords = len(df)
+        keywords = df['키워드'].tolist()
+        indexes = df.index.tolist()
+        start_time = datetime.now()
+
+        restored = apply_journal(df, replay_journal(journal_path, self.cache_ttl)) if journal_path else set()
+        if restored:
+            print(f"\n저널에서 {len(restored)}개 키워드의 결과를 복원했습니다. ({journal_path})")
+        done = len(restored)
+        journal = CheckpointJournal(journal_path) if journal_path else None
+
+        def on_result(position, related_keywords):
+            nonlocal done
+            done += 1
+            elapsed_time = datetime.now() - start_time
+
+            # H열에 결과 저장 (실패는 빈 리스트)
+            df.at[indexes[position], 'H'] = json.dumps(related_keywords or [], ensure_ascii=False)
+            if journal is not None and related_keywords is not None:
+                journal.append(position, keywords[position], related_keywords)
+
+            # 진행상황 출력
+            progress = f"""
+{'='*50}
+현재 진행상황:
+- 완료된 키워드: {keywords[position]}
+- 진행률: {done}/{total_keywords} ({(done/total_keywords*100):.1f}%)
+- 경과 시간: {str(elapsed_time).split('.')[0]}
+- 남은 키워드 수: {total_keywords - done}
+{'='*50}
+"""
+            print(progress)
+
+        items = [(position, keyword) for position, keyword in enumerate(keywords) if position not in restored]
+        try:
+            asyncio.run(self._collect_async(items, on_result))
+        finally:
+            if journal is not None:
+                journal.close()
+
+    def metrics_summary(self) -> Dict:
+        """기록된 요청 시도의 상태 코드별 횟수와 지연 시간(ms) 분위수"""
+        if not self.metrics:
+            return {}
+        metrics = pd.DataFrame(self.metrics)
+        latency = metrics["latency_ms"]
+        return {
+            "attempts": len(metrics),
+            "status_counts": metrics["status"].map(lambda status: "error" if pd.isna(status) else str(int(status)))
+                                              .value_counts().to_dict(),
+            "latency_p50": float(latency.quantile(0.5)),
+            "latency_p95": float(latency.quantile(0.95)),
+            "latency_max": float(latency.max()),
+        }
+
+    def save_metrics(self, path: str):
+        """요청 시도별 기록을 CSV 로 저장 (요청 속도 조정용)"""
+        pd.DataFrame(self.metrics, columns=["time", "keyword", "attempt", "status", "latency_ms", "error"]).to_csv(
+            path, index=False, encoding='utf-8-sig')
+
     def process_file(self):
         """파일 선택 및 처리"""
         # GUI 초기화
@@ -84,47 +521,29 @@ class NaverShoppingScraper:
             df = pd.read_csv(file_path)
             total_keywords = len(df)
             
-            print(f"\n총 {total_keywords}개의 키워드를 처리합니다.")
-            
-            # 작업 시작 시간 기록
-            start_time = datetime.now()
+            print(f"\n총 {total_keywords}개의 키워드를 동시 {self.concurrency}개, 초당 {self.rate}회로 처리합니다.")
             
-            for idx, row in df.iterrows():
-                keyword = row['키워드']
-                current_time = datetime.now()
-                elapsed_time = current_time - start_time
-                
-                # 진행상황 출력
-                progress = f"""
-{'='*50}
-현재 진행상황:
-- 처리 중인 키워드: {keyword}
-- 진행률: {idx + 1}/{total_keywords} ({((idx + 1)/total_keywords*100):.1f}%)
-- 경과 시간: {str(elapsed_time).split('.')[0]}
-- 남은 키워드 수: {total_keywords - (idx + 1)}
-{'='*50}
-"""
-                print(progress)
-                
-                # 연관 키워드 수집
-                related_keywords = self.get_related_keywords(keyword)
-                
-                # H열에 결과 저장
-                df.at[idx, 'H'] = json.dumps(related_keywords, ensure_ascii=False)
-                
-                # 중간 저장 (10개 키워드마다)
-                if (idx + 1) % 10 == 0:
-                    temp_filename = f"temp_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-                    df.to_csv(temp_filename, index=False, encoding='utf-8-sig')
-                    print(f"\n중간 결과가 {temp_filename}에 저장되었습니다.")
-                
-                self._natural_delay()
+            # 연관 키워드 수집 (H열), 키워드마다 저널에 기록하고 재실행 시 이어서 진행
+            journal_path = journal_path_for(file_path)
+            self.fill_related_keywords(df, journal_path)
             
-            # 최종 결과 저장
+            # 최종 결과 저장 (한 번만, 중간 결과는 materialize_results 로 저널에서 언제든 생성 가능)
             output_filename = f"final_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
             df.to_csv(output_filename, index=False, encoding='utf-8-sig')
             print(f"\n최종 결과가 {output_filename}에 저장되었습니다.")
             
+            # 다 끝난 저널은 완료 표시 이름으로 바꿔 다음 실행에서 오래된 결과를 재생하지 않음
+            completed_journal = retire_journal(journal_path)
+            if completed_journal:
+                print(f"저널을 {completed_journal}(으)로 보관했습니다.")
+            
+            # 요청 시도별 지연/상태 기록 저장
+            metrics_filename = f"request_metrics_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+            self.save_metrics(metrics_filename)
+            print(f"요청 기록이 {metrics_filename}에 저장되었습니다: {self.metrics_summary()}")
+            if self.cache is not None:
+                print(f"캐시에서 바로 가져온 키워드: {self.cache_hits}개 ({self.cache.path})")
+            
         except Exception as e:
             print(f"\n오류 발생: {str(e)}")
             print("작업이 중단되었습니다.")
@@ -0,0 +1,61 @@
+import importlib.util
+import os
+
+import numpy as np
+import openpyxl
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULE_PATH = os.path.join(ROOT, "CoupangGrowthRanker_Text2Excel_Integrated",
+                           "CoupangGrowthRanker_Text2Excel_Integrated.py")
+
+
+@pytest.fixture(scope="module")
+def ranker():
+    spec = importlib.util.spec_from_file_location("growth_ranker_integrated", MODULE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def write_export(path, dates, rows):
+    """대/중카테고리가 숫자 ID 인 쿠팡 내보내기 형태의 엑셀 파일 (날짜는 최신 → 과거)"""
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(["대카테고리", "중카테고리"] + dates)
+    for row in rows:
+        ws.append(row)
+    wb.save(path)
+    return str(path)
+
+
+def test_update_matches_saved_integer_category_ids(ranker, tmp_path):
+    first = write_export(tmp_path / "first.xlsx", ["2024-01-03", "2024-01-02", "2024-01-01"],
+                         [[1001, 2001, 3, 2, 1], [1001, 2002, 5, 0, 4], [1002, None, 1, 1, 1]])
+    state_path = str(tmp_path / "first_state.npz")
+    ranker.save_state(ranker.load_export_state(first), state_path)
+
+    # 다음 내보내기에는 새 날짜만 있으므로, 저장된 상태와 맞춰져야 과거 합계가 유지됨
+    second = write_export(tmp_path / "second.xlsx", ["2024-01-04"],
+                          [[1002, None, 7], [1001, 2001, 10], [1001, 2002, 0]])
+    state = ranker.load_export_state(second, state_path)
+
+    assert state['keys'] == [(1002, None, None, None), (1001, 2001, None, None), (1001, 2002, None, None)]
+    assert state['dates'] == ["2024-01-04", "2024-01-03", "2024-01-02", "2024-01-01"]
+    assert state['day_count'] == 4
+    np.testing.assert_array_equal(state['total'], [10, 16, 9])
+    np.testing.assert_array_equal(state['tail'][:, :4], [[7, 1, 1, 1], [10, 3, 2, 1], [0, 5, 0, 4]])
+
+
+@pytest.mark.parametrize("argv, saved", [([], False), (["--save-state"], True)])
+def test_state_file_is_saved_only_when_asked(ranker, tmp_path, monkeypatch, argv, saved):
+    export = write_export(tmp_path / "export.xlsx", ["2024-01-02", "2024-01-01"],
+                          [[1001, 2001, 3, 2], [1002, 2002, 1, 1]])
+    output_file = str(tmp_path / "export_growthRanked.xlsx")
+    monkeypatch.setattr(ranker, "select_excel_files", lambda: [export])
+    monkeypatch.setattr(ranker, "save_results_to_excel", lambda *args: output_file)
+    monkeypatch.setattr(ranker.time, "sleep", lambda seconds: None)
+
+    ranker.main(argv)
+
+    assert os.path.exists(str(tmp_path / "export_growthRanked_state.npz")) == saved
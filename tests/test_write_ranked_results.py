@@ -0,0 +1,66 @@
+import importlib.util
+import os
+
+import openpyxl
+import pytest
+
+pytest.importorskip("pyarrow")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULES = {
+    "growth_ranker": os.path.join(ROOT, "CoupangCategoryGrowthRanker", "CoupangCategoryGrowthRanker.py"),
+    "recommender2": os.path.join(ROOT, "CoupangCategoryRecommender", "CoupangCategoryRecommender2.py"),
+}
+# 모듈별로 행을 점수화하는 함수 (추천기는 상위 카테고리만 스트리밍으로 계산)
+SCORERS = {"growth_ranker": "process_rows", "recommender2": "stream_top_categories"}
+
+
+def load_module(name):
+    spec = importlib.util.spec_from_file_location(name, MODULES[name])
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(params=sorted(MODULES))
+def module(request):
+    return load_module(request.param)
+
+
+@pytest.fixture
+def mixed_category_sheet(tmp_path):
+    """대카테고리에 숫자 ID 와 문자열, 빈 셀이 섞인 엑셀 시트"""
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(["대카테고리", "중카테고리", "2024-01-03", "2024-01-02", "2024-01-01"])
+    ws.append([1001, "패션", 5, 3, 1])
+    ws.append(["가전", 2002, 1, 1, 1])
+    ws.append([None, "식품", 0, 2, 4])
+    path = tmp_path / "mixed.xlsx"
+    wb.save(path)
+    return openpyxl.load_workbook(path, data_only=True).active
+
+
+def test_mixed_type_categories_round_trip(module, mixed_category_sheet, tmp_path):
+    ws = mixed_category_sheet
+    header = module.get_header(ws)
+    date_indices = module.extract_date_columns_indices(header)
+    category_indices = module.extract_category_indices(header)
+    score_rows = getattr(module, SCORERS[module.__name__])
+    rows_data = score_rows(ws, header, date_indices, category_indices, recent_count=1)
+
+    saved_files = module.write_ranked_results(rows_data, str(tmp_path / "ranked"))
+
+    assert [os.path.splitext(path)[1] for path in saved_files] == [".jsonl", ".parquet"]
+    jsonl_rows, parquet_rows = (module.load_ranked_results(path) for path in saved_files)
+    assert jsonl_rows == parquet_rows
+    by_total = {row["total"]: (row["대카테고리"], row["중카테고리"]) for row in parquet_rows}
+    assert by_total == {9: ("1001", "패션"), 3: ("가전", "2002"), 6: (None, "식품")}
+
+
+def test_write_ranked_results_keeps_input_rows(module, tmp_path):
+    ranked_data = [{"대카테고리": 7, "total": 1}, {"대카테고리": "가구", "total": 2}]
+
+    module.write_ranked_results(ranked_data, str(tmp_path / "ranked"), formats=("jsonl",))
+
+    assert ranked_data[0]["대카테고리"] == 7